@@ -1,17 +1,18 @@
 # app/main.py
-from fastapi import FastAPI, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, Depends, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from contextlib import asynccontextmanager
 import os, time, uuid, re
+import asyncio
 import logging
 
 logger = logging.getLogger("oaa")
 
 # Auth imports
 from app.auth import require_auth, require_identity_auth, optional_auth, AuthedRequest, identity_verification_status
-from app.receipts import create_mint_receipt, MintReceipt
+from app.receipts import MintReceipt
 
 # Learning Hub imports
 from app.models.learning import (
@@ -19,28 +20,79 @@ from app.models.learning import (
     SessionStartResponse,
     AnswerSubmitRequest,
     AnswerSubmitResponse,
+    BatchAnswerSubmitRequest,
+    BatchAnswerSubmitResponse,
     SessionCompleteRequest,
     SessionCompleteResponse,
     ModuleListResponse,
     ModuleDetailResponse,
+    ModuleSearchResponse,
+    ModuleSearchResult,
     UserProgressResponse,
+    UserActivityResponse,
     RewardEstimate,
     SessionStatus,
     CircuitBreakerStatus,
+    MintJobStatus,
+    PendingMintInfo,
+    PendingMintsResponse,
+    MintQueueStatusResponse,
+    SessionRewardsResponse,
+    PostCompletionQueueStatusResponse,
     # MIC Wallet schemas
     MICReason,
     MICLedgerEntry,
     WalletBalanceResponse,
     WalletLedgerResponse,
 )
+from app.services.catalog_responses import (
+    DEFAULT_SORT,
+    JSON_MEDIA_TYPE,
+    SORT_KEYS,
+    CatalogResponseCache,
+    EncodedBody,
+)
+from app.services.agent_registry import create_agent_registry
 from app.services.learning_store import learning_store
 from app.services.mic_minting import MICMintingService
-from app.services.mic_ledger_store import mic_ledger_store
+from app.services.mic_ledger_store import ledger_cursor, mic_ledger_store
+from app.services.mint_queue import MintQueue
+from app.services.post_completion import PostCompletionQueue
+from app.services.session_completion import CompletionError, SessionCompleter
+from app.services import quiz_protocol
 from app.sentinel import sentinel_router
 
 # Initialize services
 mic_service = MICMintingService()
 
+# Pre-encoded module list/detail responses per catalog version
+catalog_responses = CatalogResponseCache(learning_store)
+MODULE_SORT_PATTERN = f"^-?({'|'.join(SORT_KEYS)})$"
+
+# Mints deferred while GII is below the reward floor (drained on recovery)
+mint_queue = MintQueue(
+    mic_service,
+    journal_path=os.getenv("MINT_QUEUE_PATH") or None,
+    max_concurrency=int(os.getenv("MINT_QUEUE_CONCURRENCY", "4")),
+    on_minted=lambda job: learning_store.record_deferred_mint(
+        job["user_id"], job["module_id"], job["mic_earned"]
+    ),
+)
+MINT_QUEUE_POLL_SECONDS = float(os.getenv("MINT_QUEUE_POLL_SECONDS", "5"))
+
+# Work after a completion that its response does not wait for (badges, receipts)
+post_completion = PostCompletionQueue(
+    workers=int(os.getenv("POST_COMPLETION_WORKERS", "4")),
+    max_pending=int(os.getenv("POST_COMPLETION_MAX_PENDING", "10000")),
+    offload=learning_store.blocking_io,
+)
+
+# Session completion unit of work, serialized per user
+session_completer = SessionCompleter(learning_store, mic_service, mic_ledger_store, mint_queue, post_completion)
+LEARNING_SESSION_SWEEP_SECONDS = float(os.getenv("LEARNING_SESSION_SWEEP_SECONDS", "60"))
+# Poll interval for module catalog changes (0 disables hot reload)
+LEARNING_CATALOG_WATCH_SECONDS = float(os.getenv("LEARNING_CATALOG_WATCH_SECONDS", "0"))
+
 # Default origins include Vercel preview deployments and localhost
 DEFAULT_ORIGINS = [
     "http://localhost:3000",
@@ -61,11 +113,39 @@ ORIGINS = DEFAULT_ORIGINS + extra_origins
 #          mobius-browser-shell-iv2a4ld68-kaizencycles-projects.vercel.app
 VERCEL_PREVIEW_PATTERN = re.compile(r"^https://mobius-browser-shell(-[a-z0-9]+-[a-z0-9]+-projects)?(-[a-z0-9]+)*\.vercel\.app$")
 
-app = FastAPI(title="OAA-API-Library", version="0.4.0")
+async def sweep_learning_sessions():
+    """Abandon and evict idle learning sessions on a fixed interval."""
+    while True:
+        await asyncio.sleep(LEARNING_SESSION_SWEEP_SECONDS)
+        try:
+            evicted = learning_store.sweep_expired_sessions()
+            if evicted:
+                logger.info("evicted %d idle learning sessions", evicted)
+        except Exception:
+            logger.exception("learning session sweep failed")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Background workers run on the server's event loop
+    mint_queue.start(poll_seconds=MINT_QUEUE_POLL_SECONDS)
+    post_completion.start()
+    sweeper = asyncio.create_task(sweep_learning_sessions())
+    if LEARNING_CATALOG_WATCH_SECONDS > 0:
+        learning_store.start_catalog_watcher(LEARNING_CATALOG_WATCH_SECONDS)
+    yield
+    learning_store.stop_catalog_watcher()
+    sweeper.cancel()
+    await post_completion.stop()
+    await mint_queue.stop()
+
+
+app = FastAPI(title="OAA-API-Library", version="0.4.0", lifespan=lifespan)
 
 # Floor 1 — sentinel broker (isolated router; no wallet/tutor shared state)
 app.include_router(sentinel_router, prefix="/v1")
 
+
 # Custom CORS middleware to handle Vercel preview deployments
 @app.middleware("http")
 async def cors_middleware(request: Request, call_next):
@@ -305,8 +385,8 @@ SUBJECT_PROMPTS = {
     "general": "You are a helpful, patient tutor. Explain concepts clearly and encourage questions.",
 }
 
-# --- In-memory registry (replace with DB later) ---
-AGENTS: dict[str, AgentSpec] = {}
+# --- Agent registry (in-memory, or shared SQLite; see agent_registry) ---
+AGENTS = create_agent_registry(AgentSpec)
 
 @app.get("/health")
 def health():
@@ -940,37 +1020,83 @@ def auth_me_options():
 # LEARNING HUB API ENDPOINTS (C-170 MIC Rewards)
 # =============================================================================
 
-@app.get("/api/learning/modules")
+def _encoded_response(request: Request, encoded: EncodedBody) -> Response:
+    """Serve a pre-encoded body, honouring If-None-Match and Accept-Encoding"""
+    body, content_encoding = encoded.select(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": encoded.etag_for(content_encoding),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if encoded.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+@app.get("/api/learning/modules", response_model=ModuleListResponse)
 def list_learning_modules(
+    request: Request,
     difficulty: Optional[str] = None,
-    user_id: Optional[str] = None
+    user_id: Optional[str] = None,
+    topic: Optional[str] = None,
+    sort: str = Query(DEFAULT_SORT, pattern=MODULE_SORT_PATTERN),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
 ):
     """
-    List all available learning modules.
+    List available learning modules, one page at a time.
     
     Query Parameters:
     - difficulty: Filter by difficulty (beginner, intermediate, advanced)
+    - topic: Filter by topic (case-insensitive)
     - user_id: Include completion status for user
-    """
-    modules = learning_store.get_modules(difficulty=difficulty, user_id=user_id)
+    - sort: mic_reward (default), order, difficulty or estimated_minutes;
+      prefix with '-' for descending
+    - page / page_size: 1-based page number and size (max 100)
     
-    return ModuleListResponse(
-        modules=modules,
-        total=len(modules),
-        page=1,
-        page_size=len(modules)
+    Served from the per-catalog-version response cache with a strong ETag.
+    """
+    encoded = catalog_responses.module_list(
+        difficulty=difficulty,
+        user_id=user_id,
+        topic=topic,
+        sort=sort.lstrip("-"),
+        descending=sort.startswith("-"),
+        page=page,
+        page_size=page_size,
     )
+    return _encoded_response(request, encoded)
 
 
-@app.get("/api/learning/modules/{module_id}")
-def get_learning_module(module_id: str):
+@app.get("/api/learning/modules/{module_id}", response_model=ModuleDetailResponse)
+def get_learning_module(request: Request, module_id: str):
     """
     Get detailed module information including questions.
     """
-    module = learning_store.get_module(module_id)
-    if not module:
+    encoded = catalog_responses.module_detail(module_id)
+    if not encoded:
         raise HTTPException(status_code=404, detail=f"Module '{module_id}' not found")
-    return module
+    return _encoded_response(request, encoded)
+
+
+@app.get("/api/learning/search", response_model=ModuleSearchResponse)
+def search_learning_modules(
+    q: str = Query(..., min_length=1, max_length=200),
+    difficulty: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Search modules by title, topics, description and question text.
+    
+    Results are ranked by relevance; the last word also matches as a prefix.
+    """
+    results = [
+        ModuleSearchResult(module=module, score=score)
+        for module, score in learning_store.search_modules(q, difficulty=difficulty, limit=limit)
+    ]
+    return ModuleSearchResponse(query=q, results=results, total=len(results))
 
 
 @app.post("/api/learning/session/start")
@@ -986,9 +1112,9 @@ def start_learning_session(req: SessionStartRequest):
         # Return existing session instead of creating new one
         module = learning_store.get_module(req.module_id)
         return SessionStartResponse(
-            session_id=existing["id"],
-            module_id=existing["module_id"],
-            start_time=datetime.fromisoformat(existing["started_at"]),
+            session_id=existing.id,
+            module_id=existing.module_id,
+            start_time=existing.started_datetime,
             status=SessionStatus.ACTIVE,
             module=module
         )
@@ -1001,9 +1127,9 @@ def start_learning_session(req: SessionStartRequest):
     module = learning_store.get_module(req.module_id)
     
     return SessionStartResponse(
-        session_id=session["id"],
-        module_id=session["module_id"],
-        start_time=datetime.fromisoformat(session["started_at"]),
+        session_id=session.id,
+        module_id=session.module_id,
+        start_time=session.started_datetime,
         status=SessionStatus.ACTIVE,
         module=module
     )
@@ -1038,6 +1164,61 @@ def submit_answer(session_id: str, req: AnswerSubmitRequest):
     )
 
 
+@app.post("/api/learning/session/{session_id}/answers", response_model=BatchAnswerSubmitResponse)
+def submit_answers(session_id: str, req: BatchAnswerSubmitRequest):
+    """
+    Submit several quiz answers in one request.
+    
+    Applied atomically: if any answer is invalid (unknown question, already
+    answered, or repeated in the batch) none are recorded.
+    """
+    result = learning_store.submit_answers(
+        session_id=session_id,
+        answers=[(a.question_id, a.selected_answer) for a in req.answers]
+    )
+    
+    if not result:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid session, question, or answer already submitted; no answers were recorded"
+        )
+    
+    return BatchAnswerSubmitResponse(
+        session_id=session_id,
+        results=[AnswerSubmitResponse(**r) for r in result["results"]],
+        cumulative_score=result["cumulative_score"],
+        questions_answered=result["questions_answered"],
+        questions_remaining=result["questions_remaining"]
+    )
+
+
+@app.websocket("/ws/learning/quiz")
+async def learning_quiz_socket(websocket: WebSocket, user_id: str, module_id: str):
+    """
+    Take a quiz over one WebSocket (frame format in app/services/quiz_protocol.py).
+    
+    Opens or resumes the user's session for the module and keeps it resident
+    for the socket's lifetime. Complete it via the REST complete endpoint.
+    """
+    await websocket.accept()
+    session, resumed = quiz_protocol.open_session(learning_store, user_id, module_id)
+    if not session:
+        await websocket.send_text(quiz_protocol.error("not_found", f"Module '{module_id}' not found"))
+        await websocket.close(code=4404)
+        return
+    
+    learning_store.pin_session(session.id)
+    try:
+        await websocket.send_text(quiz_protocol.ready_frame(learning_store, session, resumed))
+        while True:
+            frame = await websocket.receive_text()
+            await websocket.send_text(quiz_protocol.handle_frame(learning_store, session, frame))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        learning_store.unpin_session(session.id)
+
+
 @app.post(
     "/api/learning/session/{session_id}/complete",
     dependencies=[Depends(require_identity_auth)],
@@ -1045,7 +1226,7 @@ def submit_answer(session_id: str, req: AnswerSubmitRequest):
 async def complete_learning_session(
     session_id: str,
     auth: AuthedRequest = Depends(require_identity_auth),
-    req: SessionCompleteRequest = ...,
+    req: Optional[SessionCompleteRequest] = None,
 ):
     """
     Complete a learning session and mint MIC rewards.
@@ -1053,133 +1234,86 @@ async def complete_learning_session(
     Authentication is required before minting. Anonymous sessions may still be
     started and played; only earning requires a verified subject_id from
     mobius-identity-service.
+
+    The session is scored server-side from its recorded answers; the body is
+    optional and any client-computed stats in it are ignored.
     """
-    session = learning_store.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    try:
+        return await session_completer.complete(session_id, auth.user_id)
+    except CompletionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    if session["status"] != "active":
-        raise HTTPException(status_code=400, detail="Session already completed")
 
-    module = learning_store.get_module(session["module_id"])
-    if not module:
-        raise HTTPException(status_code=404, detail="Module not found")
+@app.get("/api/learning/session/{session_id}/rewards", response_model=SessionRewardsResponse)
+async def get_session_rewards(
+    session_id: str,
+    auth: AuthedRequest = Depends(require_identity_auth),
+):
+    """
+    Get the badges, level and receipt hash of a completed session.
 
-    subject_id = auth.user_id
-    module_id = session["module_id"]
-    
-    # Check if already completed
-    is_first_completion = not learning_store.has_completed_module(subject_id, module_id)
-    
-    # Get user progress for streak info
-    progress = learning_store.get_user_progress(subject_id)
-    integrity_score = progress.get("integrity_score", 0.85)
-    
-    # Calculate MIC reward
-    reward_result = mic_service.calculate_reward(
-        base_reward=module.mic_reward,
-        accuracy=req.accuracy,
-        integrity_score=integrity_score,
-        difficulty=module.difficulty.value,
-        streak_days=progress.get("current_streak", 0),
-        is_perfect_score=req.accuracy >= 1.0,
-        is_first_completion=is_first_completion
-    )
-    
-    if not reward_result["can_mint"]:
-        raise HTTPException(
-            status_code=402,
-            detail=f"Cannot mint reward: {reward_result.get('reason', 'Unknown')}"
-        )
-    
-    mic_earned = reward_result["mic_earned"]
-    gii = reward_result.get("gii", 0.92)
-    
-    # 🧾 Generate hash receipt BEFORE minting for verifiable proof
-    receipt = create_mint_receipt(
-        subject_id=subject_id,
-        session_id=session_id,
-        module_id=module_id,
-        minted_mic=mic_earned,
-        accuracy=req.accuracy,
-        integrity_score=integrity_score,
-        gii=gii
-    )
-    
-    # Mint the reward to subject_id
-    try:
-        mint_result = await mic_service.mint_reward(
-            user_id=subject_id,  # Canonical subject_id
-            module_id=module_id,
-            session_id=session_id,
-            mic_amount=mic_earned,
-            accuracy=req.accuracy,
-            integrity_score=integrity_score
-        )
-        transaction_id = mint_result["transaction_id"]
-    except ValueError as e:
-        raise HTTPException(status_code=402, detail=str(e))
-    
-    # Complete the session
-    learning_store.complete_session(session_id)
-    
-    # Calculate XP
-    xp_earned = learning_store.calculate_xp(
-        accuracy=req.accuracy,
-        difficulty=module.difficulty.value,
-        time_minutes=req.time_spent_minutes
-    )
-    
-    # Update user progress
-    updated_progress = learning_store.update_user_progress(
-        user_id=subject_id,
-        mic_earned=mic_earned,
-        xp_earned=xp_earned,
-        minutes_spent=req.time_spent_minutes
-    )
-    
-    # Record completion
-    learning_store.record_completion(
-        user_id=subject_id,
-        module_id=module_id,
-        accuracy=req.accuracy,
-        mic_earned=mic_earned
-    )
-    
-    # Check for badges
-    new_badges = learning_store.check_and_award_badges(
-        user_id=subject_id,
-        module_id=module_id,
-        accuracy=req.accuracy,
-        is_first_module=updated_progress["modules_completed"] == 1
-    )
-    
-    # Get new wallet balance from ledger (DERIVED, never stored)
-    new_wallet_balance = mic_ledger_store.get_balance(subject_id)
-    
-    return SessionCompleteResponse(
+    These are produced after the completion response returns; poll until
+    status is "done".
+    """
+    task = post_completion.get_task(session_id)
+    if not task or task["user_id"] != auth.user_id:
+        raise HTTPException(status_code=404, detail="No completion for this session")
+
+    credit = task["results"].get("credit") or {}
+    return SessionRewardsResponse(
         session_id=session_id,
-        module_id=module_id,
-        accuracy=req.accuracy,
-        mic_earned=mic_earned,
-        xp_earned=xp_earned,
-        new_level=updated_progress["level"],
-        integrity_score=updated_progress.get("integrity_score", 0.85),
-        transaction_id=transaction_id,
-        ledger_id=mint_result.get("ledger_id"),  # Proof of earning
-        new_wallet_balance=new_wallet_balance,  # Derived from ledger
-        status=SessionStatus.COMPLETED,
-        rewards={
-            "mic": mic_earned,
-            "xp": xp_earned,
-            "badges": len(new_badges),
-            "receipt_hash": receipt.receipt_hash  # 🧾 Hash receipt for verification
-        },
-        bonuses=reward_result["breakdown"],
-        circuit_breaker_status=CircuitBreakerStatus(reward_result["system_status"])
+        status=task["status"],
+        attempts=task["attempts"],
+        new_level=credit.get("new_level"),
+        badges=credit.get("badges", []),
+        receipt_hash=task["results"].get("receipt"),
+        error=task["error"],
     )
 
 
+@app.get("/api/learning/post-completion", response_model=PostCompletionQueueStatusResponse)
+def get_post_completion_status():
+    """
+    Get post-completion pipeline depth, workers and retry/failure totals.
+    """
+    return PostCompletionQueueStatusResponse(**post_completion.get_stats())
+
+
+@app.get("/api/learning/mint-queue")
+def get_mint_queue_status():
+    """
+    Get deferred mint queue depth and drain state.
+
+    Mints queue up while GII is below the reward floor and drain
+    automatically once the circuit breaker reports healthy.
+    """
+    return MintQueueStatusResponse(**mint_queue.get_stats())
+
+
+@app.get("/api/learning/metrics/sessions")
+def get_learning_session_metrics():
+    """
+    Get resident session counts, estimated memory and expiry totals.
+    """
+    return learning_store.get_session_metrics()
+
+
+@app.get("/api/learning/metrics/progress")
+def get_learning_progress_metrics():
+    """
+    Get user progress tier sizes, hit rates and estimated memory.
+    """
+    return learning_store.get_progress_metrics()
+
+
+@app.get("/api/learning/catalog")
+def get_learning_catalog_info():
+    """
+    Get the serving module catalog version and versions still pinned by sessions.
+    """
+    return {**learning_store.get_catalog_info(), "response_cache": catalog_responses.get_stats()}
+
+
 @app.get("/api/learning/users/{user_id}/progress")
 def get_user_learning_progress(user_id: str):
     """
@@ -1214,6 +1348,27 @@ def get_user_learning_progress(user_id: str):
     )
 
 
+@app.get("/api/learning/users/{user_id}/activity", response_model=UserActivityResponse)
+def get_user_learning_activity(user_id: str, days: int = Query(365, ge=1, le=3660)):
+    """
+    Get a user's daily learning activity heatmap and streaks.
+    
+    The heatmap has one character per UTC day, oldest first: '1' when the
+    user completed a module that day.
+    """
+    return UserActivityResponse(**learning_store.get_user_activity(user_id, days))
+
+
+@app.get("/api/learning/users/{user_id}/next", response_model=ModuleListResponse)
+def get_user_next_modules(user_id: str, limit: int = Query(5, ge=1, le=100)):
+    """
+    Get recommended next modules: unlocked by completed prerequisites and
+    not yet completed, in prerequisite order.
+    """
+    modules = learning_store.get_next_modules(user_id, limit=limit)
+    return ModuleListResponse(modules=modules, total=len(modules), page=1, page_size=limit)
+
+
 @app.get("/api/learning/estimate-reward")
 def estimate_learning_reward(
     module_id: str,
@@ -1321,22 +1476,34 @@ async def get_wallet_balance(
 async def get_wallet_ledger(
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
     auth: AuthedRequest = Depends(require_identity_auth),
 ):
     """
     Get full MIC ledger history for the authenticated user.
+    
+    Pass the previous response's next_cursor to page by keyset instead of offset.
     """
     subject_id = auth.user_id
     
     # Cap limit at 100
     limit = min(limit, 100)
     
-    total, entries = mic_ledger_store.get_ledger(subject_id, limit=limit, offset=offset)
+    if cursor is not None:
+        try:
+            entries, next_cursor = mic_ledger_store.get_ledger_page(subject_id, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        total = mic_ledger_store.get_total_entries_count(subject_id)
+    else:
+        total, entries = mic_ledger_store.get_ledger(subject_id, limit=limit, offset=offset)
+        next_cursor = ledger_cursor(entries[-1]) if entries and offset + len(entries) < total else None
     
     return WalletLedgerResponse(
         user_id=subject_id,
         total_entries=total,
-        entries=entries
+        entries=entries,
+        next_cursor=next_cursor
     )
 
 
@@ -1358,6 +1525,23 @@ async def get_wallet_breakdown(
     }
 
 
+@app.get("/api/v1/wallet/pending-mints")
+async def get_pending_mints(
+    auth: AuthedRequest = Depends(require_identity_auth),
+):
+    """
+    Get the authenticated user's deferred mints and their state.
+    """
+    subject_id = auth.user_id
+    jobs = mint_queue.get_user_jobs(subject_id)
+
+    return PendingMintsResponse(
+        user_id=subject_id,
+        pending=sum(1 for j in jobs if j["status"] == MintJobStatus.PENDING.value),
+        mints=[PendingMintInfo(**j) for j in jobs]
+    )
+
+
 @app.options("/api/v1/wallet/balance")
 def wallet_balance_options():
     """CORS preflight for wallet balance endpoint."""
@@ -1438,14 +1622,30 @@ def root():
                 "auth": "required",
                 "description": "Complete session and mint MIC (identity Bearer required)",
             },
+            "learning_session_rewards": {
+                "path": "/api/learning/session/{id}/rewards",
+                "method": "GET",
+                "auth": "required",
+                "description": "Badges and receipt of a completion (ready shortly after it returns)",
+            },
             "learning_progress": {"path": "/api/learning/users/{id}/progress", "method": "GET", "description": "Get user progress"},
+            "learning_quiz_socket": {"path": "/ws/learning/quiz?user_id=&module_id=", "method": "WEBSOCKET", "description": "Quiz session over one socket"},
+            "learning_search": {"path": "/api/learning/search?q=", "method": "GET", "description": "Search learning modules"},
+            "learning_next": {"path": "/api/learning/users/{id}/next", "method": "GET", "description": "Recommended next modules"},
+            "learning_activity": {"path": "/api/learning/users/{id}/activity", "method": "GET", "description": "Daily activity heatmap and streaks"},
             "learning_estimate": {"path": "/api/learning/estimate-reward", "method": "GET", "description": "Estimate MIC reward"},
             "learning_status": {"path": "/api/learning/system-status", "method": "GET", "description": "System and circuit breaker status"},
+            "learning_mint_queue": {"path": "/api/learning/mint-queue", "method": "GET", "description": "Deferred mint queue depth"},
+            "learning_post_completion": {"path": "/api/learning/post-completion", "method": "GET", "description": "Post-completion pipeline depth"},
+            "learning_session_metrics": {"path": "/api/learning/metrics/sessions", "method": "GET", "description": "Session memory and eviction metrics"},
+            "learning_progress_metrics": {"path": "/api/learning/metrics/progress", "method": "GET", "description": "Progress tier hit rates and memory"},
+            "learning_catalog": {"path": "/api/learning/catalog", "method": "GET", "description": "Module catalog version"},
 
             # Wallet endpoints
             "wallet_balance": {"path": "/api/v1/wallet/balance", "method": "GET", "auth": "required", "description": "Get MIC wallet balance (derived from ledger)"},
             "wallet_ledger": {"path": "/api/v1/wallet/ledger", "method": "GET", "auth": "required", "description": "Get full MIC transaction history"},
             "wallet_breakdown": {"path": "/api/v1/wallet/breakdown", "method": "GET", "auth": "required", "description": "Get MIC balance breakdown by type"},
+            "wallet_pending_mints": {"path": "/api/v1/wallet/pending-mints", "method": "GET", "auth": "required", "description": "Get deferred mints awaiting GII recovery"},
 
             # Agent endpoints
             "agents_register": {"path": "/agents/register", "method": "POST"},
@@ -3,7 +3,8 @@
 Database migrations for OAA Learning Hub
 
 These migrations are designed for Alembic integration with PostgreSQL.
-For the current in-memory implementation, modules are loaded in learning_store.py.
+Module content lives in app/data/learning_modules.json; the in-memory store and
+these migrations both read it through app.services.module_catalog.
 
 Migrations:
 - 001_learning_tables: Creates base learning_modules table
@@ -6,7 +6,7 @@ Request and response validation for learning rewards system (MIC)
 
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -29,6 +29,21 @@ class CircuitBreakerStatus(str, Enum):
     CIRCUIT_BREAKER_ACTIVE = "circuit_breaker_active"
 
 
+class MintJobStatus(str, Enum):
+    """Lifecycle of a mint parked in the deferred mint queue"""
+    PENDING = "pending"       # Waiting for GII to recover
+    MINTING = "minting"       # Picked up by a drain worker
+    MINTED = "minted"         # Written to the MIC ledger
+    FAILED = "failed"         # Rejected for a non-system reason
+
+
+class PostCompletionStatus(str, Enum):
+    """Lifecycle of the work queued after a session completion"""
+    PENDING = "pending"       # Queued or waiting on a retry
+    DONE = "done"             # Progress credited, badges and receipt ready
+    FAILED = "failed"         # Gave up after repeated errors
+
+
 # =============================================================================
 # MIC LEDGER SCHEMAS (Append-only ledger for wallet tracking)
 # =============================================================================
@@ -75,6 +90,7 @@ class WalletLedgerResponse(BaseModel):
     user_id: str
     total_entries: int
     entries: List[MICLedgerEntry]
+    next_cursor: Optional[str] = Field(None, description="Keyset cursor for the next (older) page")
     
     class Config:
         from_attributes = True
@@ -150,6 +166,19 @@ class ModuleListResponse(BaseModel):
     page_size: int = 20
 
 
+class ModuleSearchResult(BaseModel):
+    """A module matching a search query"""
+    module: LearningModuleResponse
+    score: float
+
+
+class ModuleSearchResponse(BaseModel):
+    """Ranked module search results"""
+    query: str
+    results: List[ModuleSearchResult]
+    total: int
+
+
 # Session Management Schemas
 # ===========================
 
@@ -189,23 +218,29 @@ class AnswerSubmitResponse(BaseModel):
     questions_remaining: int
 
 
-class SessionCompleteRequest(BaseModel):
-    """Request to complete a module"""
+class BatchAnswerSubmitRequest(BaseModel):
+    """Request to submit several quiz answers at once"""
+    answers: List[AnswerSubmitRequest] = Field(..., min_length=1, max_length=100)
+
+
+class BatchAnswerSubmitResponse(BaseModel):
+    """Per-question results of a batch submission"""
     session_id: str
-    questions_answered: int = Field(..., ge=1)
-    correct_answers: int = Field(..., ge=0)
-    total_points: int = Field(..., ge=0)
-    earned_points: int = Field(..., ge=0)
-    accuracy: float = Field(..., ge=0.0, le=1.0)
-    time_spent_minutes: int = Field(..., ge=0)
+    results: List[AnswerSubmitResponse]
+    cumulative_score: int
+    questions_answered: int
+    questions_remaining: int
+
+
+class SessionCompleteRequest(BaseModel):
+    """
+    Request to complete a module.
     
-    @field_validator('correct_answers')
-    @classmethod
-    def validate_correct_answers(cls, v: int, info) -> int:
-        questions_answered = info.data.get('questions_answered', 0)
-        if v > questions_answered:
-            raise ValueError('correct_answers cannot exceed questions_answered')
-        return v
+    Only the session is named; accuracy, points and time spent are derived
+    server-side from the session's recorded answers. Fields older clients
+    still send are ignored.
+    """
+    session_id: str
 
 
 class SessionCompleteResponse(BaseModel):
@@ -213,6 +248,11 @@ class SessionCompleteResponse(BaseModel):
     session_id: str
     module_id: str
     accuracy: float
+    questions_answered: int
+    correct_answers: int
+    earned_points: int
+    total_points: int
+    time_spent_minutes: int
     mic_earned: int
     xp_earned: int
     new_level: int
@@ -220,8 +260,10 @@ class SessionCompleteResponse(BaseModel):
     transaction_id: Optional[str] = None
     ledger_id: Optional[str] = None  # MIC Ledger entry ID (proof of earning)
     new_wallet_balance: Optional[float] = None  # Updated wallet balance from ledger
+    mint_status: MintJobStatus = MintJobStatus.MINTED
+    mint_id: Optional[str] = None  # Deferred mint queue job (when mint_status is pending)
     status: SessionStatus
-    rewards: Dict[str, int]
+    rewards: Dict[str, Any]
     bonuses: Dict[str, float]
     circuit_breaker_status: CircuitBreakerStatus
     
@@ -269,6 +311,20 @@ class UserProgressResponse(BaseModel):
         from_attributes = True
 
 
+class UserActivityResponse(BaseModel):
+    """Daily learning activity window (heatmap) and streaks"""
+    user_id: str
+    start_date: date
+    end_date: date
+    days: int
+    heatmap: str  # '0'/'1' per day, start_date first
+    active_days: int
+    active_last_7_days: int
+    active_last_30_days: int
+    current_streak: int
+    longest_streak: int
+
+
 # MIC Minting Schemas
 # ====================
 
@@ -303,6 +359,63 @@ class RewardEstimate(BaseModel):
     gii_multiplier: float
 
 
+class PendingMintInfo(BaseModel):
+    """A mint deferred while the circuit breaker was holding"""
+    mint_id: str
+    session_id: str
+    module_id: str
+    status: MintJobStatus
+    attempts: int = 0
+    enqueued_at: str
+    updated_at: str
+    mic_earned: Optional[int] = None
+    transaction_id: Optional[str] = None
+    ledger_id: Optional[str] = None
+    receipt_hash: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class PendingMintsResponse(BaseModel):
+    """The authenticated user's deferred mints"""
+    user_id: str
+    pending: int
+    mints: List[PendingMintInfo]
+
+
+class MintQueueStatusResponse(BaseModel):
+    """Deferred mint queue depth and drain state"""
+    depth: int
+    minting: int
+    minted: int
+    failed: int
+    draining: bool
+    circuit_breaker_status: CircuitBreakerStatus
+    max_concurrency: int
+
+
+class SessionRewardsResponse(BaseModel):
+    """Outcome of a completion's post-completion work (badges, receipt)"""
+    session_id: str
+    status: PostCompletionStatus
+    attempts: int
+    new_level: Optional[int] = None
+    badges: List[BadgeInfo] = []
+    receipt_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PostCompletionQueueStatusResponse(BaseModel):
+    """Post-completion pipeline depth and task totals"""
+    depth: int
+    workers: int
+    running: bool
+    oldest_pending_seconds: Optional[float] = None
+    processed: int
+    retried: int
+    failed: int
+    inline: int
+
+
 # Analytics Schemas
 # ==================
 
@@ -5,5 +5,6 @@ OAA API Library - Services
 
 from app.services.mic_minting import MICMintingService
 from app.services.learning_store import LearningStore
+from app.services.mint_queue import MintQueue
 
-__all__ = ["MICMintingService", "LearningStore"]
+__all__ = ["MICMintingService", "LearningStore", "MintQueue"]
@@ -0,0 +1,90 @@
+# app/services/activity_bitmap.py
+"""
+Daily Activity Bitmap
+
+One bit per UTC day, indexed by days since the Unix epoch and stored as a
+Python int relative to the user's first active day (bit 0). A year of
+history is 46 bytes per user. Streaks and rolling activity counts are bit
+operations rather than date parsing, and heatmaps are slices of the int.
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+
+SECONDS_PER_DAY = 86_400
+EPOCH = date(1970, 1, 1)
+
+
+def epoch_day(timestamp: float) -> int:
+    """Days since the Unix epoch (UTC) for an epoch-seconds timestamp"""
+    return int(timestamp // SECONDS_PER_DAY)
+
+
+def day_to_date(day: int) -> date:
+    return EPOCH + timedelta(days=day)
+
+
+class ActivityBitmap:
+    """Active-day set for one user"""
+
+    __slots__ = ("base_day", "bits")
+
+    def __init__(self, base_day: Optional[int] = None, bits: int = 0):
+        self.base_day = base_day
+        self.bits = bits
+
+    @property
+    def last_day(self) -> Optional[int]:
+        return self.base_day + self.bits.bit_length() - 1 if self.bits else None
+
+    def mark(self, day: int) -> None:
+        """Record activity on a day"""
+        if self.base_day is None:
+            self.base_day = day
+        elif day < self.base_day:
+            self.bits <<= self.base_day - day
+            self.base_day = day
+        self.bits |= 1 << (day - self.base_day)
+
+    def is_active(self, day: int) -> bool:
+        if self.base_day is None or day < self.base_day:
+            return False
+        return bool(self.bits >> (day - self.base_day) & 1)
+
+    def streak_ending(self, day: int) -> int:
+        """Length of the run of active days ending on day (0 if inactive)"""
+        if not self.is_active(day):
+            return 0
+        top = day - self.base_day
+        # Inactive days at or below top; the highest one bounds the run
+        gaps = ~self.bits & ((1 << (top + 1)) - 1)
+        return top + 1 - gaps.bit_length()
+
+    def current_streak(self, today: int) -> int:
+        """Run ending today, or yesterday if today has no activity yet"""
+        return self.streak_ending(today) or self.streak_ending(today - 1)
+
+    def longest_streak(self) -> int:
+        """Longest run of consecutive active days"""
+        x, length = self.bits, 0
+        while x:
+            x &= x >> 1
+            length += 1
+        return length
+
+    def window(self, end_day: int, days: int) -> int:
+        """Bits for the days (end_day - days, end_day], bit 0 = oldest"""
+        if self.base_day is None or days <= 0:
+            return 0
+        start = end_day - days + 1
+        shift = start - self.base_day
+        bits = self.bits >> shift if shift >= 0 else self.bits << -shift
+        return bits & ((1 << days) - 1)
+
+    def active_days(self, end_day: int, days: int) -> int:
+        """Active days in the days-long window ending on end_day"""
+        return self.window(end_day, days).bit_count()
+
+    def heatmap(self, end_day: int, days: int) -> str:
+        """'0'/'1' per day, oldest first, for the window ending on end_day"""
+        return format(self.window(end_day, days), f"0{days}b")[::-1] if days > 0 else ""
@@ -0,0 +1,86 @@
+# app/services/agent_registry.py
+"""
+Agent Registry
+
+Backing store for the /agents endpoints' AGENTS mapping. By default a plain
+dict (per process); AGENT_REGISTRY_BACKEND=sqlite keeps it in the shared
+SQLite file (SQLITE_STORE_PATH) so an agent registered on one uvicorn
+worker can be queried on any other.
+"""
+
+import logging
+import os
+from collections.abc import MutableMapping
+from typing import Iterator, MutableMapping as MutableMappingType, Type
+
+from pydantic import BaseModel
+
+from app.services.sqlite_db import SqliteDatabase, sqlite_path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS agents (
+    key TEXT PRIMARY KEY,
+    spec TEXT NOT NULL,
+    registered_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+STATEMENTS = {
+    "agent_put": (
+        "INSERT INTO agents (key, spec) VALUES (?1, ?2) "
+        "ON CONFLICT (key) DO UPDATE SET spec = excluded.spec, registered_at = CURRENT_TIMESTAMP"
+    ),
+    "agent_get": "SELECT spec FROM agents WHERE key = ?1",
+    "agent_delete": "DELETE FROM agents WHERE key = ?1 RETURNING key",
+    "agent_keys": "SELECT key FROM agents ORDER BY key",
+    "agent_count": "SELECT count(*) FROM agents",
+}
+
+
+class SqliteAgentRegistry(MutableMapping):
+    """Agent specs keyed by lowercase name, stored as JSON in SQLite"""
+
+    def __init__(self, path: str, model: Type[BaseModel]):
+        self._model = model
+        self._db = SqliteDatabase(path, STATEMENTS)
+        self._db.run_script(SCHEMA_SQL)
+
+    def __getitem__(self, key: str) -> BaseModel:
+        rows = self._db.execute("agent_get", (key,))
+        if not rows:
+            raise KeyError(key)
+        return self._model.model_validate_json(rows[0][0])
+
+    def __setitem__(self, key: str, spec: BaseModel) -> None:
+        self._db.execute("agent_put", (key, spec.model_dump_json()))
+
+    def __delitem__(self, key: str) -> None:
+        if not self._db.execute("agent_delete", (key,)):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return bool(self._db.execute("agent_get", (key,)))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([key for (key,) in self._db.execute("agent_keys", ())])
+
+    def __len__(self) -> int:
+        return self._db.execute("agent_count", ())[0][0]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def create_agent_registry(model: Type[BaseModel]) -> MutableMappingType[str, BaseModel]:
+    """
+    AGENTS mapping for this process, chosen by AGENT_REGISTRY_BACKEND
+    (falling back to STORE_BACKEND): "memory" (default) or "sqlite".
+    """
+    backend = (os.getenv("AGENT_REGISTRY_BACKEND") or os.getenv("STORE_BACKEND", "memory")).strip().lower()
+    if backend == "sqlite":
+        return SqliteAgentRegistry(sqlite_path(), model)
+    if backend != "memory":
+        logger.warning(f"Agent registry has no '{backend}' backend; using in-memory registry")
+    return {}
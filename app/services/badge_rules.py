@@ -0,0 +1,184 @@
+# app/services/badge_rules.py
+"""
+Declarative Badge Rules
+
+Badges and the rules that award them live in app/data/badges.json. Each
+badge may carry one rule:
+
+- {"type": "first_module"}: the user's first completed module
+- {"type": "module_accuracy", "min_accuracy": 0.9, "module": "<id>"}: a
+  completion at or above the accuracy (of any module when "module" is omitted)
+- {"type": "modules_completed", "modules": ["<id>", ...]}: every listed module
+- {"type": "mic_total", "min_mic": 100}: lifetime MIC earned through learning
+- {"type": "streak", "min_days": 7}: current learning streak
+
+Rules are compiled into a BadgePlan indexed by trigger, so a completion only
+evaluates the rules that mention its module, plus the any-module, MIC and
+streak rules whose thresholds the user has reached; MIC credited later by a
+deferred mint evaluates only the MIC rules. Adding a badge is a data
+change and does not grow the work done for unrelated completions.
+"""
+
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_BADGES_PATH = Path(__file__).resolve().parents[1] / "data" / "badges.json"
+
+RULE_TYPES = ("first_module", "module_accuracy", "modules_completed", "mic_total", "streak")
+
+
+@dataclass(frozen=True)
+class BadgeRule:
+    """A compiled rule; order is the badge's position in the definitions"""
+    badge_id: str
+    type: str
+    order: int
+    module_mask: int = 0
+    min_accuracy: float = 0.0
+    threshold: int = 0
+
+
+@dataclass(frozen=True)
+class BadgeContext:
+    """What a completion changed, as seen by the rules"""
+    module_id: str
+    accuracy: float
+    is_first_module: bool
+    completion_mask: int
+    total_mic: int
+    current_streak: int
+
+
+class BadgePlan:
+    """Badge rules indexed by what can trigger them"""
+
+    def __init__(self, rules: Iterable[BadgeRule], module_rules: Dict[str, List[BadgeRule]]):
+        self.by_module: Dict[str, Tuple[BadgeRule, ...]] = {
+            mid: tuple(rs) for mid, rs in module_rules.items()
+        }
+        mic: List[BadgeRule] = []
+        streak: List[BadgeRule] = []
+        first: List[BadgeRule] = []
+        any_module: List[BadgeRule] = []
+        for rule in rules:
+            if rule.type == "first_module":
+                first.append(rule)
+            elif rule.type == "module_accuracy" and not rule.module_mask:
+                any_module.append(rule)
+            elif rule.type == "mic_total":
+                mic.append(rule)
+            elif rule.type == "streak":
+                streak.append(rule)
+        self.first_module: Tuple[BadgeRule, ...] = tuple(first)
+        self.any_module: Tuple[BadgeRule, ...] = tuple(any_module)
+        # Threshold rules sorted so the reached ones are a prefix (bisect)
+        self.mic_rules = tuple(sorted(mic, key=lambda r: r.threshold))
+        self.mic_thresholds = [r.threshold for r in self.mic_rules]
+        self.streak_rules = tuple(sorted(streak, key=lambda r: r.threshold))
+        self.streak_thresholds = [r.threshold for r in self.streak_rules]
+
+    def candidates(self, ctx: BadgeContext) -> List[BadgeRule]:
+        """Rules this completion can affect, in definition order"""
+        rules = list(self.by_module.get(ctx.module_id, ()))
+        rules.extend(self.any_module)
+        if ctx.is_first_module:
+            rules.extend(self.first_module)
+        rules.extend(self.mic_rules[:bisect_right(self.mic_thresholds, ctx.total_mic)])
+        rules.extend(self.streak_rules[:bisect_right(self.streak_thresholds, ctx.current_streak)])
+        return sorted(rules, key=lambda r: r.order)
+
+    def evaluate(self, ctx: BadgeContext, owned: Set[str]) -> List[str]:
+        """Badge IDs newly earned by this completion"""
+        earned = []
+        for rule in self.candidates(ctx):
+            if rule.badge_id in owned or rule.badge_id in earned:
+                continue
+            if _satisfied(rule, ctx):
+                earned.append(rule.badge_id)
+        return earned
+
+    def evaluate_mic_total(self, total_mic: int, owned: Set[str]) -> List[str]:
+        """Badge IDs newly earned by MIC credited outside a completion (a deferred mint)"""
+        reached = self.mic_rules[:bisect_right(self.mic_thresholds, total_mic)]
+        return [r.badge_id for r in sorted(reached, key=lambda r: r.order) if r.badge_id not in owned]
+
+
+def _satisfied(rule: BadgeRule, ctx: BadgeContext) -> bool:
+    if rule.type == "module_accuracy":
+        return ctx.accuracy >= rule.min_accuracy
+    if rule.type == "modules_completed":
+        return ctx.completion_mask & rule.module_mask == rule.module_mask
+    # first_module, mic_total and streak are only candidates once satisfied
+    return True
+
+
+def load_badges(path: Optional[Path] = None) -> Dict[str, dict]:
+    """Badge definitions keyed by ID, in file order (rules included)"""
+    with open(path or DEFAULT_BADGES_PATH, "r", encoding="utf-8") as f:
+        badges = json.load(f)["badges"]
+    return {b["id"]: b for b in badges}
+
+
+def compile_badge_plan(
+    badges: Dict[str, dict],
+    module_bit: Callable[[str], int]
+) -> BadgePlan:
+    """
+    Compile badge rules into a BadgePlan.
+
+    Args:
+        badges: Definitions from load_badges
+        module_bit: Completion bit for a module ID (LearningStore.module_bit)
+
+    Raises:
+        ValueError: unknown rule type or a rule missing its parameters
+    """
+    rules: List[BadgeRule] = []
+    module_rules: Dict[str, List[BadgeRule]] = {}
+
+    for order, badge in enumerate(badges.values()):
+        spec = badge.get("rule")
+        if not spec:
+            continue
+        kind = spec.get("type")
+        if kind not in RULE_TYPES:
+            raise ValueError(f"Badge '{badge['id']}' has unknown rule type '{kind}'")
+
+        try:
+            if kind == "module_accuracy":
+                module_id = spec.get("module")
+                rule = BadgeRule(
+                    badge["id"], kind, order,
+                    module_mask=module_bit(module_id) if module_id else 0,
+                    min_accuracy=float(spec["min_accuracy"]),
+                )
+                triggers = [module_id] if module_id else []
+            elif kind == "modules_completed":
+                modules = list(spec["modules"])
+                if not modules:
+                    raise ValueError(f"Badge '{badge['id']}' lists no modules")
+                mask = 0
+                for module_id in modules:
+                    mask |= module_bit(module_id)
+                rule = BadgeRule(badge["id"], kind, order, module_mask=mask)
+                triggers = modules
+            elif kind == "mic_total":
+                rule = BadgeRule(badge["id"], kind, order, threshold=int(spec["min_mic"]))
+                triggers = []
+            elif kind == "streak":
+                rule = BadgeRule(badge["id"], kind, order, threshold=int(spec["min_days"]))
+                triggers = []
+            else:
+                rule = BadgeRule(badge["id"], kind, order)
+                triggers = []
+        except KeyError as e:
+            raise ValueError(f"Badge '{badge['id']}' rule is missing {e}") from None
+
+        rules.append(rule)
+        for module_id in triggers:
+            module_rules.setdefault(module_id, []).append(rule)
+
+    return BadgePlan(rules, module_rules)
@@ -0,0 +1,250 @@
+# app/services/catalog_responses.py
+"""
+Pre-serialized Module Catalog Responses
+
+The module list and module detail endpoints return the same bytes until the
+catalog version changes, so they are encoded once per catalog version:
+
+- body: the JSON the endpoint would have produced
+- gzip / brotli: compressed variants (brotli only when the package is installed)
+- etag: strong validator, derived from the catalog version and body digest
+
+The list endpoint pages through presorted position arrays (one per sort
+key, narrowed by difficulty/topic filters and memoized), so a page costs
+O(page_size) however large the catalog is. Per-user `completed` flags are
+overlaid without re-encoding: every list entry is pre-encoded twice (not
+completed / completed) and a user's page is the join of the right fragments.
+"""
+
+import gzip
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.models.learning import DifficultyLevel
+from app.services.learning_store import LearningStore, module_detail, module_summary
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+JSON_MEDIA_TYPE = "application/json"
+
+_DIFFICULTIES = frozenset(d.value for d in DifficultyLevel)
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """One response body with its compressed variants and validator"""
+    body: bytes
+    etag: str
+    gzip: Optional[bytes] = None
+    brotli: Optional[bytes] = None
+
+    @classmethod
+    def encode(cls, version: int, body: bytes, compress: bool = True) -> "EncodedBody":
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        return cls(
+            body=body,
+            etag=f'"v{version}-{digest}"',
+            gzip=gzip.compress(body, compresslevel=9, mtime=0) if compress else None,
+            brotli=brotli.compress(body) if compress and BROTLI_AVAILABLE else None,
+        )
+
+    def select(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Pick the best representation for an Accept-Encoding header"""
+        accepted = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+        if self.brotli is not None and "br" in accepted:
+            return self.brotli, "br"
+        if self.gzip is not None and "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.body, None
+
+    def etag_for(self, content_encoding: Optional[str]) -> str:
+        """Strong ETags differ per representation, so encoded variants get a suffix"""
+        return f'{self.etag[:-1]}-{content_encoding}"' if content_encoding else self.etag
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True when If-None-Match names this body in any representation"""
+        if not if_none_match:
+            return False
+        base = self.etag[:-1]
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == self.etag or tag.startswith(base + "-"):
+                return True
+        return False
+
+
+SORT_KEYS = ("mic_reward", "order", "difficulty", "estimated_minutes")
+DEFAULT_SORT = "mic_reward"
+
+_DIFFICULTY_RANK = {d: i for i, d in enumerate(("beginner", "intermediate", "advanced"))}
+
+# Encoded anonymous pages kept per catalog version (oldest dropped first)
+MAX_CACHED_PAGES = 512
+
+
+class _CatalogView:
+    """
+    One catalog version's active modules as positional arrays.
+
+    Each module is pre-encoded twice (not completed / completed). Every sort
+    key has a presorted tuple of positions, and filtered views (difficulty,
+    topic) are derived from those once and memoized, so a page is a slice.
+    """
+
+    def __init__(self, store: LearningStore, version: int):
+        self.version = version
+        modules = [m for m in store.modules.values() if m.get("is_active", True)]
+        self.module_ids = tuple(m["id"] for m in modules)
+        self.bits = tuple(store.module_bit(m["id"]) for m in modules)
+        self.mask = 0
+        for bit in self.bits:
+            self.mask |= bit
+        self.difficulties = tuple(m["difficulty"] for m in modules)
+        self.topics = tuple(frozenset(t.lower() for t in m["topics"]) for m in modules)
+        self.fragments: Tuple[Tuple[bytes, bytes], ...] = tuple(
+            (module_summary(m).model_dump_json().encode(),
+             module_summary(m, completed=True).model_dump_json().encode())
+            for m in modules
+        )
+        sort_values = {
+            "mic_reward": lambda m: m["mic_reward"],
+            "order": lambda m: m.get("order", 0),
+            "difficulty": lambda m: _DIFFICULTY_RANK.get(m["difficulty"], len(_DIFFICULTY_RANK)),
+            "estimated_minutes": lambda m: m["estimated_minutes"],
+        }
+        positions = range(len(modules))
+        self._views: Dict[Tuple[str, str, str], Tuple[int, ...]] = {
+            (sort, "", ""): tuple(sorted(positions, key=lambda i: (value(modules[i]), i)))
+            for sort, value in sort_values.items()
+        }
+        self.known_topics = frozenset().union(*self.topics)
+        self.pages: Dict[tuple, EncodedBody] = {}
+
+    def view(self, sort: str, difficulty: str, topic: str) -> Tuple[int, ...]:
+        """Positions matching the filters, in sort order"""
+        key = (sort, difficulty, topic)
+        positions = self._views.get(key)
+        if positions is None:
+            positions = tuple(
+                i for i in self._views[(sort, "", "")]
+                if (not difficulty or self.difficulties[i] == difficulty)
+                and (not topic or topic in self.topics[i])
+            )
+            # Filters outside the catalog match nothing; don't let them grow the memo
+            if (not difficulty or difficulty in _DIFFICULTIES) and (not topic or topic in self.known_topics):
+                self._views[key] = positions
+        return positions
+
+
+class CatalogResponseCache:
+    """
+    Encoded module responses for the store's current catalog version.
+
+    Entries are built on first request and dropped wholesale when the store
+    swaps in a new catalog version.
+    """
+
+    def __init__(self, store: LearningStore):
+        self.store = store
+        self._view: Optional[_CatalogView] = None
+        self._details: Dict[str, EncodedBody] = {}
+        self._lock = threading.Lock()
+
+    def _current(self) -> _CatalogView:
+        version = self.store.catalog.version
+        view = self._view
+        if view is None or view.version != version:
+            with self._lock:
+                if self._view is None or self._view.version != version:
+                    self._details = {}
+                    self._view = _CatalogView(self.store, version)
+                view = self._view
+        return view
+
+    def module_detail(self, module_id: str) -> Optional[EncodedBody]:
+        """Encoded detail response, None for unknown or inactive modules"""
+        version = self._current().version
+        details = self._details
+        if module_id not in details:
+            m = self.store.modules.get(module_id)
+            if m is None or not m.get("is_active", True):
+                return None
+            details[module_id] = EncodedBody.encode(
+                version, module_detail(m).model_dump_json().encode()
+            )
+        return details[module_id]
+
+    def module_list(
+        self,
+        difficulty: Optional[str] = None,
+        user_id: Optional[str] = None,
+        topic: Optional[str] = None,
+        sort: str = DEFAULT_SORT,
+        descending: bool = False,
+        page: int = 1,
+        page_size: int = 20
+    ) -> EncodedBody:
+        """
+        One page of the filtered, sorted module list, with the user's
+        completion flags overlaid. Costs O(page_size) once the filtered view
+        exists.
+
+        Raises:
+            ValueError: unknown sort key
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'")
+        view = self._current()
+        positions = view.view(sort, difficulty or "", (topic or "").lower())
+        total = len(positions)
+        start = (page - 1) * page_size
+        if descending:
+            window = positions[max(total - start - page_size, 0):max(total - start, 0)][::-1]
+        else:
+            window = positions[start:start + page_size]
+
+        completed = self.store.get_completion_mask(user_id) if user_id else 0
+        if completed & view.mask and any(completed & view.bits[i] for i in window):
+            body = _list_body(
+                (view.fragments[i][bool(completed & view.bits[i])] for i in window),
+                total, page, page_size,
+            )
+            # Per-user pages are small and short-lived; serve them uncompressed
+            return EncodedBody.encode(view.version, body, compress=False)
+
+        key = (sort, descending, difficulty or "", (topic or "").lower(), page, page_size)
+        encoded = view.pages.get(key)
+        if encoded is None:
+            body = _list_body((view.fragments[i][0] for i in window), total, page, page_size)
+            encoded = EncodedBody.encode(view.version, body)
+            if len(view.pages) >= MAX_CACHED_PAGES:
+                view.pages.pop(next(iter(view.pages)))
+            view.pages[key] = encoded
+        return encoded
+
+    def get_stats(self) -> Dict[str, object]:
+        view = self._view
+        return {
+            "catalog_version": view.version if view else None,
+            "cached_pages": len(view.pages) if view else 0,
+            "cached_details": len(self._details),
+            "brotli": BROTLI_AVAILABLE,
+        }
+
+
+def _list_body(entries: Iterable[bytes], total: int, page: int, page_size: int) -> bytes:
+    """ModuleListResponse JSON from pre-encoded entries"""
+    return b"".join((
+        b'{"modules":[', b",".join(entries),
+        b'],"total":%d,"page":%d,"page_size":%d}' % (total, page, page_size),
+    ))
@@ -0,0 +1,438 @@
+# app/services/event_sourced_store.py
+"""
+Event-sourced Learning Store
+
+A LearningStore whose only write path is the event log (see learning_events):
+each operation validates against current state, commits its events, and the
+events are then applied to the same in-memory structures LearningStore reads
+(sessions, progress, activity bitmaps, completion masks, badges). Those
+structures are projections; the log is the record.
+
+    LEARNING_STORE_BACKEND=events LEARNING_EVENT_LOG_PATH=learning_events.jsonl
+
+- Startup replays the journal, so a restart rebuilds every projection.
+- add_projection() attaches another fold over the log (a leaderboard, an
+  analytics counter); it is caught up on history, then fed each new event.
+- A process started with read_only=True is a replica: it never writes and
+  catch_up() applies whatever the writer has journaled since.
+- A session completion is one commit (SessionCompleted, Minted, BadgeAwarded),
+  so progress, completion and badges can never be partially applied. The
+  completion endpoint instead completes the session first (SessionClosed)
+  and credits it after the mint, in one commit of its own
+  (credit_session_completion: ProgressCredited, CompletionRecorded,
+  BadgeAwarded).
+- update_user_progress and record_completion on their own are one event
+  each (ProgressCredited, CompletionRecorded).
+- AnswerSubmitted records question positions, which only mean something
+  against the content the session started on, so SessionStarted records the
+  module's content_hash. A replayed session whose module no longer hashes
+  the same (or whose event predates the hash) is not restored: its answers
+  cannot be scored. Its completion and credit events still apply.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models.learning import BadgeInfo
+from app.services.activity_bitmap import ActivityBitmap, epoch_day
+from app.services.badge_rules import BadgeContext
+from app.services.learning_events import (
+    DEFAULT_EVENT_BUFFER,
+    AnswerSubmitted,
+    BadgeAwarded,
+    CompletionRecorded,
+    EventLog,
+    LearningEvent,
+    Minted,
+    ProgressCredited,
+    SessionAbandoned,
+    SessionClosed,
+    SessionCompleted,
+    SessionStarted,
+)
+from app.services.learning_session import LearningSession
+from app.services.learning_store import LearningStore
+
+logger = logging.getLogger(__name__)
+
+Projection = Callable[[LearningEvent], None]
+
+
+class EventSourcedLearningStore(LearningStore):
+    """LearningStore state as projections of an event log; see the module docstring"""
+
+    backend = "events"
+
+    def __init__(
+        self,
+        event_log_path: Optional[str] = None,
+        max_buffered_events: int = DEFAULT_EVENT_BUFFER,
+        read_only: bool = False,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.read_only = read_only
+        self._log = EventLog(event_log_path, max_buffered_events)
+        self._projections: List[Projection] = []
+        self._commit_lock = threading.RLock()
+        self._appliers: Dict[type, Projection] = {
+            SessionStarted: self._apply_session_started,
+            AnswerSubmitted: self._apply_answer_submitted,
+            SessionCompleted: self._apply_session_completed,
+            SessionClosed: self._apply_session_closed,
+            ProgressCredited: self._apply_progress_credited,
+            CompletionRecorded: self._apply_completion_recorded,
+            SessionAbandoned: self._apply_session_abandoned,
+            Minted: self._apply_minted,
+            BadgeAwarded: self._apply_badge_awarded,
+        }
+        self.catch_up()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "EventSourcedLearningStore":
+        return cls(
+            event_log_path=os.getenv("LEARNING_EVENT_LOG_PATH") or None,
+            max_buffered_events=int(os.getenv("LEARNING_EVENT_BUFFER", DEFAULT_EVENT_BUFFER)),
+            read_only=os.getenv("LEARNING_EVENT_READ_ONLY", "").strip().lower() in ("1", "true", "yes"),
+            **kwargs
+        )
+
+    def close(self) -> None:
+        self._log.close()
+
+    # Event Log
+    # =========
+
+    def _commit(self, events: List[LearningEvent]) -> None:
+        """Journal events as one commit, then apply them to every projection"""
+        if self.read_only:
+            raise RuntimeError("Read-only learning store replica; write through the primary")
+        with self._commit_lock:
+            self._log.append(events)
+            for event in events:
+                self._apply(event)
+
+    def _apply(self, event: LearningEvent) -> None:
+        self._appliers[type(event)](event)
+        for projection in self._projections:
+            projection(event)
+
+    def catch_up(self) -> int:
+        """Apply commits journaled since the last one seen; returns how many"""
+        applied = 0
+        with self._commit_lock:
+            for _, events in self._log.read_new():
+                for event in events:
+                    self._apply(event)
+                applied += 1
+        return applied
+
+    def add_projection(self, projection: Projection, replay: bool = True) -> None:
+        """Feed every future event to projection, after replaying history into it"""
+        with self._commit_lock:
+            if replay:
+                for event in self._log.read_all():
+                    projection(event)
+            self._projections.append(projection)
+
+    # Projections
+    # ===========
+
+    def _apply_session_started(self, event: SessionStarted) -> None:
+        catalog = self._pin_catalog()
+        compiled = catalog.compiled.get(event.module_id)
+        if not compiled or compiled.content_hash != event.content_hash:
+            # the module left the catalog, or its questions changed, since this event was written
+            if compiled:
+                logger.warning(
+                    f"Not restoring session {event.session_id}: module {event.module_id} content changed"
+                )
+            self._unpin_catalog(catalog.version)
+            return
+        self._index_session(LearningSession(
+            session_id=event.session_id,
+            user_id=event.user_id,
+            module_id=event.module_id,
+            question_count=compiled.question_count,
+            started_at=event.at,
+            catalog_version=catalog.version
+        ), event.at)
+
+    def _apply_answer_submitted(self, event: AnswerSubmitted) -> None:
+        session = self.sessions.get(event.session_id)
+        if session is None:
+            return  # evicted
+        for idx, selected_answer, correct, points in event.answers:
+            session.record_answer(idx, selected_answer, correct, points)
+        self._touch_session(event.session_id, event.at)
+
+    def _apply_session_completed(self, event: SessionCompleted) -> None:
+        self._close_session(event.session_id, event.at)
+        self._credit_progress(event.user_id, 0, event.xp_earned, event.minutes_spent, event.at)
+        self._add_completion(event.user_id, {
+            "module_id": event.module_id,
+            "completed_at": datetime.utcfromtimestamp(event.at).isoformat(),
+            "accuracy": event.accuracy,
+            "mic_earned": 0
+        })
+
+    def _apply_session_closed(self, event: SessionClosed) -> None:
+        self._close_session(event.session_id, event.at)
+
+    def _close_session(self, session_id: str, at: float) -> None:
+        session = self.sessions.get(session_id)
+        if session is not None and session.status == "active":
+            session.status = "completed"
+            session.completed_at = at
+            self._deactivate_session(session)
+            self._touch_session(session_id, at)
+
+    def _apply_progress_credited(self, event: ProgressCredited) -> None:
+        self._credit_progress(event.user_id, event.mic_earned, event.xp_earned, event.minutes_spent, event.at)
+
+    def _apply_completion_recorded(self, event: CompletionRecorded) -> None:
+        self._add_completion(event.user_id, {
+            "module_id": event.module_id,
+            "completed_at": datetime.utcfromtimestamp(event.at).isoformat(),
+            "accuracy": event.accuracy,
+            "mic_earned": event.mic_earned
+        })
+
+    def _apply_session_abandoned(self, event: SessionAbandoned) -> None:
+        super().abandon_session(event.session_id)
+
+    def _apply_minted(self, event: Minted) -> None:
+        self._credit_deferred_mint(event.user_id, event.module_id, event.amount)
+
+    def _apply_badge_awarded(self, event: BadgeAwarded) -> None:
+        owned = self.user_badges.setdefault(event.user_id, [])
+        if event.badge_id not in owned:
+            owned.append(event.badge_id)
+
+    # Commands
+    # ========
+
+    def create_session(self, user_id: str, module_id: str) -> Optional[LearningSession]:
+        compiled = self.compiled_modules.get(module_id)
+        if not compiled:
+            return None
+        session_id = f"{self.session_id_prefix}{uuid.uuid4().hex[:12]}"
+        self._commit([SessionStarted(session_id, user_id, module_id, self._clock(), compiled.content_hash)])
+        return self.sessions.get(session_id)
+
+    def submit_answer(self, session_id: str, question_id: str, selected_answer: int) -> Optional[dict]:
+        result = self.submit_answers(session_id, [(question_id, selected_answer)])
+        return result["results"][0] if result else None
+
+    def submit_answers(self, session_id: str, answers: List[Tuple[str, int]]) -> Optional[dict]:
+        with self._commit_lock:
+            session = self.sessions.get(session_id)
+            if not session or session.status != "active" or not answers:
+                return None
+            compiled = self.get_session_compiled(session)
+            if not compiled:
+                return None
+
+            recorded = []
+            batch_mask = 0
+            for question_id, selected_answer in answers:
+                idx = compiled.question_index.get(question_id)
+                if idx is None or session.is_answered(idx) or batch_mask >> idx & 1:
+                    return None
+                batch_mask |= 1 << idx
+                correct = selected_answer == compiled.answer_key[idx]
+                recorded.append((idx, selected_answer, correct, compiled.points[idx] if correct else 0))
+
+            score, answered = session.current_score, session.questions_answered
+            results = []
+            for (question_id, _), (idx, _, correct, points) in zip(answers, recorded):
+                score += points
+                answered += 1
+                results.append({
+                    "question_id": question_id,
+                    "correct": correct,
+                    "points_earned": points,
+                    "explanation": compiled.explanations[idx],
+                    "cumulative_score": score,
+                    "questions_remaining": compiled.question_count - answered
+                })
+            self._commit([AnswerSubmitted(session_id, tuple(recorded), self._clock())])
+
+        return {
+            "results": results,
+            "cumulative_score": score,
+            "questions_answered": answered,
+            "questions_remaining": compiled.question_count - answered
+        }
+
+    def complete_session(self, session_id: str) -> Optional[LearningSession]:
+        with self._commit_lock:
+            session = self.sessions.get(session_id)
+            if not session or session.status != "active":
+                return None
+            self._commit([SessionClosed(session_id, self._clock())])
+        return session
+
+    def abandon_session(self, session_id: str) -> Optional[LearningSession]:
+        with self._commit_lock:
+            session = self.sessions.get(session_id)
+            if not session or session.status != "active":
+                return None
+            self._commit([SessionAbandoned(session_id, self._clock())])
+        return session
+
+    def _evict_session(self, session_id: str) -> LearningSession:
+        if self.read_only:
+            # the primary journals the abandonment; a replica only mirrors it
+            LearningStore.abandon_session(self, session_id)
+        return super()._evict_session(session_id)
+
+    def update_user_progress(self, user_id: str, mic_earned: int, xp_earned: int, minutes_spent: int) -> dict:
+        self._commit([ProgressCredited(user_id, mic_earned, xp_earned, minutes_spent, self._clock())])
+        return self.get_user_progress(user_id)
+
+    def record_completion(self, user_id: str, module_id: str, accuracy: float, mic_earned: int) -> None:
+        self._commit([CompletionRecorded(user_id, module_id, accuracy, mic_earned, self._clock())])
+
+    def record_deferred_mint(self, user_id: str, module_id: str, mic_earned: int) -> List[BadgeInfo]:
+        """Credit a queued mint and the MIC-threshold badges it reaches in one commit"""
+        with self._commit_lock:
+            now = self._clock()
+            total_mic = self.get_user_progress(user_id)["total_mic_earned"] + mic_earned
+            existing = set(self.user_badges.get(user_id, ()))
+            badge_ids = [
+                badge_id for badge_id in self.badge_plan.evaluate_mic_total(total_mic, existing)
+                if badge_id in self.badges
+            ]
+            self._commit([Minted(user_id, module_id, mic_earned, now)]
+                         + [BadgeAwarded(user_id, badge_id, now) for badge_id in badge_ids])
+        return self._badge_infos(badge_ids, now)
+
+    def record_session_completion(
+        self,
+        session_id: str,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        mic_earned: int,
+        xp_earned: int,
+        minutes_spent: int
+    ) -> Tuple[dict, List[BadgeInfo]]:
+        """Complete, credit and badge a session in one commit"""
+        with self._commit_lock:
+            session = self.sessions.get(session_id)
+            if not session or session.status != "active":
+                return self.get_user_progress(user_id), []
+            now = self._clock()
+            events: List[LearningEvent] = [
+                SessionCompleted(session_id, user_id, module_id, accuracy, xp_earned, minutes_spent, now)
+            ]
+            if mic_earned:
+                events.append(Minted(user_id, module_id, mic_earned, now))
+            badge_ids = self._completion_badges(user_id, module_id, accuracy, mic_earned, now)
+            events += [BadgeAwarded(user_id, badge_id, now) for badge_id in badge_ids]
+            self._commit(events)
+        return self.get_user_progress(user_id), self._badge_infos(badge_ids, now)
+
+    def credit_session_completion(
+        self,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        mic_earned: int,
+        xp_earned: int,
+        minutes_spent: int
+    ) -> Tuple[dict, List[BadgeInfo]]:
+        """Credit and badge a session already completed (SessionClosed) in one commit"""
+        with self._commit_lock:
+            now = self._clock()
+            events: List[LearningEvent] = [
+                ProgressCredited(user_id, mic_earned, xp_earned, minutes_spent, now),
+                CompletionRecorded(user_id, module_id, accuracy, mic_earned, now),
+            ]
+            badge_ids = self._completion_badges(user_id, module_id, accuracy, mic_earned, now)
+            events += [BadgeAwarded(user_id, badge_id, now) for badge_id in badge_ids]
+            self._commit(events)
+        return self.get_user_progress(user_id), self._badge_infos(badge_ids, now)
+
+    def _completion_badges(
+        self,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        mic_earned: int,
+        now: float
+    ) -> List[str]:
+        """Badges a completion earns, judged on the state its commit will produce"""
+        progress = self.get_user_progress(user_id)
+        today = epoch_day(now)
+        activity = self.activity.get(user_id) or ActivityBitmap()
+        streak = activity.streak_ending(today) if activity.is_active(today) else activity.streak_ending(today - 1) + 1
+        ctx = BadgeContext(
+            module_id=module_id,
+            accuracy=accuracy,
+            is_first_module=progress["modules_completed"] == 0,
+            completion_mask=self._completion_masks.get(user_id, 0) | self.module_bit(module_id),
+            total_mic=progress["total_mic_earned"] + mic_earned,
+            current_streak=streak,
+        )
+        return self._new_badges(user_id, ctx)
+
+    def check_and_award_badges(
+        self,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        is_first_module: bool
+    ) -> List[BadgeInfo]:
+        with self._commit_lock:
+            progress = self.get_user_progress(user_id)
+            ctx = BadgeContext(
+                module_id=module_id,
+                accuracy=accuracy,
+                is_first_module=is_first_module,
+                completion_mask=self._completion_masks.get(user_id, 0),
+                total_mic=progress["total_mic_earned"],
+                current_streak=progress["current_streak"],
+            )
+            badge_ids = self._new_badges(user_id, ctx)
+            now = self._clock()
+            if badge_ids:
+                self._commit([BadgeAwarded(user_id, badge_id, now) for badge_id in badge_ids])
+        return self._badge_infos(badge_ids, now)
+
+    def _new_badges(self, user_id: str, ctx: BadgeContext) -> List[str]:
+        existing = set(self.user_badges.get(user_id, ()))
+        return [
+            badge_id for badge_id in self.badge_plan.evaluate(ctx, existing)
+            if badge_id in self.badges
+        ]
+
+    def _badge_infos(self, badge_ids: List[str], now: float) -> List[BadgeInfo]:
+        earned_at = datetime.utcfromtimestamp(now).isoformat()
+        return [
+            BadgeInfo(
+                id=badge["id"],
+                name=badge["name"],
+                description=badge["description"],
+                icon=badge["icon"],
+                earned_at=earned_at,
+                rarity=badge["rarity"]
+            )
+            for badge in (self.badges[badge_id] for badge_id in badge_ids)
+        ]
+
+    def get_session_metrics(self) -> Dict[str, Any]:
+        return {
+            **super().get_session_metrics(),
+            "backend": self.backend,
+            "event_commits": self._log.seq,
+            "events_total": self._log.events_total,
+            "event_journal_enabled": bool(self._log.path),
+            "projections": len(self._projections),
+            "read_only": self.read_only,
+        }
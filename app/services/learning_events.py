@@ -0,0 +1,225 @@
+# app/services/learning_events.py
+"""
+Learning Events
+
+The event log behind EventSourcedLearningStore (see event_sourced_store).
+Every change to sessions, progress, completions and badges is one of the
+events below; the store's dicts and bitsets, and any projection added later,
+are folds over this log.
+
+- A commit is the events of one store operation (a session completion is
+  SessionCompleted, Minted and any BadgeAwarded together). With
+  LEARNING_EVENT_LOG_PATH set, each commit is one JSON line in the journal,
+  so a crash mid-write loses the whole commit, never part of it.
+- The journal has a single writer; other processes may tail it read-only
+  (read_new) to keep replica projections up to date.
+- The newest events are also kept in memory (max_buffered) so projections
+  added at runtime can be caught up without a journal.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_BUFFER = 10_000
+
+
+@dataclass(frozen=True)
+class SessionStarted:
+    session_id: str
+    user_id: str
+    module_id: str
+    at: float
+    content_hash: Optional[int] = None  # CompiledModule.content_hash; None in journals that predate it
+
+
+@dataclass(frozen=True)
+class AnswerSubmitted:
+    session_id: str
+    answers: Tuple[Tuple[int, int, bool, int], ...]  # (question index, selected, correct, points)
+    at: float
+
+
+@dataclass(frozen=True)
+class SessionCompleted:
+    session_id: str
+    user_id: str
+    module_id: str
+    accuracy: float
+    xp_earned: int
+    minutes_spent: int
+    at: float
+
+
+@dataclass(frozen=True)
+class SessionClosed:
+    """A session completed ahead of its credit (ProgressCredited, CompletionRecorded)"""
+    session_id: str
+    at: float
+
+
+@dataclass(frozen=True)
+class ProgressCredited:
+    user_id: str
+    mic_earned: int
+    xp_earned: int
+    minutes_spent: int
+    at: float
+
+
+@dataclass(frozen=True)
+class CompletionRecorded:
+    user_id: str
+    module_id: str
+    accuracy: float
+    mic_earned: int
+    at: float
+
+
+@dataclass(frozen=True)
+class SessionAbandoned:
+    session_id: str
+    at: float
+
+
+@dataclass(frozen=True)
+class Minted:
+    user_id: str
+    module_id: str
+    amount: int
+    at: float
+
+
+@dataclass(frozen=True)
+class BadgeAwarded:
+    user_id: str
+    badge_id: str
+    at: float
+
+
+LearningEvent = Union[
+    SessionStarted, AnswerSubmitted, SessionCompleted, SessionClosed, ProgressCredited, CompletionRecorded,
+    SessionAbandoned, Minted, BadgeAwarded,
+]
+
+EVENT_TYPES = {
+    cls.__name__: cls
+    for cls in (
+        SessionStarted, AnswerSubmitted, SessionCompleted, SessionClosed, ProgressCredited, CompletionRecorded,
+        SessionAbandoned, Minted, BadgeAwarded,
+    )
+}
+
+
+def encode_event(event: LearningEvent) -> Dict[str, Any]:
+    return {"type": type(event).__name__, **asdict(event)}
+
+
+def decode_event(record: Dict[str, Any]) -> LearningEvent:
+    fields = dict(record)
+    cls = EVENT_TYPES[fields.pop("type")]
+    if cls is AnswerSubmitted:
+        fields["answers"] = tuple(tuple(answer) for answer in fields["answers"])
+    return cls(**fields)
+
+
+class EventLog:
+    """Append-only log of event commits, journaled to path when given"""
+
+    def __init__(self, path: Optional[str] = None, max_buffered: int = DEFAULT_EVENT_BUFFER):
+        self.path = path
+        self.seq = 0            # last commit written or read
+        self.events_total = 0
+        self._buffer: Deque[LearningEvent] = deque(maxlen=max_buffered)
+        self._offset = 0        # journal bytes already written or read
+        self._file = None
+        self._lock = threading.Lock()
+
+    def append(self, events: Sequence[LearningEvent]) -> int:
+        """Write one commit and return its sequence number"""
+        with self._lock:
+            seq = self.seq + 1
+            if self.path:
+                if self._file is None:
+                    self._open_for_append()
+                line = json.dumps(
+                    {"seq": seq, "events": [encode_event(e) for e in events]}, separators=(",", ":")
+                )
+                self._file.write(line + "\n")
+                self._file.flush()
+                self._offset = self._file.tell()
+            self.seq = seq
+            self._remember(events)
+            return seq
+
+    def _open_for_append(self) -> None:
+        # a crash can leave a torn last line; cut it off so the next commit starts clean
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self._offset:
+            logger.warning(f"Truncating torn tail of learning event journal at byte {self._offset}")
+            with open(self.path, "r+b") as f:
+                f.truncate(self._offset)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _remember(self, events: Sequence[LearningEvent]) -> None:
+        self._buffer.extend(events)
+        self.events_total += len(events)
+
+    def read_new(self) -> Iterator[Tuple[int, List[LearningEvent]]]:
+        """
+        Commits in the journal past the last one written or read: the whole
+        journal on startup, then whatever another writer has appended since.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    return  # torn, or still being written
+                self._offset += len(raw)
+                try:
+                    record = json.loads(raw)
+                    events = [decode_event(e) for e in record["events"]]
+                    seq = int(record["seq"])
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Skipping corrupt learning event journal line")
+                    continue
+                self.seq = seq
+                self._remember(events)
+                yield seq, events
+
+    def read_all(self) -> Iterator[LearningEvent]:
+        """Every event from the start: the journal if there is one, else what is buffered"""
+        if not self.path:
+            if self.events_total > len(self._buffer):
+                logger.warning(
+                    f"Event buffer holds {len(self._buffer)} of {self.events_total} events; "
+                    "set LEARNING_EVENT_LOG_PATH to replay full history"
+                )
+            yield from list(self._buffer)
+            return
+        if not os.path.exists(self.path):
+            return
+        end, position = self._offset, 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                position += len(raw)
+                if position > end:
+                    return  # not yet applied by this process
+                try:
+                    events = [decode_event(e) for e in json.loads(raw)["events"]]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                yield from events
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,159 @@
+# app/services/learning_session.py
+"""
+Compact Learning Session
+
+A quiz session is a __slots__ object rather than a dict with a nested
+answers dict-of-dicts. Per-question state is positional, using the module's
+compiled question order:
+
+- answered_mask / correct_mask: bit i set when question i was answered / correct
+- selected: one byte per question holding the chosen option
+
+The dict shape the API has always used is produced only when serializing
+(to_dict), from the session plus its CompiledModule. Positions refer to the
+catalog version the session started on (catalog_version), which the store
+keeps alive until the session is evicted. Stores shared across processes,
+whose version numbers differ per worker, match the module by content_hash
+instead.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.services.module_catalog import CompiledModule
+
+# Options beyond one byte can never be correct; they are recorded as this value
+SELECTED_OVERFLOW = 255
+
+
+@dataclass(frozen=True)
+class SessionScore:
+    """A session's result, scored by the server against the answer key"""
+    questions_answered: int
+    correct_answers: int
+    earned_points: int
+    total_points: int
+    accuracy: float  # correct answers / questions in the module
+
+
+class LearningSession:
+    """In-memory state of a single learning session"""
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "module_id",
+        "catalog_version",
+        "content_hash",
+        "status",
+        "started_at",
+        "completed_at",
+        "answered_mask",
+        "correct_mask",
+        "current_score",
+        "selected",
+    )
+
+    def __init__(
+        self,
+        session_id: str,
+        user_id: str,
+        module_id: str,
+        question_count: int,
+        started_at: float,
+        catalog_version: int = 1,
+        content_hash: Optional[int] = None
+    ):
+        self.id = session_id
+        self.user_id = user_id
+        self.module_id = module_id
+        self.catalog_version = catalog_version  # catalog the session is scored against
+        self.content_hash = content_hash        # CompiledModule.content_hash, where the store tracks it
+        self.status = "active"
+        self.started_at = started_at            # epoch seconds (UTC)
+        self.completed_at: Optional[float] = None
+        self.answered_mask = 0
+        self.correct_mask = 0
+        self.current_score = 0
+        self.selected = bytearray(question_count)
+
+    @property
+    def questions_answered(self) -> int:
+        return self.answered_mask.bit_count()
+
+    @property
+    def correct_answers(self) -> int:
+        return self.correct_mask.bit_count()
+
+    @property
+    def started_datetime(self) -> datetime:
+        return datetime.utcfromtimestamp(self.started_at)
+
+    def is_answered(self, idx: int) -> bool:
+        return bool(self.answered_mask >> idx & 1)
+
+    def record_answer(self, idx: int, selected_answer: int, correct: bool, points: int) -> None:
+        """Record the answer to the question at position idx"""
+        bit = 1 << idx
+        self.answered_mask |= bit
+        if correct:
+            self.correct_mask |= bit
+        self.selected[idx] = min(selected_answer, SELECTED_OVERFLOW)
+        self.current_score += points
+
+    def score(self, compiled: CompiledModule) -> SessionScore:
+        """
+        Score the recorded answers against the compiled answer key in one pass.
+
+        Only answered_mask and selected are trusted; correctness and points
+        are re-derived, so the result never depends on client-sent stats.
+        """
+        answered = correct = earned = 0
+        answer_key, points, selected = compiled.answer_key, compiled.points, self.selected
+        mask = self.answered_mask
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            idx = low.bit_length() - 1
+            answered += 1
+            if selected[idx] == answer_key[idx]:
+                correct += 1
+                earned += points[idx]
+        count = compiled.question_count
+        return SessionScore(
+            questions_answered=answered,
+            correct_answers=correct,
+            earned_points=earned,
+            total_points=compiled.total_points,
+            accuracy=correct / count if count else 0.0,
+        )
+
+    def to_dict(self, compiled: CompiledModule) -> Dict[str, Any]:
+        """Serialize to the legacy session dict shape"""
+        answers = {}
+        for idx, question_id in enumerate(compiled.question_ids):
+            if not self.is_answered(idx):
+                continue
+            correct = bool(self.correct_mask >> idx & 1)
+            answers[question_id] = {
+                "selected": self.selected[idx],
+                "correct": correct,
+                "points": compiled.points[idx] if correct else 0,
+            }
+
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "module_id": self.module_id,
+            "started_at": self.started_datetime.isoformat(),
+            "completed_at": (
+                datetime.utcfromtimestamp(self.completed_at).isoformat()
+                if self.completed_at is not None else None
+            ),
+            "status": self.status,
+            "questions_answered": self.questions_answered,
+            "correct_answers": self.correct_answers,
+            "current_score": self.current_score,
+            "answers": answers,
+        }
@@ -11,11 +11,33 @@ Architecture:
 - Derived balance: SUM(amount) = wallet balance
 """
 
+import logging
+import os
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from app.models.learning import MICReason, MICLedgerEntry
 
+logger = logging.getLogger(__name__)
+
+
+def ledger_cursor(entry: MICLedgerEntry) -> str:
+    """Keyset cursor pointing just past an entry (newest-first paging)"""
+    return f"{entry.created_at.isoformat()}|{entry.id}"
+
+
+def parse_ledger_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Split a cursor into (created_at, entry_id).
+    
+    Raises:
+        ValueError: not a cursor produced by ledger_cursor
+    """
+    created_at, _, entry_id = cursor.partition("|")
+    if not entry_id:
+        raise ValueError("Invalid ledger cursor")
+    return datetime.fromisoformat(created_at), entry_id
+
 
 class MICLedgerStore:
     """
@@ -32,6 +54,9 @@ class MICLedgerStore:
         
         # Index for fast user lookups (user_id -> list of entry indices)
         self._user_index: Dict[str, List[int]] = {}
+        
+        # Entry ID -> position in its user's index, for cursor paging
+        self._user_positions: Dict[str, int] = {}
     
     def append_entry(
         self,
@@ -88,6 +113,7 @@ class MICLedgerStore:
         # Update user index
         if user_id not in self._user_index:
             self._user_index[user_id] = []
+        self._user_positions[entry_id] = len(self._user_index[user_id])
         self._user_index[user_id].append(entry_index)
         
         return MICLedgerEntry(
@@ -197,6 +223,50 @@ class MICLedgerStore:
         
         return total, entries
     
+    def get_ledger_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MICLedgerEntry], Optional[str]]:
+        """
+        Get a page of ledger entries, newest first, after a keyset cursor.
+        
+        Returns (entries, next_cursor); next_cursor is None on the last page.
+        
+        Raises:
+            ValueError: cursor is malformed or not one of this user's entries
+        """
+        indices = self._user_index.get(user_id, [])
+        end = len(indices)
+        if cursor is not None:
+            _, entry_id = parse_ledger_cursor(cursor)
+            end = self._user_positions.get(entry_id, -1)
+            if end < 0 or end >= len(indices) or self._ledger[indices[end]]["id"] != entry_id:
+                raise ValueError("Invalid ledger cursor")
+        
+        entries = [
+            self._entry(self._ledger[idx])
+            for idx in indices[max(0, end - limit):end][::-1]
+        ]
+        next_cursor = ledger_cursor(entries[-1]) if entries and end - limit > 0 else None
+        return entries, next_cursor
+    
+    def _entry(self, entry_dict: dict) -> MICLedgerEntry:
+        return MICLedgerEntry(
+            id=entry_dict["id"],
+            user_id=entry_dict["user_id"],
+            amount=entry_dict["amount"],
+            reason=MICReason(entry_dict["reason"]),
+            integrity_score=entry_dict["integrity_score"],
+            gii=entry_dict["gii"],
+            module_id=entry_dict["module_id"],
+            session_id=entry_dict["session_id"],
+            transaction_id=entry_dict["transaction_id"],
+            metadata=entry_dict["metadata"],
+            created_at=datetime.fromisoformat(entry_dict["created_at"])
+        )
+    
     def get_last_entry(self, user_id: str) -> Optional[MICLedgerEntry]:
         """Get the most recent ledger entry for a user."""
         if user_id not in self._user_index or not self._user_index[user_id]:
@@ -289,5 +359,38 @@ class MICLedgerStore:
         return breakdown
 
 
+def create_mic_ledger_store() -> MICLedgerStore:
+    """
+    Ledger for this process, chosen by MIC_LEDGER_BACKEND (falling back to
+    STORE_BACKEND): "memory" (default), "postgres" (DATABASE_URL, see
+    pg_mic_ledger_store), "sqlite" (SQLITE_STORE_PATH, see sqlite_mic_ledger_store)
+    or "sharded" (shard processes, see sharding).
+    """
+    backend = (os.getenv("MIC_LEDGER_BACKEND") or os.getenv("STORE_BACKEND", "memory")).strip().lower()
+    if backend == "sharded":
+        # imports this module, so only once MICLedgerStore is defined
+        from app.services.sharded_mic_ledger_store import ShardedMICLedgerStore  # noqa: PLC0415
+        from app.services.sharding import shard_router  # noqa: PLC0415
+
+        return ShardedMICLedgerStore(shard_router())
+    if backend == "sqlite":
+        # imports this module, so only once MICLedgerStore is defined
+        from app.services.sqlite_mic_ledger_store import SqliteMICLedgerStore  # noqa: PLC0415
+
+        return SqliteMICLedgerStore.from_env()
+    if backend == "postgres":
+        if not os.getenv("DATABASE_URL", "").strip():
+            logger.warning("MIC_LEDGER_BACKEND=postgres without DATABASE_URL; using in-memory ledger")
+            return MICLedgerStore()
+        try:
+            # imports this module, so only once MICLedgerStore is defined
+            from app.services.pg_mic_ledger_store import PostgresMICLedgerStore  # noqa: PLC0415
+        except ImportError:
+            logger.warning("psycopg2 not installed; using in-memory MIC ledger")
+            return MICLedgerStore()
+        return PostgresMICLedgerStore.from_env()
+    return MICLedgerStore()
+
+
 # Global singleton instance
-mic_ledger_store = MICLedgerStore()
+mic_ledger_store = create_mic_ledger_store()
@@ -9,11 +9,11 @@ The wallet balance is DERIVED from the ledger, never stored separately.
 
 import logging
 import os
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import uuid
 
-from app.models.learning import MICReason
+from app.models.learning import MICLedgerEntry, MICReason
 from app.services.mic_ledger_store import mic_ledger_store
 
 logger = logging.getLogger(__name__)
@@ -124,6 +124,11 @@ class MICMintingService:
         self._log_sustained_gate_todo_once()
         return 1.0, "healthy"
     
+    def minting_available(self) -> bool:
+        """True when the current GII allows minting (reward floor cleared)."""
+        _, status = self.calculate_gii_multiplier(self.get_global_integrity_index())
+        return status == "healthy"
+
     def calculate_streak_bonus(self, streak_days: int) -> float:
         """Calculate streak bonus based on consecutive learning days"""
         bonus = 0.0
@@ -172,6 +177,11 @@ class MICMintingService:
                 "mic_earned": 0,
                 "can_mint": False,
                 "reason": self._get_rejection_reason(gii, integrity_score, accuracy),
+                # Only system health blocked the mint: it can wait in the mint queue
+                "deferrable": (
+                    integrity_score >= self.MIN_INTEGRITY_SCORE and
+                    accuracy >= self.MIN_ACCURACY
+                ),
                 "system_status": system_status,
                 "gii": gii,
                 "breakdown": {}
@@ -315,6 +325,13 @@ class MICMintingService:
             "timestamp": datetime.utcnow().isoformat()
         }
     
+    def find_session_mint(self, user_id: str, session_id: str) -> Optional[MICLedgerEntry]:
+        """The ledger entry that minted a learning session's reward, if any"""
+        for entry in mic_ledger_store.get_entries_by_reason(user_id, MICReason.LEARN):
+            if entry.session_id == session_id:
+                return entry
+        return None
+    
     def estimate_reward(
         self,
         base_reward: int,
@@ -0,0 +1,366 @@
+# app/services/mint_queue.py
+"""
+Deferred MIC Mint Queue
+
+When the Global Integrity Index drops below the reward floor, a learning
+completion is still recorded immediately and its mint is parked here instead
+of being rejected. Queued mints drain with bounded concurrency once
+calculate_gii_multiplier reports the system healthy again.
+
+Durability:
+- Set MINT_QUEUE_PATH to journal every job state change as JSON lines
+- The journal is replayed on startup; jobs caught mid-mint return to pending
+- Once a drain leaves nothing pending or in flight, the journal is rewritten
+  to hold only failed jobs: minted ones are in the ledger, so it does not
+  grow with every mint that ever passed through
+- Before minting, a job looks its session up in the ledger. A mint that
+  reached the ledger but was never journaled as minted (a crash or error
+  between the two) is completed from that entry instead of minted again
+- The MIC ledger stays the source of truth for balances; the queue only
+  holds mints that have not reached it yet
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.models.learning import MintJobStatus
+from app.receipts import create_mint_receipt
+from app.services.mic_minting import MICMintingService
+
+logger = logging.getLogger(__name__)
+
+
+class MintQueue:
+    """
+    Queue of mints waiting for the circuit breaker to clear
+
+    One job per learning session; enqueueing the same session twice returns
+    the existing job, so client retries never double-mint.
+    """
+
+    MAX_ATTEMPTS = 5
+
+    def __init__(
+        self,
+        minting_service: MICMintingService,
+        journal_path: Optional[str] = None,
+        max_concurrency: int = 4,
+        on_minted: Optional[Callable[[dict], Any]] = None
+    ):
+        self._minting = minting_service
+        self._journal_path = journal_path
+        self.max_concurrency = max(1, max_concurrency)
+        self._on_minted = on_minted
+
+        self._jobs: Dict[str, dict] = {}               # mint_id -> job
+        self._pending: Deque[str] = deque()            # FIFO of pending mint_ids
+        self._by_session: Dict[str, str] = {}          # session_id -> mint_id
+        self._user_index: Dict[str, List[str]] = {}    # user_id -> mint_ids
+
+        self._task: Optional[asyncio.Task] = None
+
+        if journal_path:
+            self._replay()
+
+    # Queue Operations
+    # ================
+
+    def enqueue(
+        self,
+        user_id: str,
+        session_id: str,
+        module_id: str,
+        reward_inputs: Dict[str, Any]
+    ) -> dict:
+        """
+        Park a mint until minting is available again.
+
+        reward_inputs are the keyword arguments for
+        MICMintingService.calculate_reward; the reward is calculated when the
+        job drains so it reflects the GII multiplier at mint time.
+        """
+        existing = self._by_session.get(session_id)
+        if existing:
+            return self._jobs[existing]
+
+        now = datetime.utcnow().isoformat()
+        job = {
+            "mint_id": f"mint_{uuid.uuid4().hex[:12]}",
+            "user_id": user_id,
+            "session_id": session_id,
+            "module_id": module_id,
+            "status": MintJobStatus.PENDING.value,
+            "attempts": 0,
+            "enqueued_at": now,
+            "updated_at": now,
+            "reward_inputs": dict(reward_inputs),
+            "mic_earned": None,
+            "transaction_id": None,
+            "ledger_id": None,
+            "receipt_hash": None,
+            "reason": None,
+        }
+        self._index(job)
+        self._pending.append(job["mint_id"])
+        self._journal(job)
+
+        logger.info(
+            f"Mint deferred: user={user_id}, session={session_id}, "
+            f"module={module_id}, mint_id={job['mint_id']}, depth={self.depth()}"
+        )
+        return job
+
+    def depth(self) -> int:
+        """Number of mints waiting to drain"""
+        return len(self._pending)
+
+    def get_job(self, mint_id: str) -> Optional[dict]:
+        """Get a queued mint by ID"""
+        return self._jobs.get(mint_id)
+
+    def get_job_for_session(self, session_id: str) -> Optional[dict]:
+        """Get the queued mint for a learning session, if any"""
+        mint_id = self._by_session.get(session_id)
+        return self._jobs.get(mint_id) if mint_id else None
+
+    def get_user_jobs(self, user_id: str) -> List[dict]:
+        """Get a user's queued mints, most recent first"""
+        return [self._jobs[mid] for mid in reversed(self._user_index.get(user_id, []))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and per-status counts"""
+        counts = {status.value: 0 for status in MintJobStatus}
+        for job in self._jobs.values():
+            counts[job["status"]] += 1
+
+        _, system_status = self._minting.calculate_gii_multiplier(
+            self._minting.get_global_integrity_index()
+        )
+        return {
+            "depth": self.depth(),
+            "minting": counts[MintJobStatus.MINTING.value],
+            "minted": counts[MintJobStatus.MINTED.value],
+            "failed": counts[MintJobStatus.FAILED.value],
+            "draining": system_status == "healthy",
+            "circuit_breaker_status": system_status,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    # Draining
+    # ========
+
+    async def drain(self) -> int:
+        """
+        Mint every pending job if the system is healthy.
+
+        Works on a snapshot of the pending queue with at most max_concurrency
+        mints in flight. Returns the number of jobs minted.
+        """
+        if not self._pending or not self._minting.minting_available():
+            return 0
+
+        batch = []
+        while self._pending:
+            job = self._jobs[self._pending.popleft()]
+            self._set_status(job, MintJobStatus.MINTING)
+            batch.append(job)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(job: dict) -> bool:
+            async with semaphore:
+                return await self._mint(job)
+
+        results = await asyncio.gather(*(bounded(job) for job in batch))
+        minted = sum(1 for ok in results if ok)
+
+        if minted:
+            logger.info(f"Mint queue drained: minted={minted}, depth={self.depth()}")
+        self._compact_journal()
+        return minted
+
+    async def run(self, poll_seconds: float = 5.0) -> None:
+        """Drain forever, checking system health every poll_seconds"""
+        while True:
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Mint queue drain failed")
+            await asyncio.sleep(poll_seconds)
+
+    def start(self, poll_seconds: float = 5.0) -> None:
+        """Start the background drain loop on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run(poll_seconds))
+
+    async def stop(self) -> None:
+        """Stop the background drain loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _mint(self, job: dict) -> bool:
+        """Mint a single job; requeue it if the breaker tripped again"""
+        job["attempts"] += 1
+        inputs = job["reward_inputs"]
+
+        try:
+            entry = self._minting.find_session_mint(job["user_id"], job["session_id"])
+            if entry is not None:
+                logger.warning(f"Deferred mint already in ledger: mint_id={job['mint_id']}, tx={entry.transaction_id}")
+                receipt = create_mint_receipt(
+                    subject_id=job["user_id"],
+                    session_id=job["session_id"],
+                    module_id=job["module_id"],
+                    minted_mic=entry.amount,
+                    accuracy=inputs["accuracy"],
+                    integrity_score=entry.integrity_score,
+                    gii=entry.gii if entry.gii is not None else 0.92,
+                    timestamp=entry.created_at
+                )
+                self._minted(job, int(entry.amount), entry.transaction_id, entry.id, receipt.receipt_hash)
+                return True
+
+            reward = self._minting.calculate_reward(**inputs)
+            if not reward["can_mint"]:
+                if reward.get("deferrable"):
+                    self._requeue(job)
+                else:
+                    self._fail(job, reward.get("reason", "Unknown"))
+                return False
+
+            mic_earned = reward["mic_earned"]
+            receipt = create_mint_receipt(
+                subject_id=job["user_id"],
+                session_id=job["session_id"],
+                module_id=job["module_id"],
+                minted_mic=mic_earned,
+                accuracy=inputs["accuracy"],
+                integrity_score=inputs["integrity_score"],
+                gii=reward.get("gii", 0.92)
+            )
+            result = await self._minting.mint_reward(
+                user_id=job["user_id"],
+                module_id=job["module_id"],
+                session_id=job["session_id"],
+                mic_amount=mic_earned,
+                accuracy=inputs["accuracy"],
+                integrity_score=inputs["integrity_score"]
+            )
+        except ValueError as e:
+            if self._minting.minting_available():
+                self._fail(job, str(e))
+            else:
+                self._requeue(job)
+            return False
+        except Exception as e:
+            logger.exception(f"Deferred mint failed: mint_id={job['mint_id']}")
+            if job["attempts"] >= self.MAX_ATTEMPTS:
+                self._fail(job, f"{type(e).__name__}: {e}")
+            else:
+                self._requeue(job)
+            return False
+
+        self._minted(job, mic_earned, result["transaction_id"], result.get("ledger_id"), receipt.receipt_hash)
+        return True
+
+    def _minted(
+        self,
+        job: dict,
+        mic_earned: int,
+        transaction_id: Optional[str],
+        ledger_id: Optional[str],
+        receipt_hash: str
+    ) -> None:
+        job["mic_earned"] = mic_earned
+        job["transaction_id"] = transaction_id
+        job["ledger_id"] = ledger_id
+        job["receipt_hash"] = receipt_hash
+        self._set_status(job, MintJobStatus.MINTED)
+
+        if self._on_minted:
+            try:
+                self._on_minted(job)
+            except Exception:
+                logger.exception(f"Mint queue on_minted hook failed: mint_id={job['mint_id']}")
+
+    # Internal State
+    # ==============
+
+    def _index(self, job: dict) -> None:
+        self._jobs[job["mint_id"]] = job
+        self._by_session[job["session_id"]] = job["mint_id"]
+        user_jobs = self._user_index.setdefault(job["user_id"], [])
+        if job["mint_id"] not in user_jobs:
+            user_jobs.append(job["mint_id"])
+
+    def _set_status(self, job: dict, status: MintJobStatus) -> None:
+        job["status"] = status.value
+        job["updated_at"] = datetime.utcnow().isoformat()
+        self._journal(job)
+
+    def _requeue(self, job: dict) -> None:
+        self._set_status(job, MintJobStatus.PENDING)
+        self._pending.append(job["mint_id"])
+
+    def _fail(self, job: dict, reason: str) -> None:
+        job["reason"] = reason
+        self._set_status(job, MintJobStatus.FAILED)
+        logger.warning(f"Deferred mint rejected: mint_id={job['mint_id']}, reason={reason}")
+
+    def _journal(self, job: dict) -> None:
+        """Append the job's current state to the journal file"""
+        if not self._journal_path:
+            return
+        with open(self._journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(job, separators=(",", ":")) + "\n")
+
+    def _compact_journal(self) -> None:
+        """Rewrite the journal as the failed jobs only, if nothing is pending or minting"""
+        if not self._journal_path or self._pending:
+            return
+        if any(job["status"] == MintJobStatus.MINTING.value for job in self._jobs.values()):
+            return  # an overlapping drain still has mints in flight
+
+        tmp_path = f"{self._journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for job in self._jobs.values():
+                if job["status"] == MintJobStatus.FAILED.value:
+                    f.write(json.dumps(job, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self._journal_path)
+
+    def _replay(self) -> None:
+        """Rebuild queue state from the journal (last record per job wins)"""
+        if not os.path.exists(self._journal_path):
+            return
+
+        with open(self._journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    job = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping corrupt mint queue journal line")
+                    continue
+                self._index(job)
+
+        for job in self._jobs.values():
+            # Jobs caught mid-mint by a restart go back to pending
+            if job["status"] in (MintJobStatus.PENDING.value, MintJobStatus.MINTING.value):
+                job["status"] = MintJobStatus.PENDING.value
+                self._pending.append(job["mint_id"])
+
+        if self._pending:
+            logger.info(f"Mint queue restored {len(self._pending)} pending mints from journal")
@@ -0,0 +1,256 @@
+# app/services/module_catalog.py
+"""
+Learning Module Catalog
+
+The catalog lives in app/data/learning_modules.json, grouped into packs
+(core Mobius modules, STEM modules). It is the single source of truth: the
+in-memory LearningStore loads it lazily on first access, and the same loader
+seeds Postgres (see seed_postgres and app/migrations/002_stem_modules.py).
+Set LEARNING_CATALOG_PATH to serve a different catalog file.
+
+A ModuleCatalog is one immutable, numbered version of that file. The store
+can rebuild a new version in the background and swap it in (see
+LearningStore.reload_catalog) while sessions keep scoring against the
+version they started on.
+
+Each module is compiled once at load time into an immutable lookup structure
+so the answer path never scans the question list:
+
+- question_index: question_id -> position
+- answer_key: correct option per position (bytes, one per question)
+- points / explanations: per-position tuples
+- total_points: maximum achievable score
+- content_hash: 63-bit hash of the question IDs, answer key and points, the
+  content that positional answers and scores depend on. Unlike the catalog
+  version number it is the same in every process.
+
+Compiled modules hold only immutable values and pickle by value, so a catalog
+compiled in a parent process can be shared with forked or spawned workers.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parents[1] / "data" / "learning_modules.json"
+
+
+@dataclass(frozen=True)
+class CompiledModule:
+    """Immutable, array-backed form of a module's questions"""
+    module_id: str
+    question_ids: Tuple[str, ...]
+    question_index: Mapping[str, int]
+    answer_key: bytes
+    points: Tuple[int, ...]
+    explanations: Tuple[str, ...]
+    total_points: int
+    content_hash: int
+
+    @property
+    def question_count(self) -> int:
+        return len(self.question_ids)
+
+    @classmethod
+    def from_parts(
+        cls,
+        module_id: str,
+        question_ids: Iterable[str],
+        answer_key: bytes,
+        points: Iterable[int],
+        explanations: Iterable[str]
+    ) -> "CompiledModule":
+        question_ids = tuple(question_ids)
+        points = tuple(points)
+        answer_key = bytes(answer_key)
+        return cls(
+            module_id=module_id,
+            question_ids=question_ids,
+            question_index=MappingProxyType({qid: i for i, qid in enumerate(question_ids)}),
+            answer_key=answer_key,
+            points=points,
+            explanations=tuple(explanations),
+            total_points=sum(points),
+            content_hash=content_hash(question_ids, answer_key, points),
+        )
+
+    def __reduce__(self):
+        # MappingProxyType does not pickle; rebuild the index on load
+        return (
+            CompiledModule.from_parts,
+            (self.module_id, self.question_ids, self.answer_key, self.points, self.explanations),
+        )
+
+
+def content_hash(question_ids: Sequence[str], answer_key: bytes, points: Sequence[int]) -> int:
+    """Stable hash of what a session's positional answers are scored against (fits a BIGINT)"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(json.dumps([list(question_ids), list(points)]).encode())
+    digest.update(answer_key)
+    return int.from_bytes(digest.digest(), "big") >> 1
+
+
+def compile_module(module: dict) -> CompiledModule:
+    """
+    Compile a module dict into its lookup form.
+
+    Raises:
+        ValueError: duplicate question IDs or an answer key outside the options
+    """
+    questions = module.get("questions", [])
+    question_ids = [q["id"] for q in questions]
+    if len(set(question_ids)) != len(question_ids):
+        raise ValueError(f"Module '{module['id']}' has duplicate question IDs")
+
+    for q in questions:
+        if not 0 <= q["correct_answer"] < len(q["options"]) or q["correct_answer"] > 255:
+            raise ValueError(
+                f"Module '{module['id']}' question '{q['id']}' has an invalid correct_answer"
+            )
+
+    return CompiledModule.from_parts(
+        module_id=module["id"],
+        question_ids=question_ids,
+        answer_key=bytes(q["correct_answer"] for q in questions),
+        points=[q["points"] for q in questions],
+        explanations=[q["explanation"] for q in questions],
+    )
+
+
+def compile_modules(modules: Dict[str, dict]) -> Mapping[str, CompiledModule]:
+    """Compile every module in a catalog into a read-only mapping"""
+    return MappingProxyType({mid: compile_module(m) for mid, m in modules.items()})
+
+
+# Catalog Loading
+# ===============
+
+def catalog_path() -> Path:
+    """Configured catalog file (LEARNING_CATALOG_PATH or the bundled catalog)"""
+    return Path(os.getenv("LEARNING_CATALOG_PATH") or DEFAULT_CATALOG_PATH)
+
+
+def read_catalog_file(path: Optional[Path] = None) -> Dict[str, List[dict]]:
+    """Read the catalog file, returning pack name -> list of module dicts"""
+    with open(path or catalog_path(), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["packs"]
+
+
+def load_modules(
+    path: Optional[Path] = None,
+    packs: Optional[Sequence[str]] = None
+) -> Dict[str, dict]:
+    """
+    Load modules from the catalog, keyed by module ID in catalog order.
+
+    Args:
+        path: Catalog file (defaults to catalog_path())
+        packs: Restrict to these packs (defaults to all)
+
+    Raises:
+        ValueError: a module ID appears more than once
+    """
+    modules: Dict[str, dict] = {}
+    for pack, pack_modules in read_catalog_file(path).items():
+        if packs is not None and pack not in packs:
+            continue
+        for module in pack_modules:
+            if module["id"] in modules:
+                raise ValueError(f"Duplicate module ID in catalog: '{module['id']}'")
+            modules[module["id"]] = module
+    return modules
+
+
+def catalog_mtime(path: Optional[Path] = None) -> Optional[float]:
+    """Modification time of the catalog file, None if it cannot be stat'd"""
+    try:
+        return os.stat(path or catalog_path()).st_mtime
+    except OSError:
+        return None
+
+
+class ModuleCatalog:
+    """
+    A loaded catalog version: module dicts plus their compiled lookup tables.
+
+    Instances are never mutated after construction; a content update builds a
+    new ModuleCatalog with the next version number.
+    """
+
+    def __init__(
+        self,
+        modules: Dict[str, dict],
+        version: int = 1,
+        source_mtime: Optional[float] = None
+    ):
+        self.modules = modules
+        self.compiled = compile_modules(modules)
+        self.version = version
+        self.source_mtime = source_mtime
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None, version: int = 1) -> "ModuleCatalog":
+        # Stat before reading so an edit landing mid-read is seen on the next poll
+        mtime = catalog_mtime(path)
+        return cls(load_modules(path), version=version, source_mtime=mtime)
+
+
+# Postgres Seeding
+# ================
+
+UPSERT_MODULE_SQL = """
+    INSERT INTO learning_modules
+        (id, title, description, difficulty, estimated_minutes, mic_reward,
+         topics, questions, "order")
+    VALUES
+        (%(id)s, %(title)s, %(description)s, %(difficulty)s, %(estimated_minutes)s,
+         %(mic_reward)s, %(topics)s, %(questions)s::json, %(order)s)
+    ON CONFLICT (id) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        difficulty = EXCLUDED.difficulty,
+        estimated_minutes = EXCLUDED.estimated_minutes,
+        mic_reward = EXCLUDED.mic_reward,
+        topics = EXCLUDED.topics,
+        questions = EXCLUDED.questions,
+        "order" = EXCLUDED."order"
+"""
+
+
+def module_rows(modules: Dict[str, dict]) -> Iterator[Dict[str, Any]]:
+    """Yield learning_modules row parameters for UPSERT_MODULE_SQL"""
+    for m in modules.values():
+        yield {
+            "id": m["id"],
+            "title": m["title"],
+            "description": m["description"],
+            "difficulty": m["difficulty"],
+            "estimated_minutes": m["estimated_minutes"],
+            "mic_reward": m["mic_reward"],
+            "topics": list(m.get("topics", [])),
+            "questions": json.dumps(m.get("questions", [])),
+            "order": m.get("order", 0),
+        }
+
+
+def seed_postgres(
+    conn,
+    path: Optional[Path] = None,
+    packs: Optional[Sequence[str]] = None
+) -> int:
+    """
+    Upsert catalog modules into learning_modules on a DB-API connection.
+
+    Returns the number of modules written. The caller owns the transaction.
+    """
+    rows = list(module_rows(load_modules(path, packs)))
+    with conn.cursor() as cur:
+        cur.executemany(UPSERT_MODULE_SQL, rows)
+    return len(rows)
@@ -0,0 +1,143 @@
+# app/services/module_search.py
+"""
+Module Search Index
+
+An in-process inverted index over each catalog version, built when the
+catalog is loaded or swapped in:
+
+- fields: title, topics, description and question text, each with a weight
+- postings: term -> ((doc, BM25 term-frequency weight), ...)
+- vocabulary: sorted terms, so the last query term matches by prefix
+  (type-ahead) via bisect
+
+Results are ranked with BM25 over the field-weighted term frequencies.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "what", "which",
+    "why", "with",
+})
+
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "topics": 2.0,
+    "description": 1.0,
+    "questions": 0.5,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_EXPANSIONS = 32
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, stopwords removed"""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _module_fields(m: dict) -> Dict[str, str]:
+    return {
+        "title": m.get("title", ""),
+        "topics": " ".join(m.get("topics", [])),
+        "description": m.get("description", ""),
+        "questions": " ".join(
+            " ".join([q.get("question", ""), *q.get("options", [])])
+            for q in m.get("questions", [])
+        ),
+    }
+
+
+def _rank_key(item: Tuple[int, float]) -> Tuple[float, int]:
+    """Best score first, catalog order among ties"""
+    return -item[1], item[0]
+
+
+class ModuleSearchIndex:
+    """BM25-ranked inverted index over one catalog version's active modules"""
+
+    def __init__(self, modules: Dict[str, dict], version: int = 1):
+        self.version = version
+        self.doc_ids: Tuple[str, ...] = tuple(
+            mid for mid, m in modules.items() if m.get("is_active", True)
+        )
+        postings: Dict[str, Dict[int, float]] = {}
+        lengths: List[float] = []
+
+        for doc, mid in enumerate(self.doc_ids):
+            length = 0.0
+            for field, text in _module_fields(modules[mid]).items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    tf = postings.setdefault(term, {})
+                    tf[doc] = tf.get(doc, 0.0) + weight
+                    length += weight
+            lengths.append(length)
+
+        # The BM25 term-frequency component depends only on the document,
+        # so postings store it precomputed and a query multiplies by idf
+        avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for length in lengths]
+        self.postings: Dict[str, Tuple[Tuple[int, float], ...]] = {
+            term: tuple((doc, tf * (BM25_K1 + 1) / (tf + norms[doc])) for doc, tf in docs.items())
+            for term, docs in postings.items()
+        }
+        self.vocabulary: List[str] = sorted(self.postings)
+        n = len(self.doc_ids)
+        self.idf: Dict[str, float] = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Vocabulary terms starting with prefix (bounded)"""
+        terms = []
+        i = bisect_left(self.vocabulary, prefix)
+        while i < len(self.vocabulary) and len(terms) < MAX_PREFIX_EXPANSIONS:
+            term = self.vocabulary[i]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+            i += 1
+        return terms
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Tuple[str, float]]:
+        """
+        Rank modules for a query, returning (module_id, score) best first.
+
+        Every term matches exactly except the last, which also matches as a
+        prefix so partially typed queries return results.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scores: Dict[int, float] = {}
+        for i, term in enumerate(terms):
+            matches = self._expand_prefix(term) if i == len(terms) - 1 else [term]
+            # A prefix that expands to several terms scores each doc once, by its best term
+            best: Dict[int, float] = {}
+            for match in matches:
+                idf = self.idf.get(match)
+                if idf is None:
+                    continue
+                for doc, weight in self.postings[match]:
+                    score = idf * weight
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+
+        if limit:
+            ranked = heapq.nsmallest(limit, scores.items(), key=_rank_key)
+        else:
+            ranked = sorted(scores.items(), key=_rank_key)
+        return [(self.doc_ids[doc], round(score, 4)) for doc, score in ranked]
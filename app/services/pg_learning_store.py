@@ -0,0 +1,249 @@
+# app/services/pg_learning_store.py
+"""
+Postgres Learning Store
+
+A SqlLearningStore (see sql_learning_store) on Postgres (DATABASE_URL),
+selected with LEARNING_STORE_BACKEND=postgres (see
+learning_store.create_learning_store).
+
+Connections come from a PgPool (psycopg2 ThreadedConnectionPool). Each
+connection PREPAREs the statements below the first time it is checked out,
+so the hot path sends only EXECUTE; write-behind batches go through
+execute_values. Tables are created with CREATE TABLE IF NOT EXISTS.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Sequence, Tuple
+
+from app.services.pg_pool import PgPool
+from app.services.sql_learning_store import (
+    DEFAULT_FLUSH_BATCH,
+    DEFAULT_FLUSH_SECONDS,
+    DEFAULT_USER_CACHE_SECONDS,
+    SESSION_COLUMNS,
+    SqlLearningStore,
+)
+
+DEFAULT_POOL_MAX = 10
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS learning_sessions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    catalog_version INTEGER NOT NULL,
+    content_hash BIGINT,
+    status TEXT NOT NULL,
+    started_at DOUBLE PRECISION NOT NULL,
+    completed_at DOUBLE PRECISION,
+    last_activity_at DOUBLE PRECISION NOT NULL,
+    answered_mask BIGINT NOT NULL DEFAULT 0,
+    correct_mask BIGINT NOT NULL DEFAULT 0,
+    current_score INTEGER NOT NULL DEFAULT 0,
+    selected BYTEA NOT NULL
+);
+ALTER TABLE learning_sessions ADD COLUMN IF NOT EXISTS content_hash BIGINT;
+CREATE UNIQUE INDEX IF NOT EXISTS learning_sessions_active_idx
+    ON learning_sessions (user_id, module_id) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS learning_sessions_user_idx ON learning_sessions (user_id);
+CREATE INDEX IF NOT EXISTS learning_sessions_idle_idx
+    ON learning_sessions (last_activity_at) WHERE status = 'active';
+
+CREATE TABLE IF NOT EXISTS learning_user_progress (
+    user_id TEXT PRIMARY KEY,
+    total_mic_earned INTEGER NOT NULL DEFAULT 0,
+    modules_completed INTEGER NOT NULL DEFAULT 0,
+    total_learning_minutes INTEGER NOT NULL DEFAULT 0,
+    experience_points INTEGER NOT NULL DEFAULT 0,
+    current_streak INTEGER NOT NULL DEFAULT 0,
+    longest_streak INTEGER NOT NULL DEFAULT 0,
+    level INTEGER NOT NULL DEFAULT 1,
+    last_activity TIMESTAMP,
+    integrity_score REAL NOT NULL DEFAULT 0.85,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS learning_completions (
+    id UUID PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    completed_at TIMESTAMP NOT NULL,
+    accuracy REAL NOT NULL,
+    mic_earned INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS learning_completions_user_idx
+    ON learning_completions (user_id, completed_at);
+
+CREATE TABLE IF NOT EXISTS learning_user_badges (
+    user_id TEXT NOT NULL,
+    badge_id TEXT NOT NULL,
+    earned_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_id, badge_id)
+);
+"""
+
+# name -> (parameter types, statement); PREPAREd once per pooled connection
+PREPARED_STATEMENTS: Dict[str, Tuple[str, str]] = {
+    "ls_create": (
+        "text, text, text, integer, bigint, double precision, bytea",
+        "INSERT INTO learning_sessions (id, user_id, module_id, catalog_version, content_hash, "
+        "status, started_at, last_activity_at, selected) "
+        "VALUES ($1, $2, $3, $4, $5, 'active', $6, $6, $7) "
+        "ON CONFLICT (user_id, module_id) WHERE status = 'active' DO NOTHING RETURNING id",
+    ),
+    "ls_get": (
+        "text",
+        f"SELECT {SESSION_COLUMNS} FROM learning_sessions WHERE id = $1",
+    ),
+    "ls_get_active": (
+        "text, text",
+        f"SELECT {SESSION_COLUMNS} FROM learning_sessions "
+        "WHERE user_id = $1 AND module_id = $2 AND status = 'active'",
+    ),
+    "ls_user_sessions": (
+        "text",
+        f"SELECT {SESSION_COLUMNS} FROM learning_sessions WHERE user_id = $1 ORDER BY started_at",
+    ),
+    # Applies only if the session is active and the question is unanswered
+    "ls_answer": (
+        "text, bigint, bigint, integer, integer, integer, double precision",
+        "UPDATE learning_sessions SET answered_mask = answered_mask | $2, "
+        "correct_mask = correct_mask | $3, current_score = current_score + $4, "
+        "selected = set_byte(selected, $5, $6), last_activity_at = $7 "
+        "WHERE id = $1 AND status = 'active' AND answered_mask & $2 = 0 "
+        "RETURNING answered_mask, current_score",
+    ),
+    "ls_lock": (
+        "text",
+        f"SELECT {SESSION_COLUMNS} FROM learning_sessions WHERE id = $1 FOR UPDATE",
+    ),
+    "ls_write_answers": (
+        "text, bigint, bigint, integer, bytea, double precision",
+        "UPDATE learning_sessions SET answered_mask = $2, correct_mask = $3, "
+        "current_score = $4, selected = $5, last_activity_at = $6 WHERE id = $1",
+    ),
+    "ls_complete": (
+        "text, double precision",
+        "UPDATE learning_sessions SET status = 'completed', completed_at = $2, "
+        f"last_activity_at = $2 WHERE id = $1 AND status = 'active' RETURNING {SESSION_COLUMNS}",
+    ),
+    "ls_abandon": (
+        "text",
+        "UPDATE learning_sessions SET status = 'abandoned' "
+        f"WHERE id = $1 AND status = 'active' RETURNING {SESSION_COLUMNS}",
+    ),
+    "ls_touch": (
+        "text[], double precision",
+        "UPDATE learning_sessions SET last_activity_at = $2 "
+        "WHERE id = ANY($1) AND status = 'active'",
+    ),
+    "ls_sweep": (
+        "double precision, text[]",
+        "UPDATE learning_sessions SET status = 'abandoned' "
+        "WHERE status = 'active' AND last_activity_at <= $1 AND NOT (id = ANY($2)) "
+        f"RETURNING {SESSION_COLUMNS}",
+    ),
+    "ls_metrics": (
+        "",
+        "SELECT count(*), count(DISTINCT user_id) FROM learning_sessions WHERE status = 'active'",
+    ),
+    "lp_progress": (
+        "text",
+        "SELECT total_mic_earned, modules_completed, total_learning_minutes, experience_points, "
+        "current_streak, longest_streak, level, last_activity, integrity_score "
+        "FROM learning_user_progress WHERE user_id = $1",
+    ),
+    "lp_completions": (
+        "text",
+        "SELECT id, module_id, completed_at, accuracy, mic_earned FROM learning_completions "
+        "WHERE user_id = $1 ORDER BY completed_at",
+    ),
+    "lp_badges": (
+        "text",
+        "SELECT badge_id FROM learning_user_badges WHERE user_id = $1 ORDER BY earned_at",
+    ),
+}
+
+BATCH_STATEMENTS: Dict[str, str] = {
+    "flush_progress": """
+    INSERT INTO learning_user_progress AS p
+        (user_id, total_mic_earned, modules_completed, total_learning_minutes,
+         experience_points, current_streak, longest_streak, level, last_activity,
+         integrity_score)
+    VALUES %s
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_mic_earned = p.total_mic_earned + EXCLUDED.total_mic_earned,
+        modules_completed = p.modules_completed + EXCLUDED.modules_completed,
+        total_learning_minutes = p.total_learning_minutes + EXCLUDED.total_learning_minutes,
+        experience_points = p.experience_points + EXCLUDED.experience_points,
+        current_streak = EXCLUDED.current_streak,
+        longest_streak = GREATEST(p.longest_streak, EXCLUDED.longest_streak),
+        level = GREATEST(p.level, EXCLUDED.level),
+        last_activity = GREATEST(p.last_activity, EXCLUDED.last_activity),
+        integrity_score = EXCLUDED.integrity_score,
+        updated_at = NOW()
+""",
+    "flush_completions": """
+    INSERT INTO learning_completions (id, user_id, module_id, completed_at, accuracy, mic_earned)
+    VALUES %s
+    ON CONFLICT (id) DO UPDATE SET mic_earned = EXCLUDED.mic_earned
+""",
+    "flush_badges": """
+    INSERT INTO learning_user_badges (user_id, badge_id, earned_at)
+    VALUES %s
+    ON CONFLICT (user_id, badge_id) DO NOTHING
+""",
+}
+
+
+class PostgresLearningStore(SqlLearningStore):
+    """SqlLearningStore on a pooled Postgres database"""
+
+    backend = "postgres"
+
+    def __init__(self, dsn: str, pool_max: int = DEFAULT_POOL_MAX, **kwargs):
+        self._pool = PgPool(dsn, pool_max, PREPARED_STATEMENTS)
+        super().__init__(**kwargs)
+        self.ensure_schema()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "PostgresLearningStore":
+        return cls(
+            dsn=os.environ["DATABASE_URL"].strip(),
+            pool_max=int(os.getenv("LEARNING_PG_POOL_MAX", DEFAULT_POOL_MAX)),
+            flush_seconds=float(os.getenv("LEARNING_PG_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS)),
+            flush_batch=int(os.getenv("LEARNING_PG_FLUSH_BATCH", DEFAULT_FLUSH_BATCH)),
+            user_cache_seconds=float(os.getenv("LEARNING_USER_CACHE_SECONDS", DEFAULT_USER_CACHE_SECONDS)),
+            **kwargs
+        )
+
+    @contextmanager
+    def _transaction(self, write: bool = True) -> Iterator["PgTransaction"]:
+        with self._pool.connection() as conn, conn.cursor() as cur:
+            yield PgTransaction(self._pool, cur)
+
+    def _encode_selected(self, selected: bytes) -> Any:
+        return self._pool.psycopg2.Binary(selected)
+
+    def ensure_schema(self) -> None:
+        self._pool.run(SCHEMA_SQL, prepare=False)
+
+    def close(self) -> None:
+        super().close()
+        self._pool.close()
+
+
+class PgTransaction:
+    """Named-statement execution on one pooled cursor"""
+
+    def __init__(self, pool: PgPool, cur: Any):
+        self._pool = pool
+        self._cur = cur
+
+    def execute(self, name: str, params: Tuple) -> list:
+        self._cur.execute(self._pool.execute_sql[name], params)
+        return self._cur.fetchall() if self._cur.description else []
+
+    def execute_batch(self, name: str, rows: Sequence[Tuple]) -> None:
+        self._pool.psycopg2.extras.execute_values(self._cur, BATCH_STATEMENTS[name], rows)
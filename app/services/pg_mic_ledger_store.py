@@ -0,0 +1,249 @@
+# app/services/pg_mic_ledger_store.py
+"""
+Postgres MIC Ledger Store
+
+The MICLedgerStore interface on the Prisma-managed tables (prisma/schema.prisma),
+so wallet endpoints agree across workers and instances. Selected with
+MIC_LEDGER_BACKEND=postgres (see mic_ledger_store.create_mic_ledger_store).
+
+- Appends are one statement: the user's "MICWallet" row is updated (balance,
+  ledgerEntries) and the "MICLedger" row inserted from it with
+  INSERT ... RETURNING. The wallet row lock orders concurrent appends for a
+  user, and a user without a wallet cannot be credited.
+- Balances and entry counts are read from the maintained wallet row; the
+  ledger stays the source of truth (backfill_wallet_balances re-derives them).
+- History reads are keyset queries on ("userId", "createdAt" DESC, id DESC).
+
+The API's reasons map onto the Prisma MICReason enum (LEARN and EARN are
+REWARD); the original reason and transaction_id ride in metadata.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.learning import MICLedgerEntry, MICReason
+from app.services.mic_ledger_store import MICLedgerStore, ledger_cursor, parse_ledger_cursor
+from app.services.pg_pool import PgPool
+
+DEFAULT_POOL_MAX = 10
+
+# API reason -> Prisma MICReason
+PRISMA_REASONS = {
+    MICReason.LEARN: "REWARD",
+    MICReason.EARN: "REWARD",
+    MICReason.BONUS: "BONUS",
+    MICReason.CORRECTION: "CORRECTION",
+}
+
+ENTRY_COLUMNS = (
+    'id, "userId", amount, reason::text, "integrityScore", gii, "moduleId", '
+    '"sessionId", metadata, "createdAt"'
+)
+
+# The API reason, preferring the one recorded in metadata over the Prisma enum
+API_REASON_SQL = "COALESCE(metadata->>'reason', CASE reason WHEN 'REWARD' THEN 'LEARN' ELSE reason::text END)"
+
+PREPARED_STATEMENTS: Dict[str, Tuple[str, str]] = {
+    "mic_append": (
+        'text, text, numeric, "MICReason", numeric, numeric, text, text, jsonb, timestamp',
+        'WITH wallet AS ('
+        '  UPDATE "MICWallet" SET balance = balance + $3, "ledgerEntries" = "ledgerEntries" + 1, '
+        '  "updatedAt" = $10 WHERE "userId" = $2 RETURNING address, balance'
+        ') '
+        'INSERT INTO "MICLedger" (id, "userId", "walletAddress", amount, reason, "integrityScore", '
+        'gii, "moduleId", "sessionId", metadata, "createdAt") '
+        'SELECT $1, $2, wallet.address, $3, $4, $5, $6, $7, $8, $9, $10 FROM wallet '
+        'RETURNING id',
+    ),
+    "mic_wallet": (
+        "text",
+        'SELECT balance, "ledgerEntries" FROM "MICWallet" WHERE "userId" = $1',
+    ),
+    "mic_latest": (
+        "text, integer",
+        f'SELECT {ENTRY_COLUMNS} FROM "MICLedger" WHERE "userId" = $1 '
+        'ORDER BY "createdAt" DESC, id DESC LIMIT $2',
+    ),
+    "mic_latest_offset": (
+        "text, integer, integer",
+        f'SELECT {ENTRY_COLUMNS} FROM "MICLedger" WHERE "userId" = $1 '
+        'ORDER BY "createdAt" DESC, id DESC LIMIT $2 OFFSET $3',
+    ),
+    "mic_before": (
+        "text, timestamp, text, integer",
+        f'SELECT {ENTRY_COLUMNS} FROM "MICLedger" WHERE "userId" = $1 '
+        'AND ("createdAt", id) < ($2, $3) ORDER BY "createdAt" DESC, id DESC LIMIT $4',
+    ),
+    "mic_by_reason": (
+        "text, text",
+        f'SELECT {ENTRY_COLUMNS} FROM "MICLedger" WHERE "userId" = $1 '
+        f'AND {API_REASON_SQL} = $2 ORDER BY "createdAt", id',
+    ),
+    "mic_breakdown": (
+        "text",
+        f'SELECT {API_REASON_SQL}, SUM(amount) FROM "MICLedger" WHERE "userId" = $1 GROUP BY 1',
+    ),
+}
+
+BACKFILL_BALANCES_SQL = """
+    UPDATE "MICWallet" w
+    SET balance = s.total, "ledgerEntries" = s.entries, "updatedAt" = NOW()
+    FROM (
+        SELECT "userId", COALESCE(SUM(amount), 0) AS total, COUNT(*) AS entries
+        FROM "MICLedger" GROUP BY "userId"
+    ) s
+    WHERE w."userId" = s."userId"
+      AND (w.balance <> s.total OR w."ledgerEntries" <> s.entries)
+"""
+
+
+def _entry_from_row(row: Tuple) -> MICLedgerEntry:
+    (entry_id, user_id, amount, prisma_reason, integrity_score, gii,
+     module_id, session_id, metadata, created_at) = row
+    metadata = dict(metadata or {})
+    reason = metadata.pop("reason", None) or ("LEARN" if prisma_reason == "REWARD" else prisma_reason)
+    transaction_id = metadata.pop("transaction_id", None)
+    return MICLedgerEntry(
+        id=entry_id,
+        user_id=user_id,
+        amount=round(float(amount), 2),
+        reason=MICReason(reason),
+        integrity_score=float(integrity_score),
+        gii=float(gii) if gii is not None else None,
+        module_id=module_id,
+        session_id=session_id,
+        transaction_id=transaction_id,
+        metadata=metadata,
+        created_at=created_at
+    )
+
+
+class PostgresMICLedgerStore(MICLedgerStore):
+    """MIC ledger on the Prisma MICLedger / MICWallet tables; see the module docstring"""
+
+    def __init__(self, dsn: str, pool_max: int = DEFAULT_POOL_MAX):
+        super().__init__()
+        self._pool = PgPool(dsn, pool_max, PREPARED_STATEMENTS)
+
+    @classmethod
+    def from_env(cls) -> "PostgresMICLedgerStore":
+        return cls(
+            dsn=os.environ["DATABASE_URL"].strip(),
+            pool_max=int(os.getenv("MIC_LEDGER_PG_POOL_MAX", DEFAULT_POOL_MAX)),
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def append_entry(
+        self,
+        user_id: str,
+        amount: float,
+        reason: MICReason,
+        integrity_score: float,
+        gii: Optional[float] = None,
+        module_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        transaction_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> MICLedgerEntry:
+        """
+        Append an entry and update the user's wallet balance in one statement.
+
+        Raises:
+            ValueError: the user has no MICWallet
+        """
+        created_at = datetime.utcnow()
+        entry_id = f"mic_ledger_{uuid.uuid4().hex[:12]}_{int(created_at.timestamp())}"
+        amount = round(amount, 2)
+        stored_metadata = {**(metadata or {}), "reason": reason.value}
+        if transaction_id:
+            stored_metadata["transaction_id"] = transaction_id
+
+        rows = self._pool.execute("mic_append", (
+            entry_id, user_id, Decimal(str(amount)), PRISMA_REASONS[reason],
+            Decimal(str(round(integrity_score, 4))),
+            Decimal(str(round(gii, 4))) if gii else None,
+            module_id, session_id, json.dumps(stored_metadata), created_at,
+        ))
+        if not rows:
+            raise ValueError(f"No MIC wallet for user {user_id}")
+
+        return MICLedgerEntry(
+            id=entry_id,
+            user_id=user_id,
+            amount=amount,
+            reason=reason,
+            integrity_score=round(integrity_score, 4),
+            gii=round(gii, 4) if gii else None,
+            module_id=module_id,
+            session_id=session_id,
+            transaction_id=transaction_id,
+            metadata=metadata or {},
+            created_at=created_at
+        )
+
+    def get_balance(self, user_id: str) -> float:
+        """Balance from the user's wallet row, maintained with every append"""
+        rows = self._pool.execute("mic_wallet", (user_id,))
+        return round(float(rows[0][0]), 2) if rows else 0.0
+
+    def get_recent_entries(self, user_id: str, limit: int = 10) -> List[MICLedgerEntry]:
+        return [_entry_from_row(row) for row in self._pool.execute("mic_latest", (user_id, limit))]
+
+    def get_ledger(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> tuple[int, List[MICLedgerEntry]]:
+        total = self.get_total_entries_count(user_id)
+        if not total or offset >= total:
+            return total, []
+        rows = self._pool.execute("mic_latest_offset", (user_id, limit, offset))
+        return total, [_entry_from_row(row) for row in rows]
+
+    def get_ledger_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MICLedgerEntry], Optional[str]]:
+        if cursor is None:
+            rows = self._pool.execute("mic_latest", (user_id, limit))
+        else:
+            created_at, entry_id = parse_ledger_cursor(cursor)
+            rows = self._pool.execute("mic_before", (user_id, created_at, entry_id, limit))
+        entries = [_entry_from_row(row) for row in rows]
+        next_cursor = ledger_cursor(entries[-1]) if len(entries) == limit else None
+        return entries, next_cursor
+
+    def get_last_entry(self, user_id: str) -> Optional[MICLedgerEntry]:
+        rows = self._pool.execute("mic_latest", (user_id, 1))
+        return _entry_from_row(rows[0]) if rows else None
+
+    def get_total_entries_count(self, user_id: str) -> int:
+        rows = self._pool.execute("mic_wallet", (user_id,))
+        return rows[0][1] if rows else 0
+
+    def get_entries_by_reason(self, user_id: str, reason: MICReason) -> List[MICLedgerEntry]:
+        rows = self._pool.execute("mic_by_reason", (user_id, reason.value))
+        return [_entry_from_row(row) for row in rows]
+
+    def get_balance_breakdown(self, user_id: str) -> Dict[str, float]:
+        breakdown = {
+            reason: round(float(total), 2)
+            for reason, total in self._pool.execute("mic_breakdown", (user_id,))
+        }
+        breakdown["total"] = round(sum(breakdown.values()), 2)
+        return breakdown
+
+    def backfill_wallet_balances(self) -> int:
+        """Re-derive every wallet's balance and entry count from the ledger"""
+        with self._pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(BACKFILL_BALANCES_SQL)
+            return cur.rowcount
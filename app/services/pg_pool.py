@@ -0,0 +1,103 @@
+# app/services/pg_pool.py
+"""
+Postgres Connection Pool
+
+Shared by the Postgres-backed stores (pg_learning_store, pg_mic_ledger_store):
+a psycopg2 ThreadedConnectionPool whose connections PREPARE the store's
+statements the first time they are checked out, so hot paths send only
+EXECUTE. psycopg2 is an optional dependency, imported only when a pool is
+created.
+
+The pool keeps max_connections connections open (minconn = maxconn):
+psycopg2 closes a returned connection once minconn are idle, which would
+otherwise reconnect and re-PREPARE on every checkout under load. Which
+connections are prepared is a WeakSet of the connection objects, so a
+closed connection drops out of it and a new one is always prepared.
+"""
+
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# name -> (parameter types, statement using $1..$n)
+PreparedStatements = Dict[str, Tuple[str, str]]
+
+
+def libpq_dsn(database_url: str) -> str:
+    """DATABASE_URL without Prisma-only query parameters libpq rejects (schema=)"""
+    parts = urlsplit(database_url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "schema"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def execute_sql(statements: PreparedStatements) -> Dict[str, str]:
+    """EXECUTE templates (psycopg2 %s placeholders) for prepared statements"""
+    return {
+        name: f"EXECUTE {name} ({', '.join(['%s'] * len(types.split(',')))})" if types else f"EXECUTE {name}"
+        for name, (types, _) in statements.items()
+    }
+
+
+class PgPool:
+    """Thread-safe pool of connections with statements prepared per connection"""
+
+    def __init__(
+        self,
+        dsn: str,
+        max_connections: int = 10,
+        statements: Optional[PreparedStatements] = None
+    ):
+        import psycopg2.extras  # noqa: PLC0415 — optional dep, only when a Postgres backend is used
+        import psycopg2.pool  # noqa: PLC0415
+
+        self.psycopg2 = psycopg2
+        self.statements = statements or {}
+        self.execute_sql = execute_sql(self.statements)
+        self._pool = psycopg2.pool.ThreadedConnectionPool(max_connections, max_connections, libpq_dsn(dsn))
+        self._prepared: "weakref.WeakSet[Any]" = weakref.WeakSet()  # connections with statements prepared
+
+    @contextmanager
+    def connection(self, prepare: bool = True) -> Iterator[Any]:
+        """
+        Pooled connection with statements prepared; commits on success.
+
+        prepare=False skips preparing, for DDL that creates the tables the
+        statements refer to.
+        """
+        conn = self._pool.getconn()
+        broken = False
+        try:
+            if prepare and conn not in self._prepared and self.statements:
+                with conn.cursor() as cur:
+                    for name, (types, sql) in self.statements.items():
+                        signature = f" ({types})" if types else ""
+                        cur.execute(f"PREPARE {name}{signature} AS {sql}")
+                conn.commit()
+                self._prepared.add(conn)
+            yield conn
+            conn.commit()
+        except Exception:
+            broken = bool(conn.closed)
+            if not broken:
+                conn.rollback()
+            raise
+        finally:
+            if broken:
+                self._prepared.discard(conn)
+            self._pool.putconn(conn, close=broken)
+
+    def execute(self, name: str, params: Tuple) -> List[Tuple]:
+        """Run one prepared statement in its own transaction"""
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute(self.execute_sql[name], params)
+            return cur.fetchall() if cur.description else []
+
+    def run(self, sql: str, params: Optional[Tuple] = None, prepare: bool = True) -> List[Tuple]:
+        """Run ad hoc SQL (schema, reports) in its own transaction"""
+        with self.connection(prepare) as conn, conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall() if cur.description else []
+
+    def close(self) -> None:
+        self._pool.closeall()
@@ -0,0 +1,240 @@
+# app/services/post_completion.py
+"""
+Post-completion Pipeline
+
+Work that follows a session completion but that the response does not need:
+crediting progress and the completion record, badge evaluation, the mint
+receipt hash and the audit log line. The completion endpoint mints, queues
+one task here and returns; clients fetch the outcome (badges, receipt hash)
+from /api/learning/session/{id}/rewards.
+
+- Tasks run on a fixed number of asyncio workers on the server loop. With
+  offload=True (a store whose calls block on I/O) each attempt runs in the
+  threadpool instead, so a step's database round trip never stalls the loop.
+- A task is a list of named steps. A step that raises is retried with
+  exponential backoff, up to MAX_ATTEMPTS, from the step that failed; steps
+  that succeeded are not run again. Steps must therefore tolerate being run
+  more than once (the credit step credits a session at most once).
+- Without running workers (no server loop, e.g. scripts) or with the queue
+  full, a task's first attempt runs inline instead, so nothing is ever
+  dropped. Its retries still back off: on a running event loop they are
+  timers (handed to the workers if there are any), so a failing task never
+  stalls the request that submitted it; only without a loop do they sleep.
+- The queue is in memory: tasks still queued when the process dies are lost.
+  The mint itself is already in the MIC ledger by the time a task is queued.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.models.learning import PostCompletionStatus
+
+logger = logging.getLogger(__name__)
+
+Step = Tuple[str, Callable[[Dict[str, Any]], Any]]
+
+
+class PostCompletionQueue:
+    """Bounded worker pool for post-completion tasks; see the module docstring"""
+
+    MAX_ATTEMPTS = 5
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_pending: int = 10_000,
+        retry_base_seconds: float = 0.1,
+        max_results: int = 10_000,
+        offload: bool = False
+    ):
+        self.workers = max(1, workers)
+        self.offload = offload
+        self.max_pending = max_pending
+        self.retry_base_seconds = retry_base_seconds
+        self.max_results = max_results
+
+        self._tasks: "OrderedDict[str, dict]" = OrderedDict()  # key -> task, oldest first
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._retries: Dict[str, Tuple[asyncio.TimerHandle, dict]] = {}  # task id -> (timer, task)
+        self._stats = {"processed": 0, "retried": 0, "failed": 0, "inline": 0}
+        self._stats_lock = threading.Lock()  # offloaded attempts count from worker threads
+
+    # Submitting
+    # ==========
+
+    def submit(self, key: str, user_id: str, steps: List[Step]) -> dict:
+        """
+        Queue steps to run after the response; key (the session ID) names
+        the task for get_task. Returns the task.
+        """
+        task = {
+            "id": f"post_{uuid.uuid4().hex[:12]}",
+            "key": key,
+            "user_id": user_id,
+            "status": PostCompletionStatus.PENDING.value,
+            "attempts": 0,
+            "results": {},
+            "error": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "_steps": steps,
+            "_queued_at": time.monotonic(),
+        }
+        self._tasks[key] = task
+        self._tasks.move_to_end(key)
+        self._trim()
+
+        if self._queue is None or self._queue.qsize() >= self.max_pending:
+            self._count("inline")
+            self._run_inline(task)
+        else:
+            self._queue.put_nowait(task)
+        return task
+
+    def get_task(self, key: str) -> Optional[dict]:
+        return self._tasks.get(key)
+
+    def _trim(self) -> None:
+        """Forget the oldest finished tasks beyond max_results"""
+        excess = len(self._tasks) - self.max_results
+        if excess <= 0:
+            return
+        for key in [k for k, t in self._tasks.items() if t["status"] != PostCompletionStatus.PENDING.value][:excess]:
+            del self._tasks[key]
+
+    # Running
+    # =======
+
+    def _run_steps(self, task: dict) -> None:
+        """Run the task's remaining steps; raises on the first failure"""
+        task["attempts"] += 1
+        for name, step in task["_steps"]:
+            if name in task["results"]:
+                continue
+            task["results"][name] = step(task["results"])
+        task["status"] = PostCompletionStatus.DONE.value
+        task["error"] = None
+        self._count("processed")
+
+    def _attempt(self, task: dict) -> Optional[float]:
+        """Run the task once; the backoff before retrying it, or None once it is done or has failed for good"""
+        try:
+            self._run_steps(task)
+        except Exception as e:
+            if self._record_failure(task, e):
+                return self.retry_base_seconds * 2 ** (task["attempts"] - 1)
+        return None
+
+    def _run_inline(self, task: dict) -> None:
+        delay = self._attempt(task)
+        if delay is None:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # no loop to hand the retries to (scripts), so nothing else is blocked
+            while delay is not None:
+                time.sleep(delay)
+                delay = self._attempt(task)
+            return
+        self._schedule_retry(task, delay)
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def _record_failure(self, task: dict, error: Exception) -> bool:
+        """Note a failed attempt; True if the task should be retried"""
+        task["error"] = str(error)
+        if task["attempts"] >= self.MAX_ATTEMPTS:
+            task["status"] = PostCompletionStatus.FAILED.value
+            self._count("failed")
+            logger.exception(f"Post-completion task {task['id']} for {task['key']} failed", exc_info=error)
+            return False
+        self._count("retried")
+        logger.warning(f"Post-completion task {task['id']} attempt {task['attempts']} failed: {error}")
+        return True
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            task = await queue.get()
+            try:
+                if self.offload:
+                    delay = await run_in_threadpool(self._attempt, task)
+                else:
+                    delay = self._attempt(task)
+                if delay is not None:
+                    self._schedule_retry(task, delay)
+            finally:
+                queue.task_done()
+
+    def _schedule_retry(self, task: dict, delay: float) -> None:
+        timer = asyncio.get_running_loop().call_later(delay, self._retry, task)
+        self._retries[task["id"]] = (timer, task)
+
+    def _retry(self, task: dict) -> None:
+        del self._retries[task["id"]]
+        if self._queue is not None:
+            self._queue.put_nowait(task)
+        else:
+            self._run_inline(task)
+
+    def start(self) -> None:
+        """Start the workers on the running event loop"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    async def join(self) -> None:
+        """Wait until every queued task has run (retries scheduled later excepted)"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued tasks (up to timeout), then stop the workers"""
+        leftover = []
+        if self._workers:
+            try:
+                await asyncio.wait_for(self.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Stopping with {self._queue.qsize()} post-completion tasks unrun")
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            queue, self._queue = self._queue, None
+            leftover = [queue.get_nowait() for _ in range(queue.qsize())]
+        for timer, task in self._retries.values():
+            timer.cancel()
+            leftover.append(task)
+        self._retries.clear()
+        # anything still queued or waiting on a retry runs now rather than being lost
+        for task in leftover:
+            self._count("inline")
+            delay = self._attempt(task)
+            while delay is not None:
+                await asyncio.sleep(delay)
+                delay = self._attempt(task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, worker count and task outcome totals"""
+        pending = [t for t in self._tasks.values() if t["status"] == PostCompletionStatus.PENDING.value]
+        oldest = min((t["_queued_at"] for t in pending), default=None)
+        return {
+            "depth": len(pending),
+            "workers": len(self._workers),
+            "running": bool(self._workers),
+            "oldest_pending_seconds": round(time.monotonic() - oldest, 3) if oldest is not None else None,
+            **self._stats,
+        }
@@ -0,0 +1,110 @@
+# app/services/prerequisites.py
+"""
+Module Prerequisite Graph
+
+The catalog's `prerequisites` lists are compiled once per catalog version
+into a DAG over the store's completion bits (LearningStore.module_bit):
+
+- order: modules in topological order (ties broken by the module's "order")
+- ancestors: module -> bitset of every transitive prerequisite
+- descendants: module -> modules that transitively depend on it
+
+A module is unlocked once every ancestor is completed, so completing a
+module can only unlock its descendants, and per-user unlocked sets can be
+kept up to date incrementally.
+"""
+
+import heapq
+from typing import Callable, Dict, List, Tuple
+
+
+class PrerequisiteGraph:
+    """Compiled prerequisite DAG for one catalog version"""
+
+    def __init__(
+        self,
+        version: int,
+        order: Tuple[str, ...],
+        ancestors: Dict[str, int],
+        descendants: Dict[str, Tuple[str, ...]],
+        bits: Dict[str, int]
+    ):
+        self.version = version
+        self.order = order
+        self.position = {mid: i for i, mid in enumerate(order)}
+        self.ancestors = ancestors
+        self.descendants = descendants
+        self.bits = bits
+        self.roots_mask = 0
+        for mid, mask in ancestors.items():
+            if not mask:
+                self.roots_mask |= bits[mid]
+
+    @classmethod
+    def compile(
+        cls,
+        modules: Dict[str, dict],
+        module_bit: Callable[[str], int],
+        version: int = 1
+    ) -> "PrerequisiteGraph":
+        """
+        Build the DAG from catalog module dicts.
+
+        Raises:
+            ValueError: unknown prerequisite or a prerequisite cycle
+        """
+        bits = {mid: module_bit(mid) for mid in modules}
+        dependents: Dict[str, List[str]] = {mid: [] for mid in modules}
+        indegree = {mid: 0 for mid in modules}
+        for mid, m in modules.items():
+            for pre in m.get("prerequisites", []):
+                if pre not in modules:
+                    raise ValueError(f"Module '{mid}' requires unknown module '{pre}'")
+                dependents[pre].append(mid)
+                indegree[mid] += 1
+
+        # Kahn's algorithm, lowest "order" first among ready modules
+        rank = {mid: (m.get("order", 0), i) for i, (mid, m) in enumerate(modules.items())}
+        ready = [(rank[mid], mid) for mid, d in indegree.items() if d == 0]
+        heapq.heapify(ready)
+        order: List[str] = []
+        while ready:
+            _, mid = heapq.heappop(ready)
+            order.append(mid)
+            for dep in dependents[mid]:
+                indegree[dep] -= 1
+                if indegree[dep] == 0:
+                    heapq.heappush(ready, (rank[dep], dep))
+        if len(order) != len(modules):
+            cyclic = sorted(mid for mid, d in indegree.items() if d)
+            raise ValueError(f"Prerequisite cycle among modules: {', '.join(cyclic)}")
+
+        ancestors: Dict[str, int] = {}
+        for mid in order:
+            mask = 0
+            for pre in modules[mid].get("prerequisites", []):
+                mask |= bits[pre] | ancestors[pre]
+            ancestors[mid] = mask
+
+        descendants: Dict[str, Tuple[str, ...]] = {
+            mid: tuple(d for d in order if ancestors[d] & bits[mid]) for mid in order
+        }
+        return cls(version, tuple(order), ancestors, descendants, bits)
+
+    def unlocked_mask(self, completed: int) -> int:
+        """Every module whose ancestors are all in the completed bitset"""
+        mask = 0
+        for mid in self.order:
+            required = self.ancestors[mid]
+            if completed & required == required:
+                mask |= self.bits[mid]
+        return mask
+
+    def newly_unlocked(self, module_id: str, completed: int) -> int:
+        """Bits unlocked by completing module_id (completed includes it)"""
+        mask = 0
+        for dep in self.descendants.get(module_id, ()):
+            required = self.ancestors[dep]
+            if completed & required == required:
+                mask |= self.bits[dep]
+        return mask
@@ -0,0 +1,313 @@
+# app/services/progress_tiers.py
+"""
+Tiered User Progress
+
+Per-user progress counters live in two tiers so that memory stays bounded
+however many user IDs the API is asked about:
+
+- Hot: an LRU of UserProgress records (__slots__, not dicts), at most
+  hot_capacity of them. Writes always go to a hot record.
+- Cold: users pushed out of the hot tier are spilled, one row each, to a
+  SQLite file (spill_path; "" is a private temporary file SQLite deletes on
+  close). It is scratch space for this process, cleared when opened, since
+  the rest of the in-memory store does not survive a restart either. Every
+  worker process shares the configured path, so each spills to its own
+  file, "<spill_path>.<host>.<pid>", removed on close. The file is held
+  under an exclusive SQLite lock; if another process already holds it, the
+  spill falls back to a private temporary file rather than share it.
+
+A hot record also carries the user's cached unlocked-modules bitset
+(UserProgress.unlocked), so that cache is bounded with the hot tier and
+dropped when the user is spilled.
+
+Reads never create anything and never move users between tiers: a hot user
+is returned as its live record, a cold one as a read-only snapshot of its
+row, and an unknown one as the shared read-only DEFAULT_PROGRESS. A GET for
+an arbitrary user ID therefore costs no memory and cannot evict anyone. A
+write (get_or_create) promotes a cold user back to the hot tier, or creates
+the user there.
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PROGRESS_FIELDS = (
+    "user_id",
+    "total_mic_earned",
+    "modules_completed",
+    "current_streak",
+    "longest_streak",
+    "total_learning_minutes",
+    "level",
+    "experience_points",
+    "last_activity",
+    "integrity_score",
+)
+DEFAULT_INTEGRITY_SCORE = 0.85
+
+logger = logging.getLogger(__name__)
+
+
+class UserProgress(Mapping):
+    """
+    One user's progress counters.
+
+    Reads and writes like the progress dict it replaces (progress["level"],
+    progress.get(...), dict(progress)) but keeps its fields in slots.
+    unlocked is a cache beside the fields, (graph version, bitset), and is
+    never spilled.
+    """
+
+    __slots__ = PROGRESS_FIELDS + ("unlocked",)
+
+    def __init__(
+        self,
+        user_id: Optional[str],
+        total_mic_earned: int = 0,
+        modules_completed: int = 0,
+        current_streak: int = 0,
+        longest_streak: int = 0,
+        total_learning_minutes: int = 0,
+        level: int = 1,
+        experience_points: int = 0,
+        last_activity: Optional[str] = None,
+        integrity_score: float = DEFAULT_INTEGRITY_SCORE
+    ):
+        self.user_id = user_id
+        self.total_mic_earned = total_mic_earned
+        self.modules_completed = modules_completed
+        self.current_streak = current_streak
+        self.longest_streak = longest_streak
+        self.total_learning_minutes = total_learning_minutes
+        self.level = level
+        self.experience_points = experience_points
+        self.last_activity = last_activity
+        self.integrity_score = integrity_score
+        self.unlocked: Optional[Tuple[int, int]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in PROGRESS_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in PROGRESS_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PROGRESS_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PROGRESS_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in PROGRESS_FIELDS}
+
+    def to_row(self) -> Tuple:
+        return tuple(getattr(self, name) for name in PROGRESS_FIELDS)
+
+
+class ReadOnlyProgress(UserProgress):
+    """Progress that must not be written: the shared default and cold-tier snapshots"""
+
+    __slots__ = ()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise TypeError("Read-only progress; write through the store")
+
+
+# Returned for every user with no progress yet; shared, so never written
+DEFAULT_PROGRESS = ReadOnlyProgress(None)
+
+
+class ProgressSpill:
+    """SQLite cold tier: one row per spilled user, opened on first use"""
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.file_path: Optional[str] = None  # this process's file, once opened ("" when private)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # resolved at first use, so a worker forked after construction gets its own file
+            file_path = f"{self.path}.{socket.gethostname()}.{os.getpid()}" if self.path else ""
+            try:
+                self._conn = self._open(file_path)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Progress spill file {file_path} is in use ({e}); spilling to a private file")
+                file_path = ""
+                self._conn = self._open(file_path)
+            self.file_path = file_path
+        return self._conn
+
+    @staticmethod
+    def _open(file_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(file_path, isolation_level=None, check_same_thread=False, timeout=0)
+        try:
+            # held by this connection until it closes, so no other process can write the file
+            conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+            # scratch data: nothing here needs to survive a crash
+            conn.execute("PRAGMA journal_mode=MEMORY")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("DROP TABLE IF EXISTS progress")
+            conn.execute(f"CREATE TABLE progress ({', '.join(PROGRESS_FIELDS)}, PRIMARY KEY (user_id))")
+        except sqlite3.OperationalError:
+            conn.close()
+            raise
+        return conn
+
+    def put(self, row: Tuple) -> None:
+        placeholders = ", ".join("?" * len(PROGRESS_FIELDS))
+        self._connect().execute(f"INSERT OR REPLACE INTO progress VALUES ({placeholders})", row)
+
+    def get(self, user_id: str) -> Optional[Tuple]:
+        if self._conn is None:
+            return None
+        return self._conn.execute("SELECT * FROM progress WHERE user_id = ?", (user_id,)).fetchone()
+
+    def delete(self, user_id: str) -> None:
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM progress WHERE user_id = ?", (user_id,))
+
+    def __len__(self) -> int:
+        if self._conn is None:
+            return 0
+        return self._conn.execute("SELECT COUNT(*) FROM progress").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        if self._conn is None:
+            return 0
+        pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        return pages * self._conn.execute("PRAGMA page_size").fetchone()[0]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            if self.file_path:
+                try:
+                    os.remove(self.file_path)
+                except OSError:
+                    pass
+
+
+class ProgressTiers:
+    """
+    Hot LRU plus optional cold spill; see the module docstring.
+
+    hot_capacity=None keeps every user hot (no spill), for stores that bound
+    their users some other way. Without a spill, bounded tiers spill to a
+    private temporary file.
+    """
+
+    def __init__(self, hot_capacity: Optional[int] = None, spill: Optional[ProgressSpill] = None):
+        self.hot_capacity = hot_capacity
+        if hot_capacity is not None and spill is None:
+            spill = ProgressSpill()
+        self._spill = spill if hot_capacity is not None else None
+        self._hot: "OrderedDict[str, UserProgress]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hot_hits": 0,
+            "cold_hits": 0,
+            "default_reads": 0,
+            "created": 0,
+            "promoted": 0,
+            "spilled": 0,
+        }
+
+    def get(self, user_id: str) -> UserProgress:
+        """Progress for reading: live hot record, cold snapshot or DEFAULT_PROGRESS"""
+        with self._lock:
+            progress = self._hot.get(user_id)
+            if progress is not None:
+                self._hot.move_to_end(user_id)
+                self._stats["hot_hits"] += 1
+                return progress
+            row = self._spill.get(user_id) if self._spill is not None else None
+            if row is not None:
+                self._stats["cold_hits"] += 1
+                return ReadOnlyProgress(*row)
+            self._stats["default_reads"] += 1
+            return DEFAULT_PROGRESS
+
+    def peek(self, user_id: str) -> Optional[UserProgress]:
+        """The user's hot record, if any, without counting a read or refreshing its recency"""
+        with self._lock:
+            return self._hot.get(user_id)
+
+    def get_or_create(self, user_id: str) -> UserProgress:
+        """Hot record for writing, promoted from the cold tier or created"""
+        with self._lock:
+            progress = self._hot.get(user_id)
+            if progress is not None:
+                self._hot.move_to_end(user_id)
+                return progress
+            row = self._spill.get(user_id) if self._spill is not None else None
+            if row is not None:
+                self._spill.delete(user_id)
+                progress = UserProgress(*row)
+                self._stats["promoted"] += 1
+            else:
+                progress = UserProgress(user_id)
+                self._stats["created"] += 1
+            self._hot[user_id] = progress
+            self._evict()
+            return progress
+
+    def _evict(self) -> None:
+        """Spill least recently used records beyond hot_capacity (lock held)"""
+        if self.hot_capacity is None:
+            return
+        while len(self._hot) > self.hot_capacity:
+            _, progress = self._hot.popitem(last=False)
+            self._spill.put(progress.to_row())
+            self._stats["spilled"] += 1
+
+    def pop(self, user_id: str, default: Any = None) -> Any:
+        """Forget a user in both tiers"""
+        with self._lock:
+            progress = self._hot.pop(user_id, default)
+            if self._spill is not None:
+                self._spill.delete(user_id)
+            return progress
+
+    def __contains__(self, user_id: object) -> bool:
+        with self._lock:
+            return user_id in self._hot or (self._spill is not None and self._spill.get(user_id) is not None)
+
+    def hot_sample(self, limit: int) -> List[UserProgress]:
+        with self._lock:
+            return [progress for progress, _ in zip(self._hot.values(), range(limit))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tier sizes, read hit rates by tier and promotion/spill totals"""
+        with self._lock:
+            reads = self._stats["hot_hits"] + self._stats["cold_hits"] + self._stats["default_reads"]
+            return {
+                "hot_users": len(self._hot),
+                "hot_capacity": self.hot_capacity,
+                "cold_users": len(self._spill) if self._spill is not None else 0,
+                "cold_bytes": self._spill.size_bytes() if self._spill is not None else 0,
+                "spill_enabled": self._spill is not None,
+                "reads": reads,
+                "hot_hit_rate": round(self._stats["hot_hits"] / reads, 4) if reads else None,
+                "cold_hit_rate": round(self._stats["cold_hits"] / reads, 4) if reads else None,
+                "default_read_rate": round(self._stats["default_reads"] / reads, 4) if reads else None,
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
@@ -0,0 +1,120 @@
+# app/services/quiz_protocol.py
+"""
+WebSocket Quiz Protocol
+
+Compact frames for taking a quiz over one socket (/ws/learning/quiz) instead
+of one HTTP request per answer. Frames are JSON arrays whose first element is
+an opcode.
+
+Client -> server:
+    ["a", question_id, selected]            submit one answer
+    ["b", [[question_id, selected], ...]]   submit several, atomically
+    ["s"]                                   current session state
+    ["p"]                                   ping
+
+Server -> client:
+    ["ready", session_id, catalog_version, [question_id, ...], resumed]
+    ["r", question_id, correct, points, cumulative_score, remaining]
+    ["rb", [[question_id, correct, points], ...], cumulative_score, remaining]
+    ["st", answered, correct_answers, cumulative_score, remaining]
+    ["p"]
+    ["e", code, message]
+
+correct and resumed are 0/1. Answers follow LearningStore.submit_answer
+rules against the catalog version the session is pinned to; completion (and
+minting) stays on the authenticated REST endpoint.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+from app.services.learning_session import LearningSession
+from app.services.learning_store import LearningStore
+
+MAX_FRAME_CHARS = 16_384
+MAX_BATCH_ANSWERS = 100
+
+
+def encode(frame: List[Any]) -> str:
+    return json.dumps(frame, separators=(",", ":"))
+
+
+def error(code: str, message: str) -> str:
+    return encode(["e", code, message])
+
+
+def open_session(
+    store: LearningStore,
+    user_id: str,
+    module_id: str
+) -> Tuple[Optional[LearningSession], bool]:
+    """Resume the user's active session for the module or start one"""
+    session = store.get_active_session(user_id, module_id)
+    if session:
+        return session, True
+    return store.create_session(user_id, module_id), False
+
+
+def ready_frame(store: LearningStore, session: LearningSession, resumed: bool) -> str:
+    compiled = store.get_session_compiled(session)
+    return encode([
+        "ready", session.id, session.catalog_version, list(compiled.question_ids), int(resumed)
+    ])
+
+
+def _answer_pair(item: Any) -> Optional[Tuple[str, int]]:
+    if (isinstance(item, list) and len(item) == 2 and isinstance(item[0], str)
+            and isinstance(item[1], int) and not isinstance(item[1], bool) and item[1] >= 0):
+        return item[0], item[1]
+    return None
+
+
+def handle_frame(store: LearningStore, session: LearningSession, text: str) -> str:
+    """Apply one client frame to the session and return the reply frame"""
+    if len(text) > MAX_FRAME_CHARS:
+        return error("bad_frame", "Frame too large")
+    try:
+        frame = json.loads(text)
+    except ValueError:
+        return error("bad_frame", "Frames are JSON arrays")
+    if not isinstance(frame, list) or not frame:
+        return error("bad_frame", "Frames are JSON arrays")
+
+    op = frame[0]
+    if op == "p":
+        return encode(["p"])
+
+    if op == "s":
+        compiled = store.get_session_compiled(session)
+        return encode([
+            "st", session.questions_answered, session.correct_answers,
+            session.current_score, compiled.question_count - session.questions_answered,
+        ])
+
+    if op == "a":
+        pair = _answer_pair(frame[1:])
+        if pair is None:
+            return error("bad_frame", "Expected [\"a\", question_id, selected]")
+        result = store.submit_answer(session.id, pair[0], pair[1])
+        if not result:
+            return error("rejected", "Invalid session, question, or answer already submitted")
+        return encode([
+            "r", result["question_id"], int(result["correct"]), result["points_earned"],
+            result["cumulative_score"], result["questions_remaining"],
+        ])
+
+    if op == "b":
+        items = frame[1] if len(frame) == 2 and isinstance(frame[1], list) else None
+        pairs = [_answer_pair(item) for item in items] if items else None
+        if not pairs or len(pairs) > MAX_BATCH_ANSWERS or None in pairs:
+            return error("bad_frame", "Expected [\"b\", [[question_id, selected], ...]]")
+        result = store.submit_answers(session.id, pairs)
+        if not result:
+            return error("rejected", "Invalid session, question, or answer already submitted")
+        return encode([
+            "rb",
+            [[r["question_id"], int(r["correct"]), r["points_earned"]] for r in result["results"]],
+            result["cumulative_score"], result["questions_remaining"],
+        ])
+
+    return error("bad_frame", f"Unknown opcode {op!r}")
@@ -0,0 +1,405 @@
+# app/services/session_completion.py
+"""
+Session Completion
+
+The unit of work behind POST /api/learning/session/{id}/complete. A
+completion reads the session, the module's catalog entry, the user's
+completion state and progress once each, decides the reward, and mints it
+(or parks it in the mint queue). The minted balance comes back from the mint
+itself rather than a second ledger read.
+
+Scoring is the server's own: accuracy, points and answer counts come from the
+session's answered bitmask checked against the compiled answer key of the
+catalog version it started on, and time spent from the session's start time
+on the store's clock. The module's reward and difficulty come from that same
+catalog version, so a hot reload never reprices a session already under way.
+The request carries nothing but the session ID.
+
+Before anything is minted the session is completed in the store
+(complete_session, a conditional update in the SQL backends), and only the
+request whose call completed it goes on to mint. Two workers sharing a
+Postgres or SQLite store therefore cannot both mint one session. Once
+claimed a session is never minted inline again: if the mint fails it is
+parked in the mint queue, which checks the ledger before minting.
+
+Everything the response does not need runs afterwards in the post-completion
+pipeline (see post_completion): the credit_session_completion call that
+credits progress and awards badges, the receipt hash, and the audit line.
+Until that task has credited the session its module counts as completed for
+the user's next reward.
+
+Completions for one user run one at a time under that user's asyncio lock,
+so a user's concurrent completions queue rather than race to the store;
+completions for different users never wait on each other. With a store whose
+calls block on I/O (store.blocking_io: SQL backends, shard RPC) those calls
+run in the threadpool, so a database round trip never stalls the event loop.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.models.learning import (
+    CircuitBreakerStatus,
+    MintJobStatus,
+    SessionCompleteResponse,
+    SessionStatus,
+)
+from app.receipts import create_mint_receipt
+from app.services.learning_session import SessionScore
+from app.services.learning_store import LearningStore, level_for_xp
+from app.services.mic_ledger_store import MICLedgerStore
+from app.services.mic_minting import MICMintingService
+from app.services.mint_queue import MintQueue
+from app.services.post_completion import PostCompletionQueue
+
+logger = logging.getLogger(__name__)
+
+
+class CompletionError(Exception):
+    """A completion the caller must be told about, with its HTTP status"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class UserLocks:
+    """One asyncio.Lock per user, dropped once nobody holds or waits on it"""
+
+    def __init__(self):
+        self._locks: Dict[str, List] = {}  # user_id -> [lock, holders and waiters]
+
+    @asynccontextmanager
+    async def hold(self, user_id: str) -> AsyncIterator[None]:
+        entry = self._locks.get(user_id)
+        if entry is None:
+            entry = self._locks[user_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[user_id]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class SessionCompleter:
+    """Completes learning sessions; see the module docstring"""
+
+    def __init__(
+        self,
+        store: LearningStore,
+        minting: MICMintingService,
+        ledger: MICLedgerStore,
+        mint_queue: MintQueue,
+        pipeline: PostCompletionQueue
+    ):
+        self._store = store
+        self._minting = minting
+        self._ledger = ledger
+        self._mint_queue = mint_queue
+        self.pipeline = pipeline
+        self.locks = UserLocks()
+        self._claims: Dict[str, Tuple[str, str]] = {}  # session_id -> (user_id, module_id) awaiting credit
+        self._claimed_modules: Counter = Counter()  # (user_id, module_id) -> claims awaiting credit
+        self._claims_lock = threading.Lock()  # credit steps may release claims from worker threads
+
+    async def complete(
+        self,
+        session_id: str,
+        subject_id: str
+    ) -> SessionCompleteResponse:
+        """
+        Complete a session for subject_id, scored server-side, and mint its reward.
+
+        Raises:
+            CompletionError: unknown session or module, or a session that
+                is not subject_id's (404), session not
+                active or without answers (400), or reward refused (402)
+        """
+        async with self.locks.hold(subject_id):
+            return await self._complete(session_id, subject_id)
+
+    async def _io(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Call into the store, in the threadpool when its calls block on I/O"""
+        if self._store.blocking_io:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    def _read(self, session_id: str, subject_id: str) -> Tuple[Any, ...]:
+        """Every store read a completion needs, as one call (one threadpool hop)"""
+        store = self._store
+        session = store.get_session(session_id)
+        if not session or session.user_id != subject_id:
+            # someone else's session is reported as missing, so IDs are not confirmed to probes
+            raise CompletionError(404, "Session not found")
+        if session.status != "active":
+            raise CompletionError(400, "Session already completed")
+
+        # reward and difficulty as of the catalog version the session was played (and is scored) on
+        module = store.get_session_module(session)
+        if not module:
+            raise CompletionError(404, "Module not found")
+        score = store.score_session(session)
+        if score is None:
+            raise CompletionError(404, "Module not found")
+        if not score.questions_answered:
+            raise CompletionError(400, "Session has no answers")
+        return (
+            session, module, score, store.session_minutes(session), store.get_user_progress(subject_id),
+            store.has_completed_module(subject_id, session.module_id),
+        )
+
+    async def _complete(
+        self,
+        session_id: str,
+        subject_id: str
+    ) -> SessionCompleteResponse:
+        store = self._store
+        session, module, score, minutes_spent, progress, completed_before = await self._io(
+            self._read, session_id, subject_id
+        )
+        module_id = session.module_id
+        integrity_score = progress.get("integrity_score", 0.85)
+        experience_points = progress.get("experience_points", 0)
+        with self._claims_lock:
+            is_first_completion = not completed_before and not self._claimed_modules[(subject_id, module_id)]
+        reward_inputs = {
+            "base_reward": module["mic_reward"],
+            "accuracy": score.accuracy,
+            "integrity_score": integrity_score,
+            "difficulty": module["difficulty"],
+            "streak_days": progress.get("current_streak", 0),
+            "is_perfect_score": score.accuracy >= 1.0,
+            "is_first_completion": is_first_completion,
+        }
+        reward_result = self._minting.calculate_reward(**reward_inputs)
+        xp_earned = store.calculate_xp(
+            accuracy=score.accuracy,
+            difficulty=module["difficulty"],
+            time_minutes=minutes_spent
+        )
+
+        if not reward_result["can_mint"]:
+            if not reward_result.get("deferrable"):
+                raise CompletionError(402, f"Cannot mint reward: {reward_result.get('reason', 'Unknown')}")
+            # Circuit breaker holding: record the completion now, mint later
+            await self._claim(session_id, subject_id, module_id)
+            return self._complete_deferred(
+                session_id, subject_id, module_id, score, minutes_spent, xp_earned, experience_points,
+                reward_result, reward_inputs
+            )
+
+        mic_earned = reward_result["mic_earned"]
+        gii = reward_result.get("gii", 0.92)
+        # 🧾 The receipt is hashed after the response, over the inputs and time fixed here
+        minted_at = datetime.utcnow()
+
+        await self._claim(session_id, subject_id, module_id)
+        try:
+            mint_result = await self._minting.mint_reward(
+                user_id=subject_id,  # Canonical subject_id
+                module_id=module_id,
+                session_id=session_id,
+                mic_amount=mic_earned,
+                accuracy=score.accuracy,
+                integrity_score=integrity_score
+            )
+        except BaseException as e:
+            # Claimed, so never minted inline again: e.g. the GII fell since
+            # the reward was priced, or the ledger write failed after its append
+            logger.warning(f"Mint for session {session_id} failed after claiming it; deferring: {e!r}")
+            _, system_status = self._minting.calculate_gii_multiplier(self._minting.get_global_integrity_index())
+            response = self._complete_deferred(
+                session_id, subject_id, module_id, score, minutes_spent, xp_earned, experience_points,
+                {**reward_result, "system_status": system_status}, reward_inputs
+            )
+            if not isinstance(e, Exception):
+                raise  # cancelled: the deferred mint and credit still stand
+            return response
+
+        def receipt(_: Dict[str, Any]) -> str:
+            return create_mint_receipt(
+                subject_id=subject_id,
+                session_id=session_id,
+                module_id=module_id,
+                minted_mic=mic_earned,
+                accuracy=score.accuracy,
+                integrity_score=integrity_score,
+                gii=gii,
+                timestamp=minted_at
+            ).receipt_hash
+
+        task = self.pipeline.submit(session_id, subject_id, [
+            ("credit", self._credit_step(session_id, subject_id, module_id, score, minutes_spent,
+                                         mic_earned, xp_earned)),
+            ("receipt", receipt),
+            ("audit", self._audit_step(session_id, subject_id, module_id, mic_earned, xp_earned,
+                                       mint_result["transaction_id"])),
+        ])
+
+        return SessionCompleteResponse(
+            session_id=session_id,
+            module_id=module_id,
+            accuracy=score.accuracy,
+            questions_answered=score.questions_answered,
+            correct_answers=score.correct_answers,
+            earned_points=score.earned_points,
+            total_points=score.total_points,
+            time_spent_minutes=minutes_spent,
+            mic_earned=mic_earned,
+            xp_earned=xp_earned,
+            new_level=self._new_level(task, experience_points + xp_earned),
+            integrity_score=integrity_score,
+            transaction_id=mint_result["transaction_id"],
+            ledger_id=mint_result.get("ledger_id"),  # Proof of earning
+            new_wallet_balance=mint_result["new_balance"],  # Derived from ledger by the mint
+            status=SessionStatus.COMPLETED,
+            rewards=self._rewards(task, mic_earned, xp_earned),
+            bonuses=reward_result["breakdown"],
+            circuit_breaker_status=CircuitBreakerStatus(reward_result["system_status"])
+        )
+
+    def _complete_deferred(
+        self,
+        session_id: str,
+        subject_id: str,
+        module_id: str,
+        score: SessionScore,
+        minutes_spent: int,
+        xp_earned: int,
+        experience_points: int,
+        reward_result: dict,
+        reward_inputs: dict
+    ) -> SessionCompleteResponse:
+        """
+        Record a completion whose mint is blocked by system health.
+
+        The session is already claimed. Progress, completion and badges are
+        credited with 0 MIC by the pipeline; the mint is parked in the mint
+        queue and credited when it drains.
+        """
+        task = self.pipeline.submit(session_id, subject_id, [
+            ("credit", self._credit_step(session_id, subject_id, module_id, score, minutes_spent, 0, xp_earned)),
+            ("audit", self._audit_step(session_id, subject_id, module_id, 0, xp_earned, None)),
+        ])
+        job = self._mint_queue.enqueue(
+            user_id=subject_id,
+            session_id=session_id,
+            module_id=module_id,
+            reward_inputs=reward_inputs,
+        )
+
+        return SessionCompleteResponse(
+            session_id=session_id,
+            module_id=module_id,
+            accuracy=score.accuracy,
+            questions_answered=score.questions_answered,
+            correct_answers=score.correct_answers,
+            earned_points=score.earned_points,
+            total_points=score.total_points,
+            time_spent_minutes=minutes_spent,
+            mic_earned=0,
+            xp_earned=xp_earned,
+            new_level=self._new_level(task, experience_points + xp_earned),
+            integrity_score=reward_inputs["integrity_score"],
+            new_wallet_balance=self._ledger.get_balance(subject_id),
+            mint_status=MintJobStatus.PENDING,
+            mint_id=job["mint_id"],
+            status=SessionStatus.COMPLETED,
+            rewards=self._rewards(task, 0, xp_earned),
+            bonuses={},
+            circuit_breaker_status=CircuitBreakerStatus(reward_result["system_status"])
+        )
+
+    # Post-completion Steps
+    # =====================
+
+    async def _claim(self, session_id: str, user_id: str, module_id: str) -> None:
+        """Complete the session in the store; only the caller that completed it may mint"""
+        if await self._io(self._store.complete_session, session_id) is None:
+            raise CompletionError(400, "Session already completed")
+        with self._claims_lock:
+            self._claims[session_id] = (user_id, module_id)
+            self._claimed_modules[(user_id, module_id)] += 1
+
+    def _release(self, session_id: str) -> bool:
+        """Drop a claim once its credit starts; False if it was already released"""
+        with self._claims_lock:
+            claim = self._claims.pop(session_id, None)
+            if claim is None:
+                return False
+            self._claimed_modules[claim] -= 1
+            if not self._claimed_modules[claim]:
+                del self._claimed_modules[claim]
+            return True
+
+    def _credit_step(
+        self,
+        session_id: str,
+        user_id: str,
+        module_id: str,
+        score: SessionScore,
+        minutes_spent: int,
+        mic_earned: int,
+        xp_earned: int
+    ):
+        def credit(_: Dict[str, Any]) -> Dict[str, Any]:
+            # at most once: a retry after a failure part-way through credits nothing
+            if not self._release(session_id):
+                return {"new_level": self._store.get_user_progress(user_id)["level"], "badges": []}
+            progress, badges = self._store.credit_session_completion(
+                user_id=user_id,
+                module_id=module_id,
+                accuracy=score.accuracy,
+                mic_earned=mic_earned,
+                xp_earned=xp_earned,
+                minutes_spent=minutes_spent
+            )
+            return {"new_level": progress["level"], "badges": badges}
+        return credit
+
+    def _audit_step(
+        self,
+        session_id: str,
+        user_id: str,
+        module_id: str,
+        mic_earned: int,
+        xp_earned: int,
+        transaction_id: Any
+    ):
+        def audit(results: Dict[str, Any]) -> bool:
+            logger.info(
+                "Learning completion: user=%s, session=%s, module=%s, mic=%s, xp=%s, tx=%s, badges=%d, receipt=%s",
+                user_id, session_id, module_id, mic_earned, xp_earned, transaction_id,
+                len(results["credit"]["badges"]), results.get("receipt")
+            )
+            return True
+        return audit
+
+    @staticmethod
+    def _new_level(task: dict, experience_points: int) -> int:
+        """Level after this completion: credited if the task already ran, else projected"""
+        credit = task["results"].get("credit")
+        return credit["new_level"] if credit else level_for_xp(experience_points)
+
+    @staticmethod
+    def _rewards(task: dict, mic_earned: int, xp_earned: int) -> Dict[str, Any]:
+        rewards: Dict[str, Any] = {"mic": mic_earned, "xp": xp_earned, "rewards_status": task["status"]}
+        if "credit" in task["results"]:
+            rewards["badges"] = len(task["results"]["credit"]["badges"])
+        if "receipt" in task["results"]:
+            rewards["receipt_hash"] = task["results"]["receipt"]  # 🧾 Hash receipt for verification
+        return rewards
@@ -0,0 +1,239 @@
+# app/services/sharded_learning_store.py
+"""
+Sharded Learning Store
+
+The LearningStore interface for STORE_BACKEND=sharded (see sharding and
+learning_store.create_learning_store): user progress, completions, badges
+and sessions live on the shard process that owns the user, and this store
+forwards each call there. Catalog reads never leave the worker.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.learning import BadgeInfo, CompletedModuleInfo, LearningModuleResponse
+from app.services.learning_session import LearningSession, SessionScore
+from app.services.learning_store import LearningStore
+from app.services.module_catalog import CompiledModule
+from app.services.progress_tiers import UserProgress
+from app.services.sharding import ShardRouter
+
+# Per-shard session metrics that add up across shards
+SUMMED_METRICS = (
+    "resident_sessions",
+    "active_sessions",
+    "users_with_sessions",
+    "expiry_heap_size",
+    "pinned_sessions",
+    "estimated_session_bytes",
+    "process_rss_bytes",
+    "abandoned_total",
+    "evicted_total",
+    "cold_storage_writes",
+    "last_sweep_evicted",
+)
+SUMMED_PROGRESS_METRICS = (
+    "hot_users",
+    "cold_users",
+    "cold_bytes",
+    "reads",
+    "hot_hits",
+    "cold_hits",
+    "default_reads",
+    "created",
+    "promoted",
+    "spilled",
+    "estimated_hot_bytes",
+    "process_rss_bytes",
+)
+
+
+class ShardedLearningStore(LearningStore):
+    """
+    LearningStore whose user and session state lives on the shards
+
+    The catalog, search and XP helpers run on the local (stateless)
+    LearningStore; every user- or session-keyed call goes to its shard.
+    Returned sessions are copies: mutate them through store methods.
+    """
+
+    backend = "sharded"
+    blocking_io = True
+
+    def __init__(self, router: ShardRouter, **kwargs):
+        super().__init__(**kwargs)
+        self._router = router
+
+    def _user_call(self, user_id: str, method: str, *args) -> Any:
+        return self._router.call(self._router.for_user(user_id), "learning", method, user_id, *args)
+
+    def _session_call(self, session_id: str, method: str, *args) -> Any:
+        index = self._router.for_session(session_id)
+        if index is None:
+            return None  # not a sharded session ID, so no such session
+        return self._router.call(index, "learning", method, session_id, *args)
+
+    # Session Operations
+    # ==================
+
+    def create_session(self, user_id: str, module_id: str) -> Optional[LearningSession]:
+        return self._user_call(user_id, "create_session", module_id)
+
+    def get_session(self, session_id: str) -> Optional[LearningSession]:
+        return self._session_call(session_id, "get_session")
+
+    def get_active_session(self, user_id: str, module_id: str) -> Optional[LearningSession]:
+        return self._user_call(user_id, "get_active_session", module_id)
+
+    def get_user_sessions(self, user_id: str, status: Optional[str] = None) -> List[LearningSession]:
+        return self._user_call(user_id, "get_user_sessions", status)
+
+    def get_session_compiled(self, session: LearningSession) -> Optional[CompiledModule]:
+        # the shard's catalog version numbering is its own
+        index = self._router.for_session(session.id)
+        if index is None:
+            return None
+        return self._router.call(index, "learning", "get_session_compiled", session)
+
+    def get_session_module(self, session: LearningSession) -> Optional[dict]:
+        index = self._router.for_session(session.id)
+        if index is None:
+            return None
+        return self._router.call(index, "learning", "get_session_module", session)
+
+    def score_session(self, session: LearningSession) -> Optional[SessionScore]:
+        # scored on the shard, against the answer key it compiled
+        index = self._router.for_session(session.id)
+        if index is None:
+            return None
+        return self._router.call(index, "learning", "score_session", session)
+
+    def submit_answer(self, session_id: str, question_id: str, selected_answer: int) -> Optional[dict]:
+        return self._session_call(session_id, "submit_answer", question_id, selected_answer)
+
+    def submit_answers(self, session_id: str, answers: List[Tuple[str, int]]) -> Optional[dict]:
+        return self._session_call(session_id, "submit_answers", answers)
+
+    def complete_session(self, session_id: str) -> Optional[LearningSession]:
+        return self._session_call(session_id, "complete_session")
+
+    def abandon_session(self, session_id: str) -> Optional[LearningSession]:
+        return self._session_call(session_id, "abandon_session")
+
+    # Session Expiry
+    # ==============
+
+    def pin_session(self, session_id: str) -> bool:
+        return bool(self._session_call(session_id, "pin_session"))
+
+    def unpin_session(self, session_id: str) -> None:
+        self._session_call(session_id, "unpin_session")
+
+    def sweep_expired_sessions(self, now: Optional[float] = None) -> int:
+        return sum(self._router.broadcast("learning", "sweep_expired_sessions", now))
+
+    def get_session_metrics(self) -> Dict[str, Any]:
+        """Per-shard session metrics and their totals"""
+        shards = self._router.broadcast("learning", "get_session_metrics")
+        return {
+            "backend": self.backend,
+            "shard_count": self._router.shard_count,
+            **{key: sum(m.get(key) or 0 for m in shards) for key in SUMMED_METRICS},
+            "session_ttl_seconds": shards[0]["session_ttl_seconds"],
+            "shards": shards,
+        }
+
+    # User Progress Operations
+    # ========================
+
+    def get_user_progress(self, user_id: str) -> UserProgress:
+        return self._user_call(user_id, "get_user_progress")
+
+    def get_progress_metrics(self) -> Dict[str, Any]:
+        """Per-shard progress tier metrics and their totals"""
+        shards = self._router.broadcast("learning", "get_progress_metrics")
+        totals = {key: sum(m.get(key) or 0 for m in shards) for key in SUMMED_PROGRESS_METRICS}
+        reads = totals["reads"]
+        for tier in ("hot_hit", "cold_hit", "default_read"):
+            totals[f"{tier}_rate"] = round(totals[f"{tier}s"] / reads, 4) if reads else None
+        return {
+            "backend": self.backend,
+            "shard_count": self._router.shard_count,
+            **totals,
+            "shards": shards,
+        }
+
+    def update_user_progress(self, user_id: str, mic_earned: int, xp_earned: int, minutes_spent: int) -> dict:
+        return self._user_call(user_id, "update_user_progress", mic_earned, xp_earned, minutes_spent)
+
+    def get_user_activity(self, user_id: str, days: int = 365) -> dict:
+        return self._user_call(user_id, "get_user_activity", days)
+
+    def record_completion(self, user_id: str, module_id: str, accuracy: float, mic_earned: int) -> None:
+        self._user_call(user_id, "record_completion", module_id, accuracy, mic_earned)
+
+    def record_deferred_mint(self, user_id: str, module_id: str, mic_earned: int) -> List[BadgeInfo]:
+        return self._user_call(user_id, "record_deferred_mint", module_id, mic_earned)
+
+    def record_session_completion(
+        self,
+        session_id: str,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        mic_earned: int,
+        xp_earned: int,
+        minutes_spent: int
+    ) -> Tuple[dict, List[BadgeInfo]]:
+        # sessions live on their user's shard, so this is one round trip
+        return self._user_call(
+            user_id, "record_session_completion",
+            session_id, module_id, accuracy, mic_earned, xp_earned, minutes_spent
+        )
+
+    def credit_session_completion(
+        self,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        mic_earned: int,
+        xp_earned: int,
+        minutes_spent: int
+    ) -> Tuple[dict, List[BadgeInfo]]:
+        return self._user_call(
+            user_id, "credit_session_completion",
+            module_id, accuracy, mic_earned, xp_earned, minutes_spent
+        )
+
+    def has_completed_module(self, user_id: str, module_id: str) -> bool:
+        return self._user_call(user_id, "has_completed_module", module_id)
+
+    def get_completed_module_ids(self, user_id: str) -> Set[str]:
+        return self._user_call(user_id, "get_completed_module_ids")
+
+    def get_completion_mask(self, user_id: str) -> int:
+        # module bits are assigned per process, so rebuild the mask with this one's
+        return self.module_mask(self.get_completed_module_ids(user_id))
+
+    def get_unlocked_mask(self, user_id: str) -> int:
+        return self._user_call(user_id, "get_unlocked_mask")
+
+    def get_next_modules(self, user_id: str, limit: Optional[int] = None) -> List[LearningModuleResponse]:
+        return self._user_call(user_id, "get_next_modules", limit)
+
+    def get_completed_modules(self, user_id: str) -> List[CompletedModuleInfo]:
+        return self._user_call(user_id, "get_completed_modules")
+
+    # Badge Operations
+    # ================
+
+    def check_and_award_badges(
+        self,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        is_first_module: bool
+    ) -> List[BadgeInfo]:
+        return self._user_call(user_id, "check_and_award_badges", module_id, accuracy, is_first_module)
+
+    def get_user_badges(self, user_id: str) -> List[BadgeInfo]:
+        return self._user_call(user_id, "get_user_badges")
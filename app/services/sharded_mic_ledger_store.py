@@ -0,0 +1,71 @@
+# app/services/sharded_mic_ledger_store.py
+"""
+Sharded MIC Ledger Store
+
+The MICLedgerStore interface for MIC_LEDGER_BACKEND=sharded (see sharding):
+each user's entries live on the shard process that owns the user, next to
+their learning progress, and this store forwards each call there.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.learning import MICLedgerEntry, MICReason
+from app.services.mic_ledger_store import MICLedgerStore
+from app.services.sharding import ShardRouter
+
+
+class ShardedMICLedgerStore(MICLedgerStore):
+    """MICLedgerStore whose entries live on the owning user's shard"""
+
+    def __init__(self, router: ShardRouter):
+        super().__init__()
+        self._router = router
+
+    def _user_call(self, user_id: str, method: str, *args, **kwargs) -> Any:
+        return self._router.call(self._router.for_user(user_id), "ledger", method, user_id, *args, **kwargs)
+
+    def append_entry(
+        self,
+        user_id: str,
+        amount: float,
+        reason: MICReason,
+        integrity_score: float,
+        gii: Optional[float] = None,
+        module_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        transaction_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> MICLedgerEntry:
+        return self._user_call(
+            user_id, "append_entry", amount, reason, integrity_score, gii=gii, module_id=module_id,
+            session_id=session_id, transaction_id=transaction_id, metadata=metadata,
+        )
+
+    def get_balance(self, user_id: str) -> float:
+        return self._user_call(user_id, "get_balance")
+
+    def get_recent_entries(self, user_id: str, limit: int = 10) -> List[MICLedgerEntry]:
+        return self._user_call(user_id, "get_recent_entries", limit)
+
+    def get_ledger(self, user_id: str, limit: int = 50, offset: int = 0) -> tuple[int, List[MICLedgerEntry]]:
+        return self._user_call(user_id, "get_ledger", limit, offset)
+
+    def get_ledger_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MICLedgerEntry], Optional[str]]:
+        return self._user_call(user_id, "get_ledger_page", limit, cursor)
+
+    def get_last_entry(self, user_id: str) -> Optional[MICLedgerEntry]:
+        return self._user_call(user_id, "get_last_entry")
+
+    def get_total_entries_count(self, user_id: str) -> int:
+        return self._user_call(user_id, "get_total_entries_count")
+
+    def get_entries_by_reason(self, user_id: str, reason: MICReason) -> List[MICLedgerEntry]:
+        return self._user_call(user_id, "get_entries_by_reason", reason)
+
+    def get_balance_breakdown(self, user_id: str) -> Dict[str, float]:
+        return self._user_call(user_id, "get_balance_breakdown")
@@ -0,0 +1,330 @@
+# app/services/sharding.py
+"""
+User-sharded Stores
+
+Keeps LearningStore and MICLedgerStore state in memory while using every
+core: N shard processes each own the users whose ID hashes to them (jump
+consistent hash), and each uvicorn worker forwards calls to the owning shard
+over a local Unix socket.
+
+    python -m app.services.sharding --shards 4
+    STORE_BACKEND=sharded STORE_SHARDS=4 uvicorn app.main:app --workers 8
+
+- A shard runs one call at a time, so a user's reads and writes are
+  serialized in one process, exactly as with the in-memory backend.
+- Session IDs carry their shard (session_s<k>_...), so session calls are
+  routed without a lookup.
+- Catalog reads (modules, search, XP tables) are answered locally by each
+  worker; every shard loads the same catalog file.
+- The routing stores are ShardedLearningStore (sharded_learning_store) and
+  ShardedMICLedgerStore (sharded_mic_ledger_store).
+- Growing from N to N+1 shards moves about 1/(N+1) of users. Their
+  in-memory state does not move with them, so resize only with a
+  persistent backend underneath or at a clean start.
+
+Shard RPC pickles calls and results, so whoever can connect can run code in
+a shard (and a fake shard can in a worker). Both ends therefore require a
+shared secret in STORE_SHARD_AUTHKEY, and the socket directory must be owned
+by the current user with mode 0700; it defaults to a per-user directory
+($XDG_RUNTIME_DIR, else the temp directory suffixed with the uid).
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import signal
+import stat
+import tempfile
+import threading
+from functools import lru_cache
+from multiprocessing import Process
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_SHARD_RE = re.compile(r"^session_s(\d+)_")
+MIN_AUTHKEY_BYTES = 16
+
+
+def shard_for(key: str, shard_count: int) -> int:
+    """Jump consistent hash (Lamping & Veach) of a key onto range(shard_count)"""
+    h = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+    bucket, jump = -1, 0
+    while jump < shard_count:
+        bucket = jump
+        h = (h * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * ((1 << 31) / ((h >> 33) + 1)))
+    return bucket
+
+
+def default_socket_dir() -> str:
+    """Per-user socket directory: $XDG_RUNTIME_DIR/mobius-shards, else <tmp>/mobius-shards-<uid>"""
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "mobius-shards")
+    return os.path.join(tempfile.gettempdir(), f"mobius-shards-{os.getuid()}")
+
+
+def shard_socket_dir() -> str:
+    return os.getenv("STORE_SHARD_SOCKET_DIR") or default_socket_dir()
+
+
+def shard_authkey() -> bytes:
+    """
+    The shared secret from STORE_SHARD_AUTHKEY.
+
+    Raises:
+        RuntimeError: unset or shorter than MIN_AUTHKEY_BYTES
+    """
+    authkey = os.getenv("STORE_SHARD_AUTHKEY", "").encode()
+    if len(authkey) < MIN_AUTHKEY_BYTES:
+        raise RuntimeError(
+            f"STORE_SHARD_AUTHKEY must be set to a secret of at least {MIN_AUTHKEY_BYTES} bytes "
+            "(e.g. python -c 'import secrets; print(secrets.token_urlsafe(32))')"
+        )
+    return authkey
+
+
+def check_socket_dir(socket_dir: str, create: bool = False) -> None:
+    """
+    Make sure nobody else can plant or reach sockets in socket_dir.
+
+    Raises:
+        PermissionError: not a real directory owned by this user with mode 0700
+    """
+    if create:
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    st = os.lstat(socket_dir)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(
+            f"Shard socket directory {socket_dir} must be a directory owned by uid {os.getuid()} "
+            f"with mode 0700 (found uid {st.st_uid}, mode {stat.S_IMODE(st.st_mode):o})"
+        )
+
+
+def shard_socket(socket_dir: str, index: int) -> str:
+    return os.path.join(socket_dir, f"shard-{index}.sock")
+
+
+def session_id_prefix(index: int) -> str:
+    """Session ID prefix for sessions created on a shard"""
+    return f"session_s{index}_"
+
+
+def session_shard(session_id: str) -> Optional[int]:
+    """Shard that owns a session, or None for IDs no shard created"""
+    match = SESSION_SHARD_RE.match(session_id)
+    return int(match.group(1)) if match else None
+
+
+class ShardError(RuntimeError):
+    """A shard process could not be reached"""
+
+
+# Shard Process
+# =============
+
+class ShardServer:
+    """One shard: the learning store and MIC ledger for its users, served over a Unix socket"""
+
+    def __init__(self, address: str, authkey: bytes, learning: Any, ledger: Any):
+        self.address = address
+        self.authkey = authkey
+        self.targets = {"learning": learning, "ledger": ledger}
+        self._lock = threading.Lock()
+        self._listener: Optional[Listener] = None
+
+    def dispatch(self, target: str, method: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        if method.startswith("_"):
+            raise AttributeError(f"'{method}' is not a store method")
+        fn = getattr(self.targets[target], method)
+        with self._lock:
+            return fn(*args, **kwargs)
+
+    def serve_forever(self) -> None:
+        """Accept router connections until close(); one thread per connection"""
+        check_socket_dir(os.path.dirname(self.address))
+        if os.path.exists(self.address):
+            os.unlink(self.address)  # stale socket from a previous run
+        self._listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._listener is None:
+                    return  # closed
+                logger.exception("Shard connection rejected")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    target, method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = ("ok", self.dispatch(target, method, args, kwargs))
+                except Exception as e:
+                    reply = ("error", e)
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+                except Exception as e:  # unpicklable result or exception
+                    conn.send(("error", ShardError(f"{target}.{method}: {e!r}")))
+
+    def close(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+
+
+def serve_shard(index: int, shard_count: int, socket_dir: str, authkey: bytes) -> None:
+    """Run shard `index` of `shard_count` until terminated (process entry point)"""
+    # the store modules build their own singletons on import; only shard processes need them
+    from app.services.learning_store import (  # noqa: PLC0415
+        DEFAULT_PROGRESS_HOT_USERS,
+        DEFAULT_SESSION_TTL_SECONDS,
+        LearningStore,
+    )
+    from app.services.mic_ledger_store import MICLedgerStore  # noqa: PLC0415
+
+    cold_storage_path = os.getenv("LEARNING_SESSION_COLD_STORAGE_PATH")
+    spill_path = os.getenv("LEARNING_PROGRESS_SPILL_PATH")
+    learning = LearningStore(
+        session_ttl_seconds=int(os.getenv("LEARNING_SESSION_TTL_SECONDS", DEFAULT_SESSION_TTL_SECONDS)),
+        cold_storage_path=f"{cold_storage_path}.shard{index}" if cold_storage_path else None,
+        session_id_prefix=session_id_prefix(index),
+        progress_hot_users=int(os.getenv("LEARNING_PROGRESS_HOT_USERS", DEFAULT_PROGRESS_HOT_USERS)),
+        progress_spill_path=f"{spill_path}.shard{index}" if spill_path else "",
+    )
+    watch_seconds = float(os.getenv("LEARNING_CATALOG_WATCH_SECONDS", "0"))
+    if watch_seconds > 0:
+        learning.start_catalog_watcher(watch_seconds)
+    server = ShardServer(shard_socket(socket_dir, index), authkey, learning, MICLedgerStore())
+    logger.info(f"Shard {index}/{shard_count} listening on {server.address}")
+    server.serve_forever()
+
+
+# Routing
+# =======
+
+class ShardRouter:
+    """Connections from one worker to every shard, one per thread and shard"""
+
+    def __init__(self, socket_dir: str, shard_count: int, authkey: bytes):
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self.socket_dir = socket_dir
+        self.shard_count = shard_count
+        self.authkey = authkey
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._socket_dir_checked = False
+
+    @classmethod
+    def from_env(cls) -> "ShardRouter":
+        return cls(
+            socket_dir=shard_socket_dir(),
+            shard_count=int(os.getenv("STORE_SHARDS", os.cpu_count() or 1)),
+            authkey=shard_authkey(),
+        )
+
+    def _connections(self) -> Dict[int, Connection]:
+        if os.getpid() != self._pid:
+            # forked: the parent's sockets must not be shared
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        return conns
+
+    def for_user(self, user_id: str) -> int:
+        return shard_for(user_id, self.shard_count)
+
+    def for_session(self, session_id: str) -> Optional[int]:
+        index = session_shard(session_id)
+        return index if index is not None and index < self.shard_count else None
+
+    def call(self, index: int, target: str, method: str, *args, **kwargs) -> Any:
+        """
+        Run a store method on a shard and return its result.
+
+        Raises:
+            ShardError: the shard is down; the call may or may not have run
+            Exception: whatever the store method raised
+        """
+        conns = self._connections()
+        try:
+            conn = conns.get(index)
+            if conn is None:
+                if not self._socket_dir_checked:
+                    check_socket_dir(self.socket_dir)  # never talk to sockets someone else planted
+                    self._socket_dir_checked = True
+                conn = conns[index] = Client(
+                    shard_socket(self.socket_dir, index), family="AF_UNIX", authkey=self.authkey
+                )
+            conn.send((target, method, args, kwargs))
+            status, result = conn.recv()
+        except (EOFError, OSError) as e:
+            stale = conns.pop(index, None)
+            if stale is not None:
+                stale.close()
+            raise ShardError(f"Shard {index} unavailable: {e}") from e
+        if status == "error":
+            raise result
+        return result
+
+    def broadcast(self, target: str, method: str, *args, **kwargs) -> List[Any]:
+        return [self.call(index, target, method, *args, **kwargs) for index in range(self.shard_count)]
+
+    def close(self) -> None:
+        """Close this thread's connections"""
+        for conn in self._connections().values():
+            conn.close()
+        self._local.conns = {}
+
+
+@lru_cache(maxsize=1)
+def shard_router() -> ShardRouter:
+    """The process-wide router, configured from STORE_SHARDS / STORE_SHARD_*"""
+    return ShardRouter.from_env()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the learning store shards for STORE_BACKEND=sharded")
+    parser.add_argument("--shards", type=int, default=int(os.getenv("STORE_SHARDS", os.cpu_count() or 1)))
+    parser.add_argument("--socket-dir", default=shard_socket_dir())
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+
+    try:
+        authkey = shard_authkey()
+        check_socket_dir(args.socket_dir, create=True)
+    except (RuntimeError, OSError) as e:
+        parser.exit(2, f"Refusing to start shards: {e}\n")
+    shards = [
+        Process(target=serve_shard, args=(index, args.shards, args.socket_dir, authkey), name=f"shard-{index}")
+        for index in range(args.shards)
+    ]
+    for shard in shards:
+        shard.start()
+
+    def stop(signum, frame):
+        for shard in shards:
+            shard.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for shard in shards:
+        shard.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,708 @@
+# app/services/sql_learning_store.py
+"""
+SQL-backed Learning Store
+
+Shared logic of the database LearningStores (pg_learning_store,
+sqlite_learning_store), which keep the in-memory store's method signatures
+so app.main works unchanged. Subclasses supply the connection handling and
+their dialect's statements under common names (ls_create, ls_answer, ...).
+
+- Sessions are write-through: every answer is one conditional UPDATE, so any
+  worker can serve any session and a question can only be scored once.
+- Progress, completions and badge awards are read through a per-process LRU
+  of users (entries older than user_cache_seconds are reloaded, so workers
+  see each other's writes) and written behind in batches, flushed when
+  flush_batch writes are pending, by a timer flush_seconds after the first
+  write of a batch (so a quiet worker still flushes), on every session
+  sweep, and at close(). Progress counters are flushed as deltas, so
+  workers never overwrite each other's increments. flush_seconds=0 writes
+  through. The database is the cold tier of user progress, so the
+  in-memory progress tier is not bounded or spilled separately, and users
+  with no progress row read DEFAULT_PROGRESS.
+- The module catalog is immutable per version and stays the in-process
+  ModuleCatalog loaded on first access. Catalog version numbers are
+  per-process counters, so a session row's catalog_version column only
+  records the starting worker's version; the row's content_hash column
+  holds its module's CompiledModule.content_hash, which every worker
+  computes alike from the same content. A session scores only against a
+  module with that exact hash, from the current catalog or one of the last
+  RETAINED_CATALOG_VERSIONS; one whose content this worker does not have
+  (after re-checking the catalog file) is refused, never rescored against
+  different questions. Rows written before the content_hash column existed
+  carry no hash and are refused the same way.
+
+Session masks are 64-bit integers, so modules with more than
+MAX_SESSION_QUESTIONS questions are rejected at session start.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, ContextManager, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.models.learning import BadgeInfo, CompletedModuleInfo, LearningModuleResponse
+from app.services.activity_bitmap import EPOCH, ActivityBitmap
+from app.services.learning_session import SELECTED_OVERFLOW, LearningSession
+from app.services.learning_store import LearningStore
+from app.services.module_catalog import CompiledModule, ModuleCatalog
+from app.services.progress_tiers import DEFAULT_PROGRESS, UserProgress
+
+logger = logging.getLogger(__name__)
+
+MAX_SESSION_QUESTIONS = 63
+RETAINED_CATALOG_VERSIONS = 4
+DEFAULT_FLUSH_SECONDS = 1.0
+DEFAULT_FLUSH_BATCH = 200
+DEFAULT_USER_CACHE_SECONDS = 2.0
+DEFAULT_MAX_CACHED_USERS = 50_000
+MAX_CACHED_SESSIONS = 100_000
+
+# Progress fields flushed as increments; the rest are last-writer or max
+ADDITIVE_PROGRESS_FIELDS = (
+    "total_mic_earned",
+    "modules_completed",
+    "total_learning_minutes",
+    "experience_points",
+)
+
+SESSION_COLUMNS = (
+    "id, user_id, module_id, catalog_version, content_hash, status, started_at, completed_at, "
+    "answered_mask, correct_mask, current_score, selected"
+)
+
+
+def _session_from_row(row: Tuple) -> LearningSession:
+    (session_id, user_id, module_id, catalog_version, content_hash, status,
+     started_at, completed_at, answered_mask, correct_mask, current_score, selected) = row
+    session = LearningSession(
+        session_id=session_id,
+        user_id=user_id,
+        module_id=module_id,
+        question_count=0,
+        started_at=started_at,
+        catalog_version=catalog_version,
+        content_hash=content_hash
+    )
+    session.status = status
+    session.completed_at = completed_at
+    session.answered_mask = answered_mask
+    session.correct_mask = correct_mask
+    session.current_score = current_score
+    # bytea / BLOB, or hex text where the dialect edits it as a string
+    session.selected = bytearray.fromhex(selected) if isinstance(selected, str) else bytearray(selected)
+    return session
+
+
+def _as_datetime(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+class SqlLearningStore(LearningStore, ABC):
+    """
+    LearningStore persisted through SQL; see the module docstring.
+
+    Subclasses implement _transaction(write) (yielding an object with
+    execute(name, params) -> rows and execute_batch(name, rows)),
+    ensure_schema() and close(), and may override the parameter encoders.
+    """
+
+    backend = "sql"
+    blocking_io = True
+
+    def __init__(
+        self,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        flush_batch: int = DEFAULT_FLUSH_BATCH,
+        user_cache_seconds: float = DEFAULT_USER_CACHE_SECONDS,
+        max_cached_users: int = DEFAULT_MAX_CACHED_USERS,
+        **kwargs
+    ):
+        kwargs["progress_hot_users"] = None  # bounded by max_cached_users; the database is the cold tier
+        super().__init__(**kwargs)
+        self.flush_seconds = flush_seconds
+        self.flush_batch = flush_batch
+        self.user_cache_seconds = user_cache_seconds
+        self.max_cached_users = max_cached_users
+        # Read-through user cache (LRU, user_id -> monotonic load time) and write-behind buffers
+        self._cached_users: "OrderedDict[str, float]" = OrderedDict()
+        self._progress_baseline: Dict[str, dict] = {}  # user_id -> progress as last flushed
+        self._dirty_progress: Set[str] = set()
+        self._pending_completions: Dict[str, Tuple] = {}  # completion id -> row
+        self._pending_badges: List[Tuple] = []
+        self._pending_since: Optional[float] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        self._write_lock = threading.RLock()
+        self._flush_stats = {"flushes": 0, "flush_errors": 0, "rows_written": 0}
+        # Immutable per-session facts, so an answer is a single statement
+        self._session_meta: "OrderedDict[str, Tuple[str, Optional[int]]]" = OrderedDict()
+
+    # Connections
+    # ===========
+
+    @abstractmethod
+    def _transaction(self, write: bool = True) -> ContextManager[Any]:
+        """One transaction; write=False marks it read-only where the backend cares"""
+
+    def _execute(self, name: str, params: Tuple) -> List[Tuple]:
+        """Run one named statement in its own transaction"""
+        with self._transaction() as tx:
+            return tx.execute(name, params)
+
+    def _encode_selected(self, selected: bytes) -> Any:
+        """Session answer bytes as a statement parameter"""
+        return selected
+
+    def _encode_ids(self, ids: Sequence[str]) -> Any:
+        """A list of IDs as one statement parameter"""
+        return list(ids)
+
+    @abstractmethod
+    def ensure_schema(self) -> None:
+        """Create the backend's tables if they do not exist"""
+
+    def close(self) -> None:
+        """Flush pending writes and release connections"""
+        with self._write_lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
+
+    # Catalog Versions
+    # ================
+
+    def _release_catalog_version(self, version: int) -> None:
+        # Sessions are not resident, so keep the last few versions instead of refcounting
+        current = self._catalog.version
+        for old in [v for v in self._catalog_versions if v <= current - RETAINED_CATALOG_VERSIONS]:
+            self._catalog_versions.pop(old, None)
+            self._catalog_refs.pop(old, None)
+
+    def _catalog_for(self, module_id: str, content_hash: Optional[int]) -> Optional[ModuleCatalog]:
+        """The resident catalog whose module has this content; None if this worker has no such content"""
+        if content_hash is None:
+            return None
+        catalog = self._retained_catalog(module_id, content_hash)
+        if catalog is None and self.reload_catalog() is not None:
+            # the session may have started on a catalog file this worker has not loaded yet
+            catalog = self._retained_catalog(module_id, content_hash)
+        return catalog
+
+    def _retained_catalog(self, module_id: str, content_hash: int) -> Optional[ModuleCatalog]:
+        for catalog in (self.catalog, *list(self._catalog_versions.values())):
+            compiled = catalog.compiled.get(module_id)
+            if compiled is not None and compiled.content_hash == content_hash:
+                return catalog
+        return None
+
+    def _compiled_for(self, module_id: str, content_hash: Optional[int]) -> Optional[CompiledModule]:
+        catalog = self._catalog_for(module_id, content_hash)
+        return catalog.compiled[module_id] if catalog else None
+
+    def get_session_catalog(self, session: LearningSession) -> Optional[ModuleCatalog]:
+        return self._catalog_for(session.module_id, session.content_hash)
+
+    # Session Operations
+    # ==================
+
+    def _remember_session(self, session_id: str, module_id: str, content_hash: Optional[int]) -> None:
+        self._session_meta[session_id] = (module_id, content_hash)
+        if len(self._session_meta) > MAX_CACHED_SESSIONS:
+            self._session_meta.popitem(last=False)
+
+    def _session_from_rows(self, rows: List[Tuple]) -> Optional[LearningSession]:
+        if not rows:
+            return None
+        session = _session_from_row(rows[0])
+        if session.status == "active":
+            self._remember_session(session.id, session.module_id, session.content_hash)
+        else:
+            self._session_meta.pop(session.id, None)
+        return session
+
+    def create_session(self, user_id: str, module_id: str) -> Optional[LearningSession]:
+        """Create a session, or return the user's active one for the module"""
+        catalog = self.catalog
+        compiled = catalog.compiled.get(module_id)
+        if not compiled:
+            return None
+        if compiled.question_count > MAX_SESSION_QUESTIONS:
+            logger.error(f"Module '{module_id}' has more than {MAX_SESSION_QUESTIONS} questions")
+            return None
+
+        session = LearningSession(
+            session_id=f"session_{uuid.uuid4().hex[:12]}",
+            user_id=user_id,
+            module_id=module_id,
+            question_count=compiled.question_count,
+            started_at=self._clock(),
+            catalog_version=catalog.version,
+            content_hash=compiled.content_hash
+        )
+        rows = self._execute("ls_create", (
+            session.id, user_id, module_id, catalog.version, compiled.content_hash,
+            session.started_at, self._encode_selected(bytes(session.selected)),
+        ))
+        if not rows:
+            # another worker started one first
+            return self.get_active_session(user_id, module_id)
+        self._remember_session(session.id, module_id, compiled.content_hash)
+        return session
+
+    def get_session(self, session_id: str) -> Optional[LearningSession]:
+        return self._session_from_rows(self._execute("ls_get", (session_id,)))
+
+    def get_active_session(self, user_id: str, module_id: str) -> Optional[LearningSession]:
+        return self._session_from_rows(self._execute("ls_get_active", (user_id, module_id)))
+
+    def get_user_sessions(
+        self,
+        user_id: str,
+        status: Optional[str] = None
+    ) -> List[LearningSession]:
+        sessions = [_session_from_row(row) for row in self._execute("ls_user_sessions", (user_id,))]
+        if status:
+            return [s for s in sessions if s.status == status]
+        return sessions
+
+    def submit_answer(
+        self,
+        session_id: str,
+        question_id: str,
+        selected_answer: int
+    ) -> Optional[dict]:
+        """Score an answer with one conditional UPDATE (see ls_answer)"""
+        meta = self._session_meta.get(session_id)
+        if meta is None:
+            session = self.get_session(session_id)
+            if not session or session.status != "active":
+                return None
+            meta = (session.module_id, session.content_hash)
+
+        compiled = self._compiled_for(*meta)
+        idx = compiled.question_index.get(question_id) if compiled else None
+        if idx is None:
+            return None
+
+        bit = 1 << idx
+        correct = selected_answer == compiled.answer_key[idx]
+        points = compiled.points[idx] if correct else 0
+        rows = self._execute("ls_answer", (
+            session_id, bit, bit if correct else 0, points, idx,
+            min(selected_answer, SELECTED_OVERFLOW), self._clock(),
+        ))
+        if not rows:
+            return None  # not active, or already answered
+        answered_mask, current_score = rows[0]
+
+        return {
+            "question_id": question_id,
+            "correct": correct,
+            "points_earned": points,
+            "explanation": compiled.explanations[idx],
+            "cumulative_score": current_score,
+            "questions_remaining": compiled.question_count - answered_mask.bit_count()
+        }
+
+    def submit_answers(
+        self,
+        session_id: str,
+        answers: List[Tuple[str, int]]
+    ) -> Optional[dict]:
+        """Submit several answers at once, all or nothing, under a row lock"""
+        if not answers:
+            return None
+        with self._transaction() as tx:
+            rows = tx.execute("ls_lock", (session_id,))
+            session = _session_from_row(rows[0]) if rows else None
+            if not session or session.status != "active":
+                return None
+            compiled = self.get_session_compiled(session)
+            if not compiled:
+                return None
+
+            positions = []
+            batch_mask = 0
+            for question_id, _ in answers:
+                idx = compiled.question_index.get(question_id)
+                if idx is None or session.is_answered(idx) or batch_mask >> idx & 1:
+                    return None
+                batch_mask |= 1 << idx
+                positions.append(idx)
+
+            results = []
+            for (question_id, selected_answer), idx in zip(answers, positions):
+                correct = selected_answer == compiled.answer_key[idx]
+                points = compiled.points[idx] if correct else 0
+                session.record_answer(idx, selected_answer, correct, points)
+                results.append({
+                    "question_id": question_id,
+                    "correct": correct,
+                    "points_earned": points,
+                    "explanation": compiled.explanations[idx],
+                    "cumulative_score": session.current_score,
+                    "questions_remaining": compiled.question_count - session.questions_answered
+                })
+            tx.execute("ls_write_answers", (
+                session_id, session.answered_mask, session.correct_mask, session.current_score,
+                self._encode_selected(bytes(session.selected)), self._clock(),
+            ))
+
+        return {
+            "results": results,
+            "cumulative_score": session.current_score,
+            "questions_answered": session.questions_answered,
+            "questions_remaining": compiled.question_count - session.questions_answered
+        }
+
+    def complete_session(self, session_id: str) -> Optional[LearningSession]:
+        return self._session_from_rows(self._execute("ls_complete", (session_id, self._clock())))
+
+    def abandon_session(self, session_id: str) -> Optional[LearningSession]:
+        session = self._session_from_rows(self._execute("ls_abandon", (session_id,)))
+        if session:
+            self._expiry_stats["abandoned"] += 1
+        return session
+
+    # Session Expiry
+    # ==============
+
+    def pin_session(self, session_id: str) -> bool:
+        if session_id not in self._session_meta and not self.get_session(session_id):
+            return False
+        self._pinned_sessions[session_id] = self._pinned_sessions.get(session_id, 0) + 1
+        return True
+
+    def unpin_session(self, session_id: str) -> None:
+        holders = self._pinned_sessions.get(session_id, 0) - 1
+        if holders > 0:
+            self._pinned_sessions[session_id] = holders
+            return
+        self._pinned_sessions.pop(session_id, None)
+        self._execute("ls_touch", (self._encode_ids([session_id]), self._clock()))
+
+    def sweep_expired_sessions(self, now: Optional[float] = None) -> int:
+        """
+        Abandon active sessions idle for longer than the TTL.
+
+        Sessions pinned in this process are skipped. Pending progress writes
+        are flushed first. Returns the number of sessions abandoned.
+        """
+        now = self._clock() if now is None else now
+        self.flush()
+        pinned = list(self._pinned_sessions)
+        with self._transaction() as tx:
+            if pinned:
+                tx.execute("ls_touch", (self._encode_ids(pinned), now))
+            rows = tx.execute("ls_sweep", (now - self.session_ttl_seconds, self._encode_ids(pinned)))
+            expired = [_session_from_row(row) for row in rows]
+
+        for session in expired:
+            self._session_meta.pop(session.id, None)
+        if expired and self.cold_storage_path:
+            with open(self.cold_storage_path, "a", encoding="utf-8") as f:
+                for session in expired:
+                    record = session.to_dict(self.get_session_compiled(session))
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._expiry_stats["cold_storage_writes"] += len(expired)
+
+        self._expiry_stats["abandoned"] += len(expired)
+        self._expiry_stats["evicted"] += len(expired)
+        self._expiry_stats["last_sweep_at"] = datetime.utcfromtimestamp(now).isoformat()
+        self._expiry_stats["last_sweep_evicted"] = len(expired)
+        return len(expired)
+
+    def get_session_metrics(self) -> Dict[str, Any]:
+        """Session counts from the database plus this process's caches and write buffers"""
+        active, users = self._execute("ls_metrics", ())[0]
+
+        return {
+            "backend": self.backend,
+            "active_sessions": active,
+            "users_with_sessions": users,
+            "cached_session_ids": len(self._session_meta),
+            "cached_users": len(self._cached_users),
+            "pinned_sessions": len(self._pinned_sessions),
+            "session_ttl_seconds": self.session_ttl_seconds,
+            "pending_writes": self._pending_count(),
+            **self._flush_stats,
+            "abandoned_total": self._expiry_stats["abandoned"],
+            "evicted_total": self._expiry_stats["evicted"],
+            "cold_storage_writes": self._expiry_stats["cold_storage_writes"],
+            "cold_storage_enabled": bool(self.cold_storage_path),
+            "last_sweep_at": self._expiry_stats["last_sweep_at"],
+            "last_sweep_evicted": self._expiry_stats["last_sweep_evicted"],
+        }
+
+    # Read-through User Cache
+    # =======================
+
+    def _ensure_user(self, user_id: str) -> None:
+        """Load a user's progress, completions and badges on first use or once stale"""
+        now = time.monotonic()
+        loaded_at = self._cached_users.get(user_id)
+        if loaded_at is not None:
+            if now - loaded_at < self.user_cache_seconds:
+                self._cached_users.move_to_end(user_id)
+                return
+            # the reload must see this process's own writes; keep the cache if they can't be flushed
+            if self._pending_count() and (not self.flush() or self._pending_count()):
+                return
+
+        with self._transaction(write=False) as tx:
+            progress_rows = tx.execute("lp_progress", (user_id,))
+            completion_rows = tx.execute("lp_completions", (user_id,))
+            badge_rows = tx.execute("lp_badges", (user_id,))
+        progress_row = progress_rows[0] if progress_rows else None
+
+        with self._write_lock:
+            self.user_progress.pop(user_id, None)
+            if progress_row:
+                progress = self.user_progress.get_or_create(user_id)
+                (progress["total_mic_earned"], progress["modules_completed"],
+                 progress["total_learning_minutes"], progress["experience_points"],
+                 progress["current_streak"], progress["longest_streak"], progress["level"],
+                 last_activity, progress["integrity_score"]) = progress_row
+                progress["last_activity"] = _as_datetime(last_activity).isoformat() if last_activity else None
+                self._progress_baseline[user_id] = progress.to_dict()
+            else:
+                # no record until the first write; reads get the shared default
+                self._progress_baseline[user_id] = DEFAULT_PROGRESS.to_dict()
+
+            completions, mask, activity = [], 0, ActivityBitmap()
+            for completion_id, module_id, completed_at, accuracy, mic_earned in completion_rows:
+                completed_at = _as_datetime(completed_at)
+                completions.append({
+                    "id": str(completion_id),
+                    "module_id": module_id,
+                    "completed_at": completed_at.isoformat(),
+                    "accuracy": accuracy,
+                    "mic_earned": mic_earned
+                })
+                mask |= self.module_bit(module_id)
+                activity.mark((completed_at.date() - EPOCH).days)
+            self.completions[user_id] = completions
+            self._completion_masks[user_id] = mask
+            self.activity[user_id] = activity
+            self.user_badges[user_id] = [badge_id for (badge_id,) in badge_rows]
+
+            self._cached_users[user_id] = now
+            self._cached_users.move_to_end(user_id)
+            self._evict_cached_users()
+
+    def _evict_cached_users(self) -> None:
+        """Drop least recently used users with nothing left to flush (lock held)"""
+        excess = len(self._cached_users) - self.max_cached_users
+        if excess <= 0:
+            return
+        pending_users = self._dirty_progress | {row[1] for row in self._pending_completions.values()}
+        pending_users |= {row[0] for row in self._pending_badges}
+        for user_id in list(self._cached_users):
+            if excess <= 0:
+                break
+            if user_id in pending_users:
+                continue
+            del self._cached_users[user_id]
+            for cache in (self.user_progress, self._progress_baseline, self.completions,
+                          self._completion_masks, self.activity,
+                          self.user_badges):
+                cache.pop(user_id, None)
+            excess -= 1
+
+    # Write-behind Buffers
+    # ====================
+
+    def _pending_count(self) -> int:
+        return len(self._dirty_progress) + len(self._pending_completions) + len(self._pending_badges)
+
+    def _wrote(self) -> None:
+        """Note a buffered write and flush if the batch is full or old enough"""
+        now = time.monotonic()
+        with self._write_lock:
+            if self._pending_since is None:
+                self._pending_since = now
+                self._arm_flush_timer()
+            due = (self._pending_count() >= self.flush_batch
+                   or now - self._pending_since >= self.flush_seconds)
+        if due:
+            self.flush()
+
+    def _arm_flush_timer(self) -> None:
+        """Flush flush_seconds from now even if no further write or sweep comes (lock held)"""
+        if self.flush_seconds <= 0 or self._flush_timer is not None:
+            return
+        timer = threading.Timer(self.flush_seconds, self._timed_flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _timed_flush(self) -> None:
+        with self._write_lock:
+            self._flush_timer = None
+        self.flush()
+        with self._write_lock:
+            if self._pending_count():
+                self._arm_flush_timer()  # the flush failed or new writes came in; try again
+
+    def _queue_completion(self, user_id: str, completion: dict) -> None:
+        self._pending_completions[completion["id"]] = (
+            completion["id"], user_id, completion["module_id"], completion["completed_at"],
+            completion["accuracy"], completion["mic_earned"],
+        )
+
+    def flush(self) -> int:
+        """
+        Write buffered progress, completions and badges in one transaction.
+
+        Returns the number of rows written. On failure the buffers are kept
+        and retried on the next flush.
+        """
+        with self._write_lock:
+            if not self._pending_count():
+                self._pending_since = None
+                return 0
+
+            progress_rows = []
+            for user_id in self._dirty_progress:
+                progress = self.user_progress.get_or_create(user_id)
+                baseline = self._progress_baseline[user_id]
+                progress_rows.append((
+                    user_id,
+                    *(progress[f] - baseline[f] for f in ADDITIVE_PROGRESS_FIELDS),
+                    progress["current_streak"], progress["longest_streak"], progress["level"],
+                    progress["last_activity"], progress["integrity_score"],
+                ))
+            completion_rows = list(self._pending_completions.values())
+            badge_rows = list(self._pending_badges)
+
+            try:
+                with self._transaction() as tx:
+                    if progress_rows:
+                        tx.execute_batch("flush_progress", progress_rows)
+                    if completion_rows:
+                        tx.execute_batch("flush_completions", completion_rows)
+                    if badge_rows:
+                        tx.execute_batch("flush_badges", badge_rows)
+            except Exception:
+                self._flush_stats["flush_errors"] += 1
+                logger.exception("Learning progress flush failed; will retry")
+                return 0
+
+            for user_id in self._dirty_progress:
+                self._progress_baseline[user_id] = self.user_progress.get_or_create(user_id).to_dict()
+            self._dirty_progress.clear()
+            self._pending_completions.clear()
+            self._pending_badges.clear()
+            self._pending_since = None
+
+            written = len(progress_rows) + len(completion_rows) + len(badge_rows)
+            self._flush_stats["flushes"] += 1
+            self._flush_stats["rows_written"] += written
+            return written
+
+    # User Progress Operations
+    # ========================
+
+    def get_user_progress(self, user_id: str) -> UserProgress:
+        self._ensure_user(user_id)
+        return super().get_user_progress(user_id)
+
+    def _progress_for_write(self, user_id: str) -> UserProgress:
+        self._ensure_user(user_id)
+        return super()._progress_for_write(user_id)
+
+    def update_user_progress(
+        self,
+        user_id: str,
+        mic_earned: int,
+        xp_earned: int,
+        minutes_spent: int
+    ) -> dict:
+        with self._write_lock:
+            progress = super().update_user_progress(user_id, mic_earned, xp_earned, minutes_spent)
+            self._dirty_progress.add(user_id)
+        self._wrote()
+        return progress
+
+    def get_user_activity(self, user_id: str, days: int = 365) -> dict:
+        self._ensure_user(user_id)
+        return super().get_user_activity(user_id, days)
+
+    def record_completion(
+        self,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        mic_earned: int
+    ) -> None:
+        self._ensure_user(user_id)
+        with self._write_lock:
+            super().record_completion(user_id, module_id, accuracy, mic_earned)
+            completion = self.completions[user_id][-1]
+            completion["id"] = str(uuid.uuid4())
+            self._queue_completion(user_id, completion)
+        self._wrote()
+
+    def record_deferred_mint(self, user_id: str, module_id: str, mic_earned: int) -> List[BadgeInfo]:
+        self._ensure_user(user_id)
+        with self._write_lock:
+            awarded = super().record_deferred_mint(user_id, module_id, mic_earned)
+            self._dirty_progress.add(user_id)
+            for c in reversed(self.completions.get(user_id, [])):
+                if c["module_id"] == module_id:
+                    self._queue_completion(user_id, c)
+                    break
+            self._pending_badges.extend((user_id, b.id, b.earned_at) for b in awarded)
+        self._wrote()
+        return awarded
+
+    def has_completed_module(self, user_id: str, module_id: str) -> bool:
+        self._ensure_user(user_id)
+        return super().has_completed_module(user_id, module_id)
+
+    def get_completion_mask(self, user_id: str) -> int:
+        self._ensure_user(user_id)
+        return super().get_completion_mask(user_id)
+
+    def get_completed_module_ids(self, user_id: str) -> Set[str]:
+        self._ensure_user(user_id)
+        return super().get_completed_module_ids(user_id)
+
+    def get_unlocked_mask(self, user_id: str) -> int:
+        self._ensure_user(user_id)
+        return super().get_unlocked_mask(user_id)
+
+    def get_next_modules(self, user_id: str, limit: Optional[int] = None) -> List[LearningModuleResponse]:
+        self._ensure_user(user_id)
+        return super().get_next_modules(user_id, limit)
+
+    def get_completed_modules(self, user_id: str) -> List[CompletedModuleInfo]:
+        self._ensure_user(user_id)
+        return super().get_completed_modules(user_id)
+
+    # Badge Operations
+    # ================
+
+    def check_and_award_badges(
+        self,
+        user_id: str,
+        module_id: str,
+        accuracy: float,
+        is_first_module: bool
+    ) -> List[BadgeInfo]:
+        self._ensure_user(user_id)
+        with self._write_lock:
+            awarded = super().check_and_award_badges(user_id, module_id, accuracy, is_first_module)
+            self._pending_badges.extend((user_id, b.id, b.earned_at) for b in awarded)
+        if awarded:
+            self._wrote()
+        return awarded
+
+    def get_user_badges(self, user_id: str) -> List[BadgeInfo]:
+        self._ensure_user(user_id)
+        return super().get_user_badges(user_id)
@@ -0,0 +1,123 @@
+# app/services/sqlite_db.py
+"""
+SQLite Database
+
+Shared by the SQLite-backed stores (sqlite_learning_store,
+sqlite_mic_ledger_store, agent_registry) so several uvicorn workers on one
+host can share state through a single database file.
+
+- WAL journal: readers never block the writer and vice versa; with
+  synchronous=NORMAL a commit is an append to the WAL, not an fsync.
+- One connection per process and thread: connections are opened lazily, and
+  a forked worker opens its own instead of reusing its parent's.
+- Writes run in BEGIN IMMEDIATE transactions, which take the database write
+  lock up front, so concurrent writers wait (up to busy_timeout_ms) instead
+  of failing mid-transaction on a lock upgrade.
+- Statements are named, like the Postgres prepared statements; sqlite3
+  caches their compiled form per connection.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_SQLITE_PATH = "mobius_state.sqlite3"
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+
+def sqlite_path() -> str:
+    """Database file shared by every SQLite-backed store (SQLITE_STORE_PATH)"""
+    return os.getenv("SQLITE_STORE_PATH", "").strip() or DEFAULT_SQLITE_PATH
+
+
+class SqliteTransaction:
+    """Named-statement execution on one connection"""
+
+    def __init__(self, conn: sqlite3.Connection, statements: Dict[str, str]):
+        self._conn = conn
+        self._statements = statements
+
+    def execute(self, name: str, params: Tuple) -> List[Tuple]:
+        return self._conn.execute(self._statements[name], params).fetchall()
+
+    def execute_batch(self, name: str, rows: Sequence[Tuple]) -> None:
+        self._conn.executemany(self._statements[name], rows)
+
+
+class SqliteDatabase:
+    """A WAL-mode SQLite file with a connection per process and thread"""
+
+    def __init__(
+        self,
+        path: str,
+        statements: Optional[Dict[str, str]] = None,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS
+    ):
+        self.path = path
+        self.statements = statements or {}
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if os.getpid() != self._pid:
+            # forked: the parent's connections must not be used (or closed) here
+            self._local = threading.local()
+            self._pid = os.getpid()
+            self._connections = []
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,  # autocommit; transactions are explicit
+                check_same_thread=False,  # only so close() can run from another thread
+                cached_statements=max(128, 2 * len(self.statements)),
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self, write: bool = True) -> Iterator[SqliteTransaction]:
+        """
+        Run statements in one transaction; commits on success.
+
+        write=True takes the write lock at BEGIN (BEGIN IMMEDIATE); read-only
+        transactions use a deferred BEGIN for a consistent snapshot.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield SqliteTransaction(conn, self.statements)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def execute(self, name: str, params: Tuple) -> List[Tuple]:
+        """Run one named statement; a single statement is its own transaction"""
+        return self._connection().execute(self.statements[name], params).fetchall()
+
+    def run_script(self, sql: str) -> None:
+        """Run ad hoc SQL (schema) outside the named statements"""
+        self._connection().executescript(sql)
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Any]:
+        """Run ad hoc SQL (reports, tests)"""
+        return self._connection().execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,228 @@
+# app/services/sqlite_learning_store.py
+"""
+SQLite Learning Store
+
+A SqlLearningStore (see sql_learning_store) on a WAL-mode SQLite file
+(SQLITE_STORE_PATH), selected with LEARNING_STORE_BACKEND=sqlite (see
+learning_store.create_learning_store). Every uvicorn worker on the host
+opens the same file, so sessions and progress are shared across workers
+without a database server.
+
+Answers are single conditional UPDATEs, as on Postgres; progress,
+completions and badges are written behind in executemany batches, one
+BEGIN IMMEDIATE transaction per flush. Session answer bytes are stored as
+hex text so an answer can patch its byte in place.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Sequence
+
+from app.services.sql_learning_store import (
+    DEFAULT_FLUSH_BATCH,
+    DEFAULT_FLUSH_SECONDS,
+    DEFAULT_USER_CACHE_SECONDS,
+    SESSION_COLUMNS,
+    SqlLearningStore,
+)
+from app.services.sqlite_db import DEFAULT_BUSY_TIMEOUT_MS, SqliteDatabase, SqliteTransaction, sqlite_path
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS learning_sessions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    catalog_version INTEGER NOT NULL,
+    content_hash INTEGER,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    completed_at REAL,
+    last_activity_at REAL NOT NULL,
+    answered_mask INTEGER NOT NULL DEFAULT 0,
+    correct_mask INTEGER NOT NULL DEFAULT 0,
+    current_score INTEGER NOT NULL DEFAULT 0,
+    selected TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS learning_sessions_active_idx
+    ON learning_sessions (user_id, module_id) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS learning_sessions_user_idx ON learning_sessions (user_id);
+CREATE INDEX IF NOT EXISTS learning_sessions_idle_idx
+    ON learning_sessions (last_activity_at) WHERE status = 'active';
+
+CREATE TABLE IF NOT EXISTS learning_user_progress (
+    user_id TEXT PRIMARY KEY,
+    total_mic_earned INTEGER NOT NULL DEFAULT 0,
+    modules_completed INTEGER NOT NULL DEFAULT 0,
+    total_learning_minutes INTEGER NOT NULL DEFAULT 0,
+    experience_points INTEGER NOT NULL DEFAULT 0,
+    current_streak INTEGER NOT NULL DEFAULT 0,
+    longest_streak INTEGER NOT NULL DEFAULT 0,
+    level INTEGER NOT NULL DEFAULT 1,
+    last_activity TEXT,
+    integrity_score REAL NOT NULL DEFAULT 0.85,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS learning_completions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    accuracy REAL NOT NULL,
+    mic_earned INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS learning_completions_user_idx
+    ON learning_completions (user_id, completed_at);
+
+CREATE TABLE IF NOT EXISTS learning_user_badges (
+    user_id TEXT NOT NULL,
+    badge_id TEXT NOT NULL,
+    earned_at TEXT NOT NULL,
+    PRIMARY KEY (user_id, badge_id)
+);
+"""
+
+# Same names and parameter order as pg_learning_store.PREPARED_STATEMENTS
+STATEMENTS: Dict[str, str] = {
+    "ls_create": (
+        "INSERT INTO learning_sessions (id, user_id, module_id, catalog_version, content_hash, "
+        "status, started_at, last_activity_at, selected) "
+        "VALUES (?1, ?2, ?3, ?4, ?5, 'active', ?6, ?6, ?7) "
+        "ON CONFLICT (user_id, module_id) WHERE status = 'active' DO NOTHING RETURNING id"
+    ),
+    "ls_get": f"SELECT {SESSION_COLUMNS} FROM learning_sessions WHERE id = ?1",
+    "ls_get_active": (
+        f"SELECT {SESSION_COLUMNS} FROM learning_sessions "
+        "WHERE user_id = ?1 AND module_id = ?2 AND status = 'active'"
+    ),
+    "ls_user_sessions": (
+        f"SELECT {SESSION_COLUMNS} FROM learning_sessions WHERE user_id = ?1 ORDER BY started_at"
+    ),
+    # Applies only if the session is active and the question is unanswered
+    "ls_answer": (
+        "UPDATE learning_sessions SET answered_mask = answered_mask | ?2, "
+        "correct_mask = correct_mask | ?3, current_score = current_score + ?4, "
+        "selected = substr(selected, 1, 2 * ?5) || printf('%02x', ?6) || substr(selected, 2 * ?5 + 3), "
+        "last_activity_at = ?7 "
+        "WHERE id = ?1 AND status = 'active' AND answered_mask & ?2 = 0 "
+        "RETURNING answered_mask, current_score"
+    ),
+    # The caller's BEGIN IMMEDIATE already holds the write lock
+    "ls_lock": f"SELECT {SESSION_COLUMNS} FROM learning_sessions WHERE id = ?1",
+    "ls_write_answers": (
+        "UPDATE learning_sessions SET answered_mask = ?2, correct_mask = ?3, "
+        "current_score = ?4, selected = ?5, last_activity_at = ?6 WHERE id = ?1"
+    ),
+    "ls_complete": (
+        "UPDATE learning_sessions SET status = 'completed', completed_at = ?2, "
+        f"last_activity_at = ?2 WHERE id = ?1 AND status = 'active' RETURNING {SESSION_COLUMNS}"
+    ),
+    "ls_abandon": (
+        "UPDATE learning_sessions SET status = 'abandoned' "
+        f"WHERE id = ?1 AND status = 'active' RETURNING {SESSION_COLUMNS}"
+    ),
+    # ID lists are JSON arrays
+    "ls_touch": (
+        "UPDATE learning_sessions SET last_activity_at = ?2 "
+        "WHERE id IN (SELECT value FROM json_each(?1)) AND status = 'active'"
+    ),
+    "ls_sweep": (
+        "UPDATE learning_sessions SET status = 'abandoned' "
+        "WHERE status = 'active' AND last_activity_at <= ?1 "
+        "AND id NOT IN (SELECT value FROM json_each(?2)) "
+        f"RETURNING {SESSION_COLUMNS}"
+    ),
+    "ls_metrics": (
+        "SELECT count(*), count(DISTINCT user_id) FROM learning_sessions WHERE status = 'active'"
+    ),
+    "lp_progress": (
+        "SELECT total_mic_earned, modules_completed, total_learning_minutes, experience_points, "
+        "current_streak, longest_streak, level, last_activity, integrity_score "
+        "FROM learning_user_progress WHERE user_id = ?1"
+    ),
+    "lp_completions": (
+        "SELECT id, module_id, completed_at, accuracy, mic_earned FROM learning_completions "
+        "WHERE user_id = ?1 ORDER BY completed_at"
+    ),
+    "lp_badges": "SELECT badge_id FROM learning_user_badges WHERE user_id = ?1 ORDER BY earned_at",
+    # Write-behind batches (executemany)
+    "flush_progress": """
+    INSERT INTO learning_user_progress AS p
+        (user_id, total_mic_earned, modules_completed, total_learning_minutes,
+         experience_points, current_streak, longest_streak, level, last_activity,
+         integrity_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_mic_earned = p.total_mic_earned + excluded.total_mic_earned,
+        modules_completed = p.modules_completed + excluded.modules_completed,
+        total_learning_minutes = p.total_learning_minutes + excluded.total_learning_minutes,
+        experience_points = p.experience_points + excluded.experience_points,
+        current_streak = excluded.current_streak,
+        longest_streak = max(p.longest_streak, excluded.longest_streak),
+        level = max(p.level, excluded.level),
+        last_activity = CASE
+            WHEN excluded.last_activity IS NULL OR p.last_activity >= excluded.last_activity
+            THEN p.last_activity ELSE excluded.last_activity END,
+        integrity_score = excluded.integrity_score,
+        updated_at = CURRENT_TIMESTAMP
+""",
+    "flush_completions": """
+    INSERT INTO learning_completions (id, user_id, module_id, completed_at, accuracy, mic_earned)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET mic_earned = excluded.mic_earned
+""",
+    "flush_badges": """
+    INSERT INTO learning_user_badges (user_id, badge_id, earned_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT (user_id, badge_id) DO NOTHING
+""",
+}
+
+
+class SqliteLearningStore(SqlLearningStore):
+    """SqlLearningStore on a SQLite file shared by the host's workers"""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS, **kwargs):
+        self._db = SqliteDatabase(path, STATEMENTS, busy_timeout_ms)
+        super().__init__(**kwargs)
+        self.ensure_schema()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "SqliteLearningStore":
+        return cls(
+            path=sqlite_path(),
+            busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", DEFAULT_BUSY_TIMEOUT_MS)),
+            flush_seconds=float(os.getenv("LEARNING_SQLITE_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS)),
+            flush_batch=int(os.getenv("LEARNING_SQLITE_FLUSH_BATCH", DEFAULT_FLUSH_BATCH)),
+            user_cache_seconds=float(os.getenv("LEARNING_USER_CACHE_SECONDS", DEFAULT_USER_CACHE_SECONDS)),
+            **kwargs
+        )
+
+    @contextmanager
+    def _transaction(self, write: bool = True) -> Iterator[SqliteTransaction]:
+        with self._db.transaction(write) as tx:
+            yield tx
+
+    def _execute(self, name: str, params: tuple) -> list:
+        # single statements are atomic on their own; skip the explicit BEGIN
+        return self._db.execute(name, params)
+
+    def _encode_selected(self, selected: bytes) -> Any:
+        return selected.hex()
+
+    def _encode_ids(self, ids: Sequence[str]) -> Any:
+        return json.dumps(list(ids))
+
+    def ensure_schema(self) -> None:
+        self._db.run_script(SCHEMA_SQL)
+        # SQLite has no ADD COLUMN IF NOT EXISTS; databases created before content_hash gain it here
+        columns = {row[1] for row in self._db.query("PRAGMA table_info(learning_sessions)")}
+        if "content_hash" not in columns:
+            self._db.run_script("ALTER TABLE learning_sessions ADD COLUMN content_hash INTEGER")
+
+    def close(self) -> None:
+        super().close()
+        self._db.close()
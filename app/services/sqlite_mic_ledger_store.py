@@ -0,0 +1,220 @@
+# app/services/sqlite_mic_ledger_store.py
+"""
+SQLite MIC Ledger Store
+
+The MICLedgerStore interface on a WAL-mode SQLite file (SQLITE_STORE_PATH),
+so every uvicorn worker on the host sees the same balances. Selected with
+MIC_LEDGER_BACKEND=sqlite (see mic_ledger_store.create_mic_ledger_store).
+
+- Appends insert the ledger row and bump the user's mic_balances row in one
+  BEGIN IMMEDIATE transaction; the ledger stays the source of truth
+  (backfill_balances re-derives the balance table from it).
+- History reads are keyset queries on (user_id, created_at DESC, id DESC).
+  Timestamps are stored as fixed-width ISO text so they sort correctly.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.learning import MICLedgerEntry, MICReason
+from app.services.mic_ledger_store import MICLedgerStore, ledger_cursor, parse_ledger_cursor
+from app.services.sqlite_db import DEFAULT_BUSY_TIMEOUT_MS, SqliteDatabase, sqlite_path
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS mic_ledger (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    amount REAL NOT NULL,
+    reason TEXT NOT NULL,
+    integrity_score REAL NOT NULL,
+    gii REAL,
+    module_id TEXT,
+    session_id TEXT,
+    transaction_id TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mic_ledger_user_idx ON mic_ledger (user_id, created_at DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS mic_balances (
+    user_id TEXT PRIMARY KEY,
+    balance REAL NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+ENTRY_COLUMNS = (
+    "id, user_id, amount, reason, integrity_score, gii, module_id, session_id, "
+    "transaction_id, metadata, created_at"
+)
+
+STATEMENTS: Dict[str, str] = {
+    "mic_insert": f"INSERT INTO mic_ledger ({ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "mic_bump": (
+        "INSERT INTO mic_balances (user_id, balance, entries) VALUES (?1, ?2, 1) "
+        "ON CONFLICT (user_id) DO UPDATE SET balance = balance + ?2, entries = entries + 1"
+    ),
+    "mic_wallet": "SELECT balance, entries FROM mic_balances WHERE user_id = ?1",
+    "mic_latest": (
+        f"SELECT {ENTRY_COLUMNS} FROM mic_ledger WHERE user_id = ?1 "
+        "ORDER BY created_at DESC, id DESC LIMIT ?2"
+    ),
+    "mic_latest_offset": (
+        f"SELECT {ENTRY_COLUMNS} FROM mic_ledger WHERE user_id = ?1 "
+        "ORDER BY created_at DESC, id DESC LIMIT ?2 OFFSET ?3"
+    ),
+    "mic_before": (
+        f"SELECT {ENTRY_COLUMNS} FROM mic_ledger WHERE user_id = ?1 "
+        "AND (created_at, id) < (?2, ?3) ORDER BY created_at DESC, id DESC LIMIT ?4"
+    ),
+    "mic_by_reason": (
+        f"SELECT {ENTRY_COLUMNS} FROM mic_ledger WHERE user_id = ?1 AND reason = ?2 "
+        "ORDER BY created_at, id"
+    ),
+    "mic_breakdown": "SELECT reason, SUM(amount) FROM mic_ledger WHERE user_id = ?1 GROUP BY reason",
+}
+
+BACKFILL_BALANCES_SQL = """
+    INSERT OR REPLACE INTO mic_balances (user_id, balance, entries)
+    SELECT user_id, SUM(amount), COUNT(*) FROM mic_ledger GROUP BY user_id
+"""
+
+
+def _timestamp(value: datetime) -> str:
+    return value.isoformat(timespec="microseconds")
+
+
+def _entry_from_row(row: Tuple) -> MICLedgerEntry:
+    (entry_id, user_id, amount, reason, integrity_score, gii, module_id,
+     session_id, transaction_id, metadata, created_at) = row
+    return MICLedgerEntry(
+        id=entry_id,
+        user_id=user_id,
+        amount=amount,
+        reason=MICReason(reason),
+        integrity_score=integrity_score,
+        gii=gii,
+        module_id=module_id,
+        session_id=session_id,
+        transaction_id=transaction_id,
+        metadata=json.loads(metadata),
+        created_at=datetime.fromisoformat(created_at)
+    )
+
+
+class SqliteMICLedgerStore(MICLedgerStore):
+    """MIC ledger on a SQLite file shared by the host's workers; see the module docstring"""
+
+    def __init__(self, path: str, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS):
+        super().__init__()
+        self._db = SqliteDatabase(path, STATEMENTS, busy_timeout_ms)
+        self._db.run_script(SCHEMA_SQL)
+
+    @classmethod
+    def from_env(cls) -> "SqliteMICLedgerStore":
+        return cls(
+            path=sqlite_path(),
+            busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", DEFAULT_BUSY_TIMEOUT_MS)),
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def append_entry(
+        self,
+        user_id: str,
+        amount: float,
+        reason: MICReason,
+        integrity_score: float,
+        gii: Optional[float] = None,
+        module_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        transaction_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> MICLedgerEntry:
+        """Append an entry and update the user's balance row in one transaction"""
+        created_at = datetime.utcnow()
+        entry = MICLedgerEntry(
+            id=f"mic_ledger_{uuid.uuid4().hex[:12]}_{int(created_at.timestamp())}",
+            user_id=user_id,
+            amount=round(amount, 2),
+            reason=reason,
+            integrity_score=round(integrity_score, 4),
+            gii=round(gii, 4) if gii else None,
+            module_id=module_id,
+            session_id=session_id,
+            transaction_id=transaction_id,
+            metadata=metadata or {},
+            created_at=created_at
+        )
+        with self._db.transaction() as tx:
+            tx.execute("mic_insert", (
+                entry.id, user_id, entry.amount, reason.value, entry.integrity_score, entry.gii,
+                module_id, session_id, transaction_id, json.dumps(entry.metadata),
+                _timestamp(created_at),
+            ))
+            tx.execute("mic_bump", (user_id, entry.amount))
+        return entry
+
+    def get_balance(self, user_id: str) -> float:
+        """Balance from the user's balance row, maintained with every append"""
+        rows = self._db.execute("mic_wallet", (user_id,))
+        return round(rows[0][0], 2) if rows else 0.0
+
+    def get_recent_entries(self, user_id: str, limit: int = 10) -> List[MICLedgerEntry]:
+        return [_entry_from_row(row) for row in self._db.execute("mic_latest", (user_id, limit))]
+
+    def get_ledger(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> tuple[int, List[MICLedgerEntry]]:
+        total = self.get_total_entries_count(user_id)
+        if not total or offset >= total:
+            return total, []
+        rows = self._db.execute("mic_latest_offset", (user_id, limit, offset))
+        return total, [_entry_from_row(row) for row in rows]
+
+    def get_ledger_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MICLedgerEntry], Optional[str]]:
+        if cursor is None:
+            rows = self._db.execute("mic_latest", (user_id, limit))
+        else:
+            created_at, entry_id = parse_ledger_cursor(cursor)
+            rows = self._db.execute("mic_before", (user_id, _timestamp(created_at), entry_id, limit))
+        entries = [_entry_from_row(row) for row in rows]
+        next_cursor = ledger_cursor(entries[-1]) if len(entries) == limit else None
+        return entries, next_cursor
+
+    def get_last_entry(self, user_id: str) -> Optional[MICLedgerEntry]:
+        rows = self._db.execute("mic_latest", (user_id, 1))
+        return _entry_from_row(rows[0]) if rows else None
+
+    def get_total_entries_count(self, user_id: str) -> int:
+        rows = self._db.execute("mic_wallet", (user_id,))
+        return rows[0][1] if rows else 0
+
+    def get_entries_by_reason(self, user_id: str, reason: MICReason) -> List[MICLedgerEntry]:
+        rows = self._db.execute("mic_by_reason", (user_id, reason.value))
+        return [_entry_from_row(row) for row in rows]
+
+    def get_balance_breakdown(self, user_id: str) -> Dict[str, float]:
+        breakdown = {
+            reason: round(total, 2)
+            for reason, total in self._db.execute("mic_breakdown", (user_id,))
+        }
+        breakdown["total"] = round(sum(breakdown.values()), 2)
+        return breakdown
+
+    def backfill_balances(self) -> None:
+        """Re-derive every user's balance and entry count from the ledger"""
+        with self._db.transaction():
+            self._db.query(BACKFILL_BALANCES_SQL)
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Learning Store benchmarks
+
+Usage:
+    python scripts/bench_learning_store.py session-start --sessions 1000000
+    python scripts/bench_learning_store.py session-churn --sessions 1000000
+    python scripts/bench_learning_store.py session-memory --sessions 50000
+    python scripts/bench_learning_store.py module-search --modules 1000
+    python scripts/bench_learning_store.py store-backends --iterations 2000
+    (store-backends adds Postgres when DATABASE_URL points at a scratch database)
+    python scripts/bench_learning_store.py completion --iterations 2000
+    python scripts/bench_learning_store.py progress-tiers --iterations 100000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.learning_session import LearningSession  # noqa: E402
+from app.services.learning_store import LearningStore  # noqa: E402
+from app.services.module_search import ModuleSearchIndex  # noqa: E402
+
+
+def _timed(fn, iterations: int) -> list[float]:
+    """Run fn iterations times, returning per-call latency in microseconds"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"  {label:<28} median {statistics.median(samples):>10.2f} µs   p99 {p99:>10.2f} µs")
+
+
+def _populate_sessions(store: LearningStore, count: int) -> None:
+    """Create count historical sessions spread across users and modules"""
+    module_ids = list(store.modules)
+    for i in range(count):
+        session = store.create_session(f"user-{i % 50_000}", module_ids[i % len(module_ids)])
+        store.complete_session(session.id)
+
+
+def _scan_active_session(store: LearningStore, user_id: str, module_id: str):
+    """The pre-index lookup: a scan over every session ever created"""
+    for session in store.sessions.values():
+        if (session.user_id == user_id and
+                session.module_id == module_id and
+                session.status == "active"):
+            return session
+    return None
+
+
+def bench_session_start(args: argparse.Namespace) -> None:
+    store = LearningStore()
+    print(f"Populating {args.sessions:,} historical sessions...")
+    start = time.perf_counter()
+    _populate_sessions(store, args.sessions)
+    print(f"  populated in {time.perf_counter() - start:.1f}s")
+
+    module_id = next(iter(store.modules))
+    store.create_session("bench-user", module_id)
+
+    print(f"Active-session lookup ({args.iterations} iterations):")
+    _report("indexed get_active_session", _timed(
+        lambda: store.get_active_session("bench-user", module_id), args.iterations
+    ))
+    _report("linear scan (previous)", _timed(
+        lambda: _scan_active_session(store, "bench-user", module_id), min(args.iterations, 20)
+    ))
+
+
+def bench_session_churn(args: argparse.Namespace) -> None:
+    """Sustained session creation with periodic sweeps; resident set should plateau"""
+    ttl = 600
+    per_second = 1_000
+    # Drive the store from a simulated clock so a long run fits in seconds
+    clock = [time.time()]
+    store = LearningStore(session_ttl_seconds=ttl, clock=lambda: clock[0])
+    module_ids = list(store.modules)
+
+    print(f"Creating {args.sessions:,} sessions at {per_second}/s simulated, TTL {ttl}s:")
+    for i in range(args.sessions):
+        store.create_session(f"user-{i}", module_ids[i % len(module_ids)])
+        if i % per_second == per_second - 1:
+            clock[0] += 1
+            store.sweep_expired_sessions()
+        if i % (args.sessions // 10) == 0:
+            m = store.get_session_metrics()
+            rss = m["process_rss_bytes"]
+            print(f"  {i:>10,} created   resident {m['resident_sessions']:>8,}   "
+                  f"evicted {m['evicted_total']:>10,}   rss {rss / 2**20 if rss else 0:>8.1f} MiB")
+
+
+def _legacy_session(user_id: str, module_id: str, compiled) -> dict:
+    """The previous dict-of-dicts session shape, fully answered"""
+    session = {
+        "id": f"session_{uuid.uuid4().hex[:12]}",
+        "user_id": user_id,
+        "module_id": module_id,
+        "started_at": datetime.utcnow().isoformat(),
+        "completed_at": None,
+        "status": "active",
+        "questions_answered": 0,
+        "correct_answers": 0,
+        "current_score": 0,
+        "answers": {},
+    }
+    for idx, question_id in enumerate(compiled.question_ids):
+        session["answers"][question_id] = {
+            "selected": compiled.answer_key[idx],
+            "correct": True,
+            "points": compiled.points[idx],
+        }
+        session["questions_answered"] += 1
+        session["correct_answers"] += 1
+        session["current_score"] += compiled.points[idx]
+    return session
+
+
+def bench_session_memory(args: argparse.Namespace) -> None:
+    """Memory per fully-answered session: legacy dicts vs __slots__ + bitmasks"""
+    store = LearningStore()
+    module_id = next(iter(store.modules))
+    compiled = store.get_compiled_module(module_id)
+
+    def measure(build) -> float:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        keep = [build(i) for i in range(args.sessions)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del keep
+        return (after - before) / args.sessions
+
+    def compact(i: int) -> LearningSession:
+        session = LearningSession(
+            f"session_{uuid.uuid4().hex[:12]}", f"user-{i}", module_id,
+            compiled.question_count, time.time()
+        )
+        for idx in range(compiled.question_count):
+            session.record_answer(idx, compiled.answer_key[idx], True, compiled.points[idx])
+        return session
+
+    legacy = measure(lambda i: _legacy_session(f"user-{i}", module_id, compiled))
+    slots = measure(compact)
+    print(f"Bytes per session ({args.sessions:,} sessions, {compiled.question_count} answers each):")
+    print(f"  legacy dict sessions        {legacy:>8.0f} B")
+    print(f"  __slots__ + bitmask         {slots:>8.0f} B   ({legacy / slots:.1f}x smaller)")
+
+
+def bench_module_search(args: argparse.Namespace) -> None:
+    """Query latency over a catalog inflated to --modules by cloning real modules"""
+    base = list(LearningStore().modules.values())
+    modules = {}
+    for i in range(args.modules):
+        m = base[i % len(base)]
+        modules[f"{m['id']}-{i}"] = dict(m, id=f"{m['id']}-{i}")
+
+    start = time.perf_counter()
+    index = ModuleSearchIndex(modules)
+    print(f"Indexed {len(modules):,} modules ({len(index.vocabulary):,} terms) "
+          f"in {(time.perf_counter() - start) * 1e3:.1f} ms")
+    for query in ("neural", "quantum comp", "blockchain cryptography", "integ"):
+        _report(f"search {query!r}", _timed(lambda: index.search(query), args.iterations))
+
+
+def _quiz_timings(store: LearningStore, learners: int) -> dict[str, list[float]]:
+    """Per-operation latency of the full quiz flow, one learner per iteration"""
+    module_id = next(iter(store.modules))
+    compiled = store.get_compiled_module(module_id)
+    timings: dict[str, list[float]] = {"create": [], "answer": [], "complete": []}
+
+    def timed(op: str, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[op].append((time.perf_counter() - start) * 1e6)
+        return result
+
+    run = uuid.uuid4().hex[:6]
+    for i in range(learners):
+        user_id = f"bench-{run}-{i}"
+        session = timed("create", lambda: store.create_session(user_id, module_id))
+        for idx, question_id in enumerate(compiled.question_ids):
+            timed("answer", lambda: store.submit_answer(session.id, question_id, compiled.answer_key[idx]))
+        timed("complete", lambda: store.record_session_completion(
+            session.id, user_id, module_id, 1.0, 10, 50, 5
+        ))
+    return timings
+
+
+def bench_store_backends(args: argparse.Namespace) -> None:
+    """In-memory vs event-sourced vs SQLite vs sharded (vs Postgres, with DATABASE_URL) store on the quiz flow"""
+    from multiprocessing import Process
+
+    from app.services.event_sourced_store import EventSourcedLearningStore
+
+    from app.services.sharded_learning_store import ShardedLearningStore
+    from app.services.sharding import ShardRouter, serve_shard
+    from app.services.sqlite_learning_store import SqliteLearningStore
+
+    scratch = tempfile.TemporaryDirectory()
+    shards = [
+        Process(target=serve_shard, args=(index, 2, scratch.name, b"bench"), daemon=True)
+        for index in range(2)
+    ]
+    for shard in shards:
+        shard.start()
+    time.sleep(1)  # let the shards bind their sockets
+
+    backends = [
+        ("memory", LearningStore()),
+        ("events", EventSourcedLearningStore(str(Path(scratch.name) / "events.jsonl"))),
+        ("sqlite", SqliteLearningStore(str(Path(scratch.name) / "bench.db"))),
+        ("sharded", ShardedLearningStore(ShardRouter(scratch.name, 2, b"bench"))),
+    ]
+    if os.getenv("DATABASE_URL"):
+        from app.services.pg_learning_store import PostgresLearningStore
+
+        backends.append(("postgres", PostgresLearningStore.from_env()))
+    for name, store in backends:
+        print(f"{name} ({args.iterations:,} learners):")
+        for op, samples in _quiz_timings(store, args.iterations).items():
+            _report(op, samples)
+    for name, store in backends:
+        if name in ("events", "sqlite", "postgres"):
+            store.close()
+    for shard in shards:
+        shard.terminate()
+    scratch.cleanup()
+
+
+async def _legacy_complete(
+    store, minting, ledger, session_id: str, user_id: str, accuracy: float = 1.0, minutes: int = 10
+) -> None:
+    """The completion endpoint before SessionCompleter: one store call per step, client-sent stats"""
+    from app.receipts import create_mint_receipt
+
+    session = store.get_session(session_id)
+    module = store.get_module(session.module_id)
+    is_first_completion = not store.has_completed_module(user_id, module.id)
+    progress = store.get_user_progress(user_id)
+    reward = minting.calculate_reward(
+        base_reward=module.mic_reward,
+        accuracy=accuracy,
+        integrity_score=progress.get("integrity_score", 0.85),
+        difficulty=module.difficulty.value,
+        streak_days=progress.get("current_streak", 0),
+        is_perfect_score=accuracy >= 1.0,
+        is_first_completion=is_first_completion
+    )
+    create_mint_receipt(
+        subject_id=user_id, session_id=session_id, module_id=module.id,
+        minted_mic=reward["mic_earned"], accuracy=accuracy,
+        integrity_score=progress.get("integrity_score", 0.85), gii=reward.get("gii", 0.92)
+    )
+    await minting.mint_reward(
+        user_id=user_id, module_id=module.id, session_id=session_id, mic_amount=reward["mic_earned"],
+        accuracy=accuracy, integrity_score=progress.get("integrity_score", 0.85)
+    )
+    store.complete_session(session_id)
+    xp = store.calculate_xp(accuracy, module.difficulty.value, minutes)
+    updated = store.update_user_progress(user_id, reward["mic_earned"], xp, minutes)
+    store.record_completion(user_id, module.id, accuracy, reward["mic_earned"])
+    store.check_and_award_badges(user_id, module.id, accuracy, updated["modules_completed"] == 1)
+    ledger.get_balance(user_id)
+
+
+def bench_completion(args: argparse.Namespace) -> None:
+    """Per-completion latency: the old step-by-step endpoint vs SessionCompleter, inline and pipelined"""
+    from multiprocessing import Process
+
+    from app.services.mic_ledger_store import mic_ledger_store
+    from app.services.mic_minting import MICMintingService
+    from app.services.mint_queue import MintQueue
+    from app.services.post_completion import PostCompletionQueue
+    from app.services.session_completion import SessionCompleter
+    from app.services.sharded_learning_store import ShardedLearningStore
+    from app.services.sharding import ShardRouter, serve_shard
+
+    scratch = tempfile.TemporaryDirectory()
+    shards = [
+        Process(target=serve_shard, args=(index, 2, scratch.name, b"bench"), daemon=True)
+        for index in range(2)
+    ]
+    for shard in shards:
+        shard.start()
+    time.sleep(1)  # let the shards bind their sockets
+
+    minting = MICMintingService()
+    minting.gii_override = "0.96"
+    backends = [
+        ("memory", LearningStore()),
+        ("sharded", ShardedLearningStore(ShardRouter(scratch.name, 2, b"bench"))),
+    ]
+
+    async def run(store, complete, pipeline=None) -> list[float]:
+        if pipeline is not None:
+            pipeline.start()
+        module_id = next(iter(store.modules))
+        run_id = uuid.uuid4().hex[:6]
+        samples = []
+        for i in range(args.iterations):
+            user_id = f"bench-{run_id}-{i}"
+            session = store.create_session(user_id, module_id)
+            compiled = store.get_session_compiled(session)
+            store.submit_answers(session.id, list(zip(compiled.question_ids, compiled.answer_key)))
+            start = time.perf_counter()
+            await complete(session.id, user_id)
+            samples.append((time.perf_counter() - start) * 1e6)
+            await asyncio.sleep(0)  # let pipeline workers run between requests, as a server would
+        if pipeline is not None:
+            await pipeline.stop()
+        return samples
+
+    for name, store in backends:
+        print(f"{name} ({args.iterations:,} completions):")
+        _report("step-by-step", asyncio.run(run(
+            store, lambda sid, uid: _legacy_complete(store, minting, mic_ledger_store, sid, uid)
+        )))
+        inline = SessionCompleter(store, minting, mic_ledger_store, MintQueue(minting), PostCompletionQueue())
+        _report("unit of work, inline", asyncio.run(run(store, inline.complete)))
+        pipeline = PostCompletionQueue()
+        deferred = SessionCompleter(store, minting, mic_ledger_store, MintQueue(minting), pipeline)
+        _report("unit of work, pipelined", asyncio.run(run(store, deferred.complete, pipeline)))
+    for shard in shards:
+        shard.terminate()
+    scratch.cleanup()
+
+
+def bench_progress_tiers(args: argparse.Namespace) -> None:
+    """Progress memory (dict vs __slots__, unknown-user reads) and read latency per tier"""
+    from app.services.progress_tiers import UserProgress
+
+    def measure(build) -> float:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        keep = [build(i) for i in range(args.iterations)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del keep
+        return (after - before) / args.iterations
+
+    legacy = measure(lambda i: {**UserProgress(f"user-{i}").to_dict(), "experience_points": i})
+    slots = measure(lambda i: UserProgress(f"user-{i}", experience_points=i))
+    print(f"Bytes per progress record ({args.iterations:,} users):")
+    print(f"  dict                        {legacy:>8.0f} B")
+    print(f"  __slots__                   {slots:>8.0f} B   ({legacy / slots:.1f}x smaller)")
+
+    hot_users = max(1, args.iterations // 10)
+    with tempfile.TemporaryDirectory() as scratch:
+        store = LearningStore(progress_hot_users=hot_users, progress_spill_path=f"{scratch}/spill.sqlite3")
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(args.iterations):
+            store.get_user_progress(f"crawler-{i}")
+        grown = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print(f"  {args.iterations:,} unknown-user reads grew memory by {grown:,} B")
+
+        for i in range(args.iterations):
+            store.update_user_progress(f"user-{i}", 10, 50, 5)
+        metrics = store.get_progress_metrics()
+        print(f"Tiers after {args.iterations:,} writers (hot capacity {hot_users:,}):")
+        print(f"  hot {metrics['hot_users']:,} users, ~{metrics['estimated_hot_bytes']:,} B; "
+              f"cold {metrics['cold_users']:,} users, {metrics['cold_bytes']:,} B on disk")
+        reads = min(args.iterations, 10_000)
+        hot = [f"user-{args.iterations - 1 - i % hot_users}" for i in range(reads)]
+        cold = [f"user-{i % (args.iterations - hot_users or 1)}" for i in range(reads)]
+        for label, ids in (("hot read", hot), ("cold read", cold), ("unknown read", [f"nobody-{i}" for i in range(reads)])):
+            it = iter(ids)
+            _report(label, _timed(lambda: store.get_user_progress(next(it)), reads))
+
+
+BENCHMARKS = {
+    "session-start": bench_session_start,
+    "session-churn": bench_session_churn,
+    "session-memory": bench_session_memory,
+    "module-search": bench_module_search,
+    "store-backends": bench_store_backends,
+    "completion": bench_completion,
+    "progress-tiers": bench_progress_tiers,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--modules", type=int, default=1000)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Quiz transport load test: REST answer POSTs vs the WebSocket quiz protocol
+
+Simulates a classroom of learners taking the same module concurrently
+against a running API, once per transport, and reports per-answer latency
+and overall answer throughput.
+
+Usage:
+    uvicorn app.main:app --port 8000 &
+    python scripts/loadtest_quiz_transport.py --base-url http://127.0.0.1:8000 --learners 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+import websockets
+
+
+def _summary(label: str, latencies: list, elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+    print(f"  {label:<10} answers {len(latencies):>7,}   {len(latencies) / elapsed:>9,.0f}/s   "
+          f"median {statistics.median(latencies) * 1e3:>7.2f} ms   p99 {p99 * 1e3:>7.2f} ms")
+
+
+async def _rest_learner(client: httpx.AsyncClient, module_id: str, answers: list, latencies: list) -> None:
+    res = await client.post("/api/learning/session/start", json={
+        "module_id": module_id, "user_id": f"load-{uuid.uuid4().hex[:10]}",
+    })
+    res.raise_for_status()
+    session_id = res.json()["session_id"]
+    for question_id, selected in answers:
+        start = time.perf_counter()
+        res = await client.post(f"/api/learning/session/{session_id}/answer", json={
+            "question_id": question_id, "selected_answer": selected,
+        })
+        res.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def _ws_learner(ws_url: str, module_id: str, answers: list, latencies: list) -> None:
+    url = f"{ws_url}/ws/learning/quiz?user_id=load-{uuid.uuid4().hex[:10]}&module_id={module_id}"
+    async with websockets.connect(url) as ws:
+        ready = json.loads(await ws.recv())
+        assert ready[0] == "ready", ready
+        for question_id, selected in answers:
+            start = time.perf_counter()
+            await ws.send(json.dumps(["a", question_id, selected], separators=(",", ":")))
+            reply = json.loads(await ws.recv())
+            assert reply[0] == "r", reply
+            latencies.append(time.perf_counter() - start)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        module = (await client.get(f"/api/learning/modules/{args.module_id}")).json()
+    answers = [(q["id"], q["correct_answer"]) for q in module["questions"]]
+    ws_url = args.base_url.replace("http", "ws", 1)
+    print(f"{args.learners} learners x {len(answers)} answers on {args.module_id}")
+
+    limits = httpx.Limits(max_connections=args.learners)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30, limits=limits) as client:
+        latencies: list = []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _rest_learner(client, args.module_id, answers, latencies) for _ in range(args.learners)
+        ))
+        _summary("REST", latencies, time.perf_counter() - start)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _ws_learner(ws_url, args.module_id, answers, latencies) for _ in range(args.learners)
+    ))
+    _summary("WebSocket", latencies, time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--learners", type=int, default=200)
+    parser.add_argument("--module-id", default="constitutional-ai-101")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Per-user day bitmap — streaks, rolling counts and heatmaps."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.activity_bitmap import SECONDS_PER_DAY, ActivityBitmap
+from app.services.learning_store import LearningStore
+
+client = TestClient(app)
+
+
+def test_streaks_and_windows():
+    activity = ActivityBitmap()
+    for day in (100, 101, 102, 105, 106, 98):
+        activity.mark(day)
+
+    assert activity.base_day == 98 and activity.last_day == 106
+    assert activity.streak_ending(102) == 3
+    assert activity.streak_ending(103) == 0
+    assert activity.current_streak(107) == 2  # yesterday's run is still alive
+    assert activity.current_streak(108) == 0
+    assert activity.longest_streak() == 3
+    assert activity.active_days(106, 7) == 5
+    assert activity.heatmap(106, 10) == "0101110011"
+
+
+def test_store_streak_follows_clock():
+    clock = [10_000 * SECONDS_PER_DAY + 3_600]
+    store = LearningStore(clock=lambda: clock[0])
+    for _ in range(3):
+        progress = store.update_user_progress("u1", mic_earned=0, xp_earned=0, minutes_spent=5)
+        clock[0] += SECONDS_PER_DAY
+    assert progress["current_streak"] == 3
+
+    clock[0] += 2 * SECONDS_PER_DAY
+    progress = store.update_user_progress("u1", mic_earned=0, xp_earned=0, minutes_spent=5)
+    assert progress["current_streak"] == 1 and progress["longest_streak"] == 3
+
+    activity = store.get_user_activity("u1", days=7)
+    assert activity["heatmap"] == "0111001"
+    assert activity["active_last_7_days"] == 4
+
+
+def test_activity_endpoint():
+    res = client.get("/api/learning/users/nobody/activity", params={"days": 30})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["heatmap"] == "0" * 30 and data["current_streak"] == 0
+    assert client.get("/api/learning/users/nobody/activity", params={"days": 0}).status_code == 422
@@ -0,0 +1,80 @@
+"""Badge rules compile into a trigger-indexed plan and award from data."""
+
+import pytest
+
+from app.services.badge_rules import BadgeContext, compile_badge_plan, load_badges
+from app.services.learning_store import LearningStore
+
+
+def _plan(badges):
+    bits = {}
+    return compile_badge_plan(badges, lambda mid: bits.setdefault(mid, 1 << len(bits))), bits
+
+
+def _ctx(module_id="m1", accuracy=0.5, first=False, mask=0, mic=0, streak=0):
+    return BadgeContext(module_id, accuracy, first, mask, mic, streak)
+
+
+def test_completion_only_evaluates_rules_it_can_affect():
+    badges = {
+        "m1-ace": {"id": "m1-ace", "rule": {"type": "module_accuracy", "module": "m1", "min_accuracy": 0.9}},
+        "m2-ace": {"id": "m2-ace", "rule": {"type": "module_accuracy", "module": "m2", "min_accuracy": 0.9}},
+        "pair": {"id": "pair", "rule": {"type": "modules_completed", "modules": ["m1", "m2"]}},
+        "rich": {"id": "rich", "rule": {"type": "mic_total", "min_mic": 100}},
+        "streak": {"id": "streak", "rule": {"type": "streak", "min_days": 3}},
+        "plain": {"id": "plain"},
+    }
+    plan, bits = _plan(badges)
+
+    candidates = {r.badge_id for r in plan.candidates(_ctx("m1", mic=50))}
+    assert candidates == {"m1-ace", "pair"}
+    assert plan.evaluate(_ctx("m1", accuracy=0.95, mask=bits["m1"]), owned=set()) == ["m1-ace"]
+
+    both = bits["m1"] | bits["m2"]
+    assert plan.evaluate(_ctx("m2", mask=both, mic=100, streak=3), owned={"m1-ace"}) == [
+        "pair", "rich", "streak"
+    ]
+    assert plan.evaluate(_ctx("m2", mask=both, mic=100, streak=3), owned={"pair", "rich", "streak"}) == []
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        _plan({"x": {"id": "x", "rule": {"type": "moon_phase"}}})
+    with pytest.raises(ValueError):
+        _plan({"x": {"id": "x", "rule": {"type": "mic_total"}}})
+
+
+def test_store_awards_badges_from_data_file():
+    assert "constitutional-scholar" in load_badges()
+
+    store = LearningStore()
+    store.record_completion("u1", "constitutional-ai-101", accuracy=1.0, mic_earned=0)
+    awarded = store.check_and_award_badges("u1", "constitutional-ai-101", 1.0, is_first_module=True)
+    assert [b.id for b in awarded] == ["first-module", "perfect-score", "constitutional-scholar"]
+    assert store.check_and_award_badges("u1", "constitutional-ai-101", 1.0, is_first_module=False) == []
+
+
+def test_deferred_mint_awards_the_mic_thresholds_it_crosses(tmp_path):
+    from app.services.event_sourced_store import EventSourcedLearningStore
+    from app.services.sqlite_learning_store import SqliteLearningStore
+
+    path = str(tmp_path / "state.db")
+    sqlite_store = SqliteLearningStore(path, flush_seconds=0)
+    try:
+        for store in (LearningStore(), EventSourcedLearningStore(), sqlite_store):
+            # the completion was credited with 0 MIC while its mint was deferred
+            store.credit_session_completion("u1", "constitutional-ai-101", 0.5, 0, 10, 3)
+            assert "mic-centurion" not in store.user_badges["u1"]
+
+            assert store.record_deferred_mint("u1", "constitutional-ai-101", 60) == []
+            awarded = store.record_deferred_mint("u1", "constitutional-ai-101", 60)
+            assert [b.id for b in awarded] == ["mic-centurion"]
+            assert store.record_deferred_mint("u1", "constitutional-ai-101", 60) == []
+            assert store.user_badges["u1"].count("mic-centurion") == 1
+
+        # written to the database, not just the worker's cache
+        reader = SqliteLearningStore(path)
+        assert "mic-centurion" in {b.id for b in reader.get_user_badges("u1")}
+        reader.close()
+    finally:
+        sqlite_store.close()
@@ -0,0 +1,103 @@
+"""Pre-encoded module responses — ETags, compression and per-user overlays."""
+
+import gzip
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.catalog_responses import CatalogResponseCache
+from app.services.learning_store import LearningStore, learning_store
+
+client = TestClient(app)
+
+MODULE_ID = "constitutional-ai-101"
+
+
+def test_module_list_matches_model_and_revalidates():
+    res = client.get("/api/learning/modules", headers={"Accept-Encoding": "identity"})
+    assert res.status_code == 200
+    modules = learning_store.get_modules()
+    assert res.json()["total"] == len(modules)
+    assert [m["id"] for m in res.json()["modules"]] == [m.id for m in modules]
+
+    etag = res.headers["etag"]
+    assert client.get("/api/learning/modules", headers={"If-None-Match": etag}).status_code == 304
+
+    zipped = client.get("/api/learning/modules", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] != etag
+    assert client.get("/api/learning/modules", headers={"If-None-Match": zipped.headers["etag"]}).status_code == 304
+
+
+def test_module_detail_is_cached_bytes():
+    res = client.get(f"/api/learning/modules/{MODULE_ID}")
+    assert res.status_code == 200
+    assert res.json() == json.loads(learning_store.get_module(MODULE_ID).model_dump_json())
+    assert client.get("/api/learning/modules/missing").status_code == 404
+
+
+def test_user_completion_overlay():
+    store = LearningStore()
+    cache = CatalogResponseCache(store)
+    anonymous = cache.module_list()
+    assert cache.module_list(user_id="fresh-user") is anonymous
+
+    store.record_completion("u1", MODULE_ID, accuracy=1.0, mic_earned=10)
+    overlaid = cache.module_list(user_id="u1")
+    assert overlaid.etag != anonymous.etag
+    entries = {m["id"]: m for m in json.loads(overlaid.body)["modules"]}
+    assert entries[MODULE_ID]["completed"] and entries[MODULE_ID]["progress"] == 1.0
+    assert not any(m["completed"] for mid, m in entries.items() if mid != MODULE_ID)
+    assert json.loads(gzip.decompress(anonymous.gzip)) == json.loads(anonymous.body)
+
+
+def test_new_catalog_version_invalidates(tmp_path):
+    module = LearningStore().modules[MODULE_ID]
+    catalog = tmp_path / "catalog.json"
+    catalog.write_text(json.dumps({"packs": {"core": [module]}}))
+    store = LearningStore(catalog_path=str(catalog))
+    cache = CatalogResponseCache(store)
+    before = cache.module_detail(MODULE_ID)
+
+    catalog.write_text(json.dumps({"packs": {"core": [dict(module, title="Renamed")]}}))
+    os.utime(catalog, (2_000, 2_000))
+    store.reload_catalog()
+    after = cache.module_detail(MODULE_ID)
+    assert after.etag.startswith('"v2-') and not after.matches(before.etag)
+    assert json.loads(after.body)["title"] == "Renamed"
+
+
+def test_pages_are_windows_of_presorted_views():
+    cache = CatalogResponseCache(LearningStore())
+    everything = json.loads(cache.module_list(sort="order", page_size=100).body)["modules"]
+    orders = [m["id"] for m in everything]
+
+    first = json.loads(cache.module_list(sort="order", page=1, page_size=7).body)
+    third = json.loads(cache.module_list(sort="order", page=3, page_size=7).body)
+    assert [m["id"] for m in first["modules"]] == orders[:7]
+    assert [m["id"] for m in third["modules"]] == orders[14:21]
+    assert first["total"] == len(orders) and first["page_size"] == 7
+
+    last_first = json.loads(cache.module_list(sort="order", descending=True, page_size=5).body)
+    assert [m["id"] for m in last_first["modules"]] == orders[::-1][:5]
+
+    beyond = json.loads(cache.module_list(page=50, page_size=10).body)
+    assert beyond["modules"] == [] and beyond["total"] == len(orders)
+
+
+def test_filters_and_sorts():
+    res = client.get("/api/learning/modules", params={
+        "topic": "mathematics", "difficulty": "intermediate", "sort": "-estimated_minutes",
+    })
+    assert res.status_code == 200
+    modules = res.json()["modules"]
+    assert modules and all("Mathematics" in m["topics"] and m["difficulty"] == "intermediate" for m in modules)
+    minutes = [m["estimated_minutes"] for m in modules]
+    assert minutes == sorted(minutes, reverse=True)
+
+    ranked = [m["difficulty"] for m in client.get("/api/learning/modules", params={"sort": "difficulty"}).json()["modules"]]
+    assert ranked == sorted(ranked, key=["beginner", "intermediate", "advanced"].index)
+    assert client.get("/api/learning/modules", params={"sort": "title"}).status_code == 422
+    assert client.get("/api/learning/modules", params={"page_size": 500}).status_code == 422
@@ -0,0 +1,71 @@
+"""Learning session HTTP endpoints."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.learning_store import learning_store
+
+client = TestClient(app)
+
+
+def test_batch_answer_endpoint():
+    session = learning_store.create_session("batch-user", "constitutional-ai-101")
+    key = learning_store.get_session_compiled(session).answer_key
+    res = client.post(
+        f"/api/learning/session/{session.id}/answers",
+        json={"answers": [
+            {"question_id": "q1", "selected_answer": key[0]},
+            {"question_id": "q2", "selected_answer": key[1]},
+        ]},
+    )
+    assert res.status_code == 200
+    data = res.json()
+    assert [r["correct"] for r in data["results"]] == [True, True]
+    assert data["questions_remaining"] == 1
+
+    again = client.post(
+        f"/api/learning/session/{session.id}/answers",
+        json={"answers": [{"question_id": "q2", "selected_answer": 0}]},
+    )
+    assert again.status_code == 400
+    assert client.post(f"/api/learning/session/{session.id}/answers", json={"answers": []}).status_code == 422
+
+
+def test_quiz_socket_streams_answers_and_pins_session():
+    url = "/ws/learning/quiz?user_id=ws-user&module_id=constitutional-ai-101"
+    with client.websocket_connect(url) as ws:
+        ready = json.loads(ws.receive_text())
+        assert ready[0] == "ready" and ready[3] == ["q1", "q2", "q3"] and ready[4] == 0
+        session = learning_store.get_session(ready[1])
+        key = learning_store.get_session_compiled(session).answer_key
+        assert learning_store.get_session_metrics()["pinned_sessions"] >= 1
+
+        ws.send_text(json.dumps(["a", "q1", key[0]]))
+        assert json.loads(ws.receive_text()) == ["r", "q1", 1, 10, 10, 2]
+        ws.send_text(json.dumps(["a", "q1", key[0]]))
+        assert json.loads(ws.receive_text())[:2] == ["e", "rejected"]
+        ws.send_text(json.dumps(["b", [["q2", key[1]], ["q3", key[2]]]]))
+        assert json.loads(ws.receive_text()) == ["rb", [["q2", 1, 15], ["q3", 1, 20]], 45, 0]
+        ws.send_text("[\"x\"]")
+        assert json.loads(ws.receive_text())[:2] == ["e", "bad_frame"]
+
+    assert session.id not in learning_store._pinned_sessions
+    with client.websocket_connect(url) as ws:
+        assert json.loads(ws.receive_text())[1:2] == [session.id]  # resumed
+
+
+def test_quiz_socket_unknown_module():
+    with client.websocket_connect("/ws/learning/quiz?user_id=ws-user&module_id=missing") as ws:
+        assert json.loads(ws.receive_text())[:2] == ["e", "not_found"]
+
+
+def test_starting_again_resumes_the_active_session():
+    body = {"user_id": "resume-user", "module_id": "constitutional-ai-101"}
+    first = client.post("/api/learning/session/start", json=body)
+    assert first.status_code == 200
+    again = client.post("/api/learning/session/start", json=body)
+    assert again.status_code == 200
+    assert again.json()["session_id"] == first.json()["session_id"]
+    assert again.json()["start_time"] == first.json()["start_time"]
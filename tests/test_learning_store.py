@@ -0,0 +1,208 @@
+"""LearningStore session, answer and progress behaviour."""
+
+from app.services.learning_store import LearningStore
+
+MODULE_ID = "constitutional-ai-101"
+
+
+def test_active_session_index_follows_lifecycle():
+    store = LearningStore()
+    session = store.create_session("u1", MODULE_ID)
+
+    assert store.get_active_session("u1", MODULE_ID) is session
+    assert store.get_active_session("u2", MODULE_ID) is None
+    assert store.get_user_sessions("u1", status="active") == [session]
+
+    store.complete_session(session.id)
+    assert store.get_active_session("u1", MODULE_ID) is None
+    assert store.get_user_sessions("u1") == [session]
+
+    retry = store.create_session("u1", MODULE_ID)
+    assert store.get_active_session("u1", MODULE_ID) is retry
+
+    store.abandon_session(retry.id)
+    assert retry.status == "abandoned"
+    assert store.get_active_session("u1", MODULE_ID) is None
+    assert store.abandon_session(retry.id) is None
+
+
+def test_idle_sessions_are_abandoned_and_evicted(tmp_path):
+    cold = tmp_path / "sessions.jsonl"
+    clock = [1_000.0]
+    store = LearningStore(session_ttl_seconds=60, cold_storage_path=str(cold), clock=lambda: clock[0])
+    idle = store.create_session("u1", MODULE_ID)
+    busy = store.create_session("u2", MODULE_ID)
+
+    # busy keeps answering until just before the sweep
+    clock[0] = 1_050.0
+    store.submit_answer(busy.id, "q1", 1)
+
+    assert store.sweep_expired_sessions(now=1_061.0) == 1
+    assert store.get_session(idle.id) is None
+    assert store.get_active_session("u1", MODULE_ID) is None
+    assert store.get_user_sessions("u1") == []
+    assert store.get_session(busy.id) is busy
+
+    archived = cold.read_text().splitlines()
+    assert len(archived) == 1 and '"status":"abandoned"' in archived[0]
+
+    assert store.sweep_expired_sessions(now=1_111.0) == 1
+    metrics = store.get_session_metrics()
+    assert metrics["resident_sessions"] == 0
+    assert metrics["expiry_heap_size"] == 0
+    assert metrics["abandoned_total"] == 2
+    assert metrics["evicted_total"] == 2
+
+
+def test_submit_answer_uses_compiled_answer_key():
+    store = LearningStore()
+    compiled = store.get_compiled_module(MODULE_ID)
+    assert compiled.question_ids == ("q1", "q2", "q3")
+    assert store.get_max_score(MODULE_ID) == 45
+
+    session = store.create_session("u1", MODULE_ID)
+    right = store.submit_answer(session.id, "q2", compiled.answer_key[1])
+    assert right["correct"] and right["points_earned"] == 15
+    assert right["questions_remaining"] == 2
+
+    wrong = store.submit_answer(session.id, "q1", (compiled.answer_key[0] + 1) % 4)
+    assert not wrong["correct"] and wrong["cumulative_score"] == 15
+
+    assert store.submit_answer(session.id, "q1", 0) is None
+    assert store.submit_answer(session.id, "missing", 0) is None
+
+
+def test_compiled_module_pickles_by_value():
+    import pickle
+
+    compiled = LearningStore().get_compiled_module(MODULE_ID)
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert restored == compiled
+    assert restored.question_index["q3"] == 2
+
+
+def test_session_serializes_to_legacy_dict_shape():
+    store = LearningStore()
+    session = store.create_session("u1", MODULE_ID)
+    store.submit_answer(session.id, "q1", 1)
+    store.submit_answer(session.id, "q3", 0)
+
+    data = session.to_dict(store.get_compiled_module(MODULE_ID))
+    assert data["status"] == "active"
+    assert data["questions_answered"] == 2
+    assert data["correct_answers"] == 1
+    assert data["current_score"] == 10
+    assert data["answers"] == {
+        "q1": {"selected": 1, "correct": True, "points": 10},
+        "q3": {"selected": 0, "correct": False, "points": 0},
+    }
+
+
+def test_catalog_loads_lazily_from_data_file(tmp_path):
+    import json
+
+    catalog = tmp_path / "catalog.json"
+    module = dict(LearningStore().modules[MODULE_ID], id="custom-101")
+    catalog.write_text(json.dumps({"packs": {"custom": [module]}}))
+
+    store = LearningStore(catalog_path=str(catalog))
+    assert store._catalog is None
+    assert list(store.modules) == ["custom-101"]
+    assert store.get_compiled_module("custom-101").total_points == 45
+
+
+def test_reload_swaps_catalog_and_pins_sessions(tmp_path):
+    import json
+    import os
+
+    module = LearningStore().modules[MODULE_ID]
+    catalog = tmp_path / "catalog.json"
+    catalog.write_text(json.dumps({"packs": {"core": [module]}}))
+    store = LearningStore(catalog_path=str(catalog), session_ttl_seconds=60, clock=lambda: 1_000.0)
+
+    pinned = store.create_session("u1", MODULE_ID)
+    assert store.reload_catalog() is None  # unchanged source
+
+    # Drop q3 and flip q1's answer key in version 2
+    edited = dict(module, questions=[dict(module["questions"][0], correct_answer=0),
+                                     module["questions"][1]])
+    catalog.write_text(json.dumps({"packs": {"core": [edited]}}))
+    os.utime(catalog, (2_000, 2_000))
+    assert store.reload_catalog() == 2
+    assert store.catalog.version == 2
+    assert store.get_max_score(MODULE_ID) == 25
+
+    # The in-flight session still scores against version 1
+    assert store.submit_answer(pinned.id, "q1", 1)["correct"]
+    assert store.submit_answer(pinned.id, "q3", 0) is not None
+    fresh = store.create_session("u2", MODULE_ID)
+    assert fresh.catalog_version == 2
+    assert store.submit_answer(fresh.id, "q1", 0)["correct"]
+    assert store.get_catalog_info()["pinned_versions"] == {1: 1, 2: 1}
+
+    # Version 1 is released once its last session is evicted
+    store.sweep_expired_sessions(now=2_000.0)
+    assert store.get_catalog_info()["pinned_versions"] == {}
+    assert set(store._catalog_versions) == {2}
+
+    catalog.write_text("{not json")
+    os.utime(catalog, (3_000, 3_000))
+    assert store.reload_catalog() is None
+    assert store.catalog.version == 2
+    assert store.get_catalog_info()["reload_errors"] == 1
+
+
+def test_completion_bitset_drives_group_badges():
+    store = LearningStore()
+    math = ("calculus-fundamentals", "linear-algebra-ml", "probability-statistics-ai")
+
+    for module_id in math[:2]:
+        store.record_completion("u1", module_id, accuracy=0.8, mic_earned=0)
+        assert "math-master" not in [
+            b.id for b in store.check_and_award_badges("u1", module_id, 0.8, is_first_module=False)
+        ]
+    assert store.has_completed_module("u1", math[0])
+    assert not store.has_completed_module("u1", math[2])
+    assert not store.has_completed_module("u1", "unknown-module")
+
+    store.record_completion("u1", math[2], accuracy=0.8, mic_earned=0)
+    awarded = store.check_and_award_badges("u1", math[2], 0.8, is_first_module=False)
+    assert [b.id for b in awarded] == ["math-master"]
+    assert store.get_completed_module_ids("u1") == set(math)
+    assert {m.id for m in store.get_modules(user_id="u1") if m.completed} == set(math)
+
+
+def test_batch_answers_apply_atomically():
+    store = LearningStore()
+    compiled = store.get_compiled_module(MODULE_ID)
+    session = store.create_session("u1", MODULE_ID)
+
+    # q1 repeated: nothing is recorded
+    assert store.submit_answers(session.id, [("q1", 0), ("q2", 0), ("q1", 1)]) is None
+    assert session.questions_answered == 0
+
+    result = store.submit_answers(
+        session.id, [("q1", compiled.answer_key[0]), ("q3", (compiled.answer_key[2] + 1) % 4)]
+    )
+    assert [r["correct"] for r in result["results"]] == [True, False]
+    assert result["cumulative_score"] == 10
+    assert result["questions_remaining"] == 1
+
+    # q3 already answered: rejected without recording q2
+    assert store.submit_answers(session.id, [("q2", 0), ("q3", 0)]) is None
+    assert not session.is_answered(1)
+
+
+def test_pinned_sessions_survive_sweeps():
+    clock = [1_000.0]
+    store = LearningStore(session_ttl_seconds=60, clock=lambda: clock[0])
+    session = store.create_session("u1", MODULE_ID)
+    assert store.pin_session(session.id)
+
+    assert store.sweep_expired_sessions(now=2_000.0) == 0
+    assert store.get_session(session.id) is session
+
+    clock[0] = 2_000.0
+    store.unpin_session(session.id)  # idle TTL restarts from the release
+    assert store.sweep_expired_sessions(now=2_030.0) == 0
+    assert store.sweep_expired_sessions(now=2_061.0) == 1
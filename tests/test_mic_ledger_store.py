@@ -0,0 +1,65 @@
+"""MICLedgerStore paging, and Postgres row mapping."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models.learning import MICReason
+from app.services.mic_ledger_store import MICLedgerStore, ledger_cursor, parse_ledger_cursor
+from app.services.pg_mic_ledger_store import PREPARED_STATEMENTS, _entry_from_row
+from app.services.pg_pool import execute_sql
+
+
+def test_cursor_pages_walk_history_newest_first():
+    store = MICLedgerStore()
+    for amount in range(1, 8):
+        store.append_entry("u1", float(amount), MICReason.LEARN, 0.9)
+    store.append_entry("u2", 100.0, MICReason.BONUS, 0.9)
+
+    amounts, cursor = [], None
+    while True:
+        entries, cursor = store.get_ledger_page("u1", limit=3, cursor=cursor)
+        amounts.append([e.amount for e in entries])
+        if cursor is None:
+            break
+    assert amounts == [[7.0, 6.0, 5.0], [4.0, 3.0, 2.0], [1.0]]
+
+    # Offset paging agrees with cursor paging
+    _, offset_page = store.get_ledger("u1", limit=3, offset=3)
+    first, cursor = store.get_ledger_page("u1", limit=3)
+    assert [e.id for e in store.get_ledger_page("u1", limit=3, cursor=cursor)[0]] == [e.id for e in offset_page]
+
+
+def test_cursor_must_belong_to_the_user():
+    store = MICLedgerStore()
+    other = store.append_entry("u2", 5.0, MICReason.LEARN, 0.9)
+    store.append_entry("u1", 5.0, MICReason.LEARN, 0.9)
+
+    with pytest.raises(ValueError):
+        store.get_ledger_page("u1", cursor=ledger_cursor(other))
+    with pytest.raises(ValueError):
+        store.get_ledger_page("u1", cursor="not-a-cursor")
+    assert parse_ledger_cursor(ledger_cursor(other))[1] == other.id
+
+
+def test_postgres_rows_map_back_to_api_reasons():
+    created = datetime(2026, 1, 2, 3, 4, 5)
+    entry = _entry_from_row((
+        "e1", "u1", Decimal("12.50000000"), "REWARD", Decimal("0.9100"), None,
+        "m1", "s1", {"reason": "EARN", "transaction_id": "tx_1", "accuracy": 0.9}, created,
+    ))
+    assert entry.reason == MICReason.EARN
+    assert entry.amount == 12.5 and entry.transaction_id == "tx_1"
+    assert entry.metadata == {"accuracy": 0.9}
+
+    # Rows written by other services carry no API reason
+    assert _entry_from_row(("e2", "u1", 1, "REWARD", 1, None, None, None, None, created)).reason == MICReason.LEARN
+
+
+def test_ledger_statements_match_prepared_parameter_counts():
+    templates = execute_sql(PREPARED_STATEMENTS)
+    for name, (types, sql) in PREPARED_STATEMENTS.items():
+        count = len(types.split(","))
+        assert templates[name].count("%s") == count
+        assert f"${count}" in sql and f"${count + 1}" not in sql
@@ -0,0 +1,180 @@
+"""Deferred mint queue — completions survive the circuit breaker, mints drain on recovery."""
+
+import asyncio
+import time
+
+import jwt as pyjwt
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app, mic_service, mint_queue
+from app.models.learning import MintJobStatus
+from app.services.learning_store import learning_store
+from app.services.mic_ledger_store import mic_ledger_store
+from app.services.mic_minting import MICMintingService
+from app.services.mint_queue import MintQueue
+
+client = TestClient(app)
+
+SECRET = "test-identity-secret"
+
+
+def _reward_inputs(**overrides) -> dict:
+    inputs = {
+        "base_reward": 50,
+        "accuracy": 1.0,
+        "integrity_score": 0.85,
+        "difficulty": "beginner",
+        "streak_days": 0,
+        "is_perfect_score": True,
+        "is_first_completion": True,
+    }
+    inputs.update(overrides)
+    return inputs
+
+
+def _service(gii: str) -> MICMintingService:
+    service = MICMintingService()
+    service.gii_override = gii
+    return service
+
+
+def test_drain_waits_for_healthy_gii():
+    service = _service("0.80")
+    minted = []
+    queue = MintQueue(service, on_minted=minted.append)
+
+    job = queue.enqueue("mq-user-1", "mq-session-1", "constitutional-ai-101", _reward_inputs())
+    assert queue.depth() == 1
+    assert asyncio.run(queue.drain()) == 0
+    assert job["status"] == MintJobStatus.PENDING.value
+
+    service.gii_override = "0.96"
+    assert asyncio.run(queue.drain()) == 1
+    assert queue.depth() == 0
+    assert job["status"] == MintJobStatus.MINTED.value
+    assert job["mic_earned"] > 0
+    assert job["receipt_hash"]
+    assert minted == [job]
+    assert mic_ledger_store.get_balance("mq-user-1") == job["mic_earned"]
+
+
+def test_enqueue_is_idempotent_per_session():
+    queue = MintQueue(_service("0.80"))
+    first = queue.enqueue("mq-user-2", "mq-session-2", "constitutional-ai-101", _reward_inputs())
+    second = queue.enqueue("mq-user-2", "mq-session-2", "constitutional-ai-101", _reward_inputs())
+    assert first is second
+    assert queue.depth() == 1
+    assert queue.get_user_jobs("mq-user-2") == [first]
+
+
+def test_journal_restores_pending_mints(tmp_path):
+    journal = str(tmp_path / "mint-queue.jsonl")
+    queue = MintQueue(_service("0.80"), journal_path=journal)
+    job = queue.enqueue("mq-user-3", "mq-session-3", "constitutional-ai-101", _reward_inputs())
+
+    restored = MintQueue(_service("0.96"), journal_path=journal)
+    assert restored.depth() == 1
+    assert restored.get_job_for_session("mq-session-3")["mint_id"] == job["mint_id"]
+
+    assert asyncio.run(restored.drain()) == 1
+    reloaded = MintQueue(_service("0.96"), journal_path=journal)
+    assert reloaded.depth() == 0
+    assert reloaded.get_job(job["mint_id"]) is None  # minted, so only the ledger keeps it
+
+
+def test_journal_is_compacted_once_the_queue_drains(tmp_path):
+    journal = tmp_path / "mint-queue.jsonl"
+    service = _service("0.80")
+    queue = MintQueue(service, journal_path=str(journal))
+    for n in range(3):
+        queue.enqueue(f"mq-user-6{n}", f"mq-session-6{n}", "constitutional-ai-101", _reward_inputs())
+    rejected = queue.enqueue("mq-user-69", "mq-session-69", "constitutional-ai-101", _reward_inputs(accuracy=0.5))
+    assert asyncio.run(queue.drain()) == 0
+    assert len(journal.read_text().splitlines()) == 4  # still pending: nothing is dropped
+
+    service.gii_override = "0.96"
+    assert asyncio.run(queue.drain()) == 3
+    restored = MintQueue(service, journal_path=str(journal))
+    assert [job["mint_id"] for job in restored.get_user_jobs("mq-user-69")] == [rejected["mint_id"]]
+    assert restored.get_job(rejected["mint_id"])["status"] == MintJobStatus.FAILED.value
+    assert len(journal.read_text().splitlines()) == 1
+
+
+def test_mint_that_reached_the_ledger_is_not_repeated_after_a_crash(tmp_path):
+    journal = str(tmp_path / "mint-queue.jsonl")
+    service = _service("0.96")
+    queue = MintQueue(service, journal_path=journal)
+    job = queue.enqueue("mq-user-5", "mq-session-5", "constitutional-ai-101", _reward_inputs())
+    queue._set_status(job, MintJobStatus.MINTING)
+    # the process dies after the ledger append, before MINTED is journaled
+    minted = asyncio.run(service.mint_reward(
+        user_id="mq-user-5", module_id="constitutional-ai-101", session_id="mq-session-5",
+        mic_amount=40, accuracy=1.0, integrity_score=0.85
+    ))
+
+    credited = []
+    restored = MintQueue(service, journal_path=journal, on_minted=credited.append)
+    assert restored.depth() == 1
+    assert asyncio.run(restored.drain()) == 1
+    recovered = restored.get_job(job["mint_id"])
+    assert recovered["status"] == MintJobStatus.MINTED.value
+    assert recovered["transaction_id"] == minted["transaction_id"] and recovered["mic_earned"] == 40
+    assert credited == [recovered]
+    assert mic_ledger_store.get_total_entries_count("mq-user-5") == 1
+    assert mic_ledger_store.get_balance("mq-user-5") == 40
+
+
+def test_user_level_rejection_fails_instead_of_requeueing():
+    queue = MintQueue(_service("0.96"))
+    job = queue.enqueue(
+        "mq-user-4", "mq-session-4", "constitutional-ai-101", _reward_inputs(accuracy=0.5)
+    )
+    assert asyncio.run(queue.drain()) == 0
+    assert job["status"] == MintJobStatus.FAILED.value
+    assert queue.depth() == 0
+
+
+def test_complete_below_reward_floor_defers_mint(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("MOBIUS_IDENTITY_JWT_SECRET", SECRET)
+    monkeypatch.setattr(mic_service, "gii_override", "0.87")
+
+    subject_id = "mq-api-user"
+    token = pyjwt.encode({"sub": subject_id, "iat": int(time.time())}, SECRET, algorithm="HS256")
+    session = learning_store.create_session(subject_id, "constitutional-ai-101")
+    compiled = learning_store.get_session_compiled(session)
+    learning_store.submit_answers(session.id, list(zip(compiled.question_ids, compiled.answer_key)))
+    body = {"session_id": session.id}
+
+    res = client.post(
+        f"/api/learning/session/{session.id}/complete",
+        json=body,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert res.status_code == 200
+    data = res.json()
+    assert data["status"] == "completed"
+    assert data["mint_status"] == "pending"
+    assert data["mic_earned"] == 0
+    assert learning_store.has_completed_module(subject_id, "constitutional-ai-101")
+
+    pending = client.get(
+        "/api/v1/wallet/pending-mints", headers={"Authorization": f"Bearer {token}"}
+    ).json()
+    assert pending["pending"] == 1
+    assert pending["mints"][0]["mint_id"] == data["mint_id"]
+    assert client.get("/api/learning/mint-queue").json()["draining"] is False
+
+    # A client retry no longer hits the mint path at all
+    retry = client.post(
+        f"/api/learning/session/{session.id}/complete",
+        json=body,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert retry.status_code == 400
+
+    monkeypatch.setattr(mic_service, "gii_override", "0.96")
+    assert asyncio.run(mint_queue.drain()) >= 1
+    job = mint_queue.get_job(data["mint_id"])
+    assert job["status"] == MintJobStatus.MINTED.value
+    assert learning_store.get_user_progress(subject_id)["total_mic_earned"] == job["mic_earned"]
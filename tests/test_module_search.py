@@ -0,0 +1,53 @@
+"""Module search — tokenization, prefix matching, ranking and the endpoint."""
+
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.learning_store import LearningStore
+from app.services.module_search import ModuleSearchIndex, tokenize
+
+client = TestClient(app)
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("What is the Derivative of f(x)?") == ["derivative", "f", "x"]
+
+
+def test_title_matches_outrank_body_matches():
+    index = ModuleSearchIndex({
+        "a": {"id": "a", "title": "Graph Theory", "description": "Networks.", "topics": []},
+        "b": {"id": "b", "title": "Networks", "description": "Some graph examples.", "topics": []},
+        "c": {"id": "c", "title": "Hidden", "description": "Nothing here.", "topics": [], "is_active": False},
+    })
+    assert [mid for mid, _ in index.search("graph")] == ["a", "b"]
+    assert [mid for mid, _ in index.search("netw")] == ["b", "a"]
+    assert index.search("hidden") == []
+    assert index.search("the of") == []
+
+
+def test_index_is_rebuilt_on_catalog_swap(tmp_path):
+    module = LearningStore().modules["constitutional-ai-101"]
+    catalog = tmp_path / "catalog.json"
+    catalog.write_text(json.dumps({"packs": {"core": [module]}}))
+    store = LearningStore(catalog_path=str(catalog))
+    assert store.search_modules("zymurgy") == []
+
+    catalog.write_text(json.dumps({"packs": {"core": [dict(module, title="Zymurgy for agents")]}}))
+    os.utime(catalog, (2_000, 2_000))
+    store.reload_catalog()
+    assert [m.id for m, _ in store.search_modules("zymurgy")] == ["constitutional-ai-101"]
+
+
+def test_search_endpoint():
+    res = client.get("/api/learning/search", params={"q": "quantum comp", "limit": 3})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["results"][0]["module"]["id"] == "quantum-computing-intro"
+    assert data["total"] <= 3
+
+    advanced = client.get("/api/learning/search", params={"q": "learning", "difficulty": "advanced"}).json()
+    assert advanced["results"] and all(r["module"]["difficulty"] == "advanced" for r in advanced["results"])
+    assert client.get("/api/learning/search", params={"q": ""}).status_code == 422
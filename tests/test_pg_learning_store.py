@@ -0,0 +1,125 @@
+"""PostgresLearningStore helpers, and the store itself when TEST_DATABASE_URL is set."""
+
+import os
+
+import pytest
+
+from app.services.pg_learning_store import PREPARED_STATEMENTS
+from app.services.pg_pool import PgPool, execute_sql, libpq_dsn
+from app.services.sql_learning_store import _session_from_row
+
+MODULE_ID = "constitutional-ai-101"
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def test_libpq_dsn_drops_prisma_schema_parameter():
+    assert libpq_dsn("postgresql://u:p@db:5432/mobius?schema=public") == "postgresql://u:p@db:5432/mobius"
+    assert (libpq_dsn("postgresql://db/mobius?schema=public&sslmode=require")
+            == "postgresql://db/mobius?sslmode=require")
+
+
+class _FakeConnection:
+    closed = 0
+    description = None
+
+    def __init__(self, log):
+        self.log = log
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.log.append(sql.split()[0])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_pool_keeps_connections_and_prepares_each_new_one(monkeypatch):
+    import psycopg2.pool
+
+    log, sizes = [], []
+
+    class FakePool:
+        def __init__(self, minconn, maxconn, dsn):
+            sizes.append((minconn, maxconn))
+
+        def getconn(self):
+            return _FakeConnection(log)  # a fresh connection every time, possibly at a recycled id()
+
+        def putconn(self, conn, close=False):
+            pass
+
+    monkeypatch.setattr(psycopg2.pool, "ThreadedConnectionPool", FakePool)
+    pool = PgPool("postgresql://db/mobius", 4, {"ping": ("", "SELECT 1")})
+    for _ in range(3):
+        pool.execute("ping", ())
+    assert sizes == [(4, 4)]  # idle connections are kept, not closed on return
+    assert log == ["PREPARE", "EXECUTE"] * 3
+
+
+def test_execute_statements_match_prepared_parameter_counts():
+    templates = execute_sql(PREPARED_STATEMENTS)
+    for name, (types, sql) in PREPARED_STATEMENTS.items():
+        count = len(types.split(",")) if types else 0
+        assert templates[name].count("%s") == count
+        assert (not count or f"${count}" in sql) and f"${count + 1}" not in sql
+
+
+def test_session_rows_round_trip_to_sessions():
+    session = _session_from_row((
+        "session_abc", "u1", MODULE_ID, 3, 2**62 + 7, "active", 1_000.0, None, 0b101, 0b001, 10,
+        b"\x01\x00\x02",
+    ))
+    assert (session.id, session.catalog_version, session.status) == ("session_abc", 3, "active")
+    assert session.content_hash == 2**62 + 7
+    assert session.questions_answered == 2
+    assert session.correct_answers == 1
+    assert session.selected == bytearray(b"\x01\x00\x02")
+
+
+@pytest.fixture
+def pg_store():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    from app.services.pg_learning_store import PostgresLearningStore
+
+    store = PostgresLearningStore(dsn=TEST_DATABASE_URL, flush_seconds=60)
+    yield store
+    store.close()
+
+
+def test_pg_answers_score_once_and_progress_flushes(pg_store):
+    user_id = f"pg-test-{os.urandom(4).hex()}"
+    session = pg_store.create_session(user_id, MODULE_ID)
+    assert pg_store.get_active_session(user_id, MODULE_ID).id == session.id
+
+    compiled = pg_store.get_compiled_module(MODULE_ID)
+    question_id = compiled.question_ids[0]
+    first = pg_store.submit_answer(session.id, question_id, compiled.answer_key[0])
+    assert first["correct"] and first["cumulative_score"] == compiled.points[0]
+    assert pg_store.submit_answer(session.id, question_id, compiled.answer_key[0]) is None
+
+    assert pg_store.complete_session(session.id).status == "completed"
+    pg_store.update_user_progress(user_id, 25, 50, 5)
+    pg_store.record_completion(user_id, MODULE_ID, 1.0, 25)
+    assert pg_store.flush() == 2
+
+    # A second process sees the flushed state
+    from app.services.pg_learning_store import PostgresLearningStore
+
+    other = PostgresLearningStore(dsn=TEST_DATABASE_URL)
+    try:
+        assert other.has_completed_module(user_id, MODULE_ID)
+        assert other.get_user_progress(user_id)["total_mic_earned"] == 25
+    finally:
+        other.close()
@@ -0,0 +1,128 @@
+"""Post-completion pipeline: deferred credit and badges, retries, inline fallback."""
+
+import asyncio
+import time
+
+from app.services.learning_store import LearningStore
+from app.services.mic_ledger_store import mic_ledger_store
+from app.services.mic_minting import MICMintingService
+from app.services.mint_queue import MintQueue
+from app.services.post_completion import PostCompletionQueue
+from app.services.session_completion import CompletionError, SessionCompleter
+
+MODULE_ID = "constitutional-ai-101"
+
+
+def test_completion_returns_before_badges_and_progress():
+    minting = MICMintingService()
+    minting.gii_override = "0.96"
+    store, pipeline = LearningStore(), PostCompletionQueue(workers=2)
+    completer = SessionCompleter(store, minting, mic_ledger_store, MintQueue(minting), pipeline)
+    session = store.create_session("pipeline-user", MODULE_ID)
+    compiled = store.get_session_compiled(session)
+    store.submit_answers(session.id, list(zip(compiled.question_ids, compiled.answer_key)))
+
+    async def run():
+        pipeline.start()
+        response = await completer.complete(session.id, "pipeline-user")
+        assert response.rewards["rewards_status"] == "pending"
+        assert "badges" not in response.rewards
+        assert store.get_user_progress("pipeline-user")["modules_completed"] == 0
+        with_retry = await asyncio.gather(
+            completer.complete(session.id, "pipeline-user"), return_exceptions=True
+        )
+        assert isinstance(with_retry[0], CompletionError)  # claimed until credited
+        await pipeline.stop()
+        return response
+
+    response = asyncio.run(run())
+    task = pipeline.get_task(session.id)
+    assert task["status"] == "done"
+    assert task["results"]["credit"]["badges"] and task["results"]["receipt"]
+    progress = store.get_user_progress("pipeline-user")
+    assert progress["modules_completed"] == 1 and progress["level"] == response.new_level
+    assert store.get_session(session.id).status == "completed"
+    assert store.get_session_metrics()["pinned_sessions"] == 0
+
+
+def test_failed_steps_retry_without_repeating_earlier_steps():
+    pipeline = PostCompletionQueue(retry_base_seconds=0.001)
+    calls = {"first": 0, "flaky": 0}
+
+    def first(_):
+        calls["first"] += 1
+        return "ok"
+
+    def flaky(_):
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            raise RuntimeError("store busy")
+        return "ok"
+
+    async def run():
+        pipeline.start()
+        pipeline.submit("s1", "u1", [("first", first), ("flaky", flaky)])
+        pipeline.submit("s2", "u1", [("broken", lambda _: 1 / 0)])
+        await asyncio.sleep(0.2)
+        await pipeline.stop()
+
+    asyncio.run(run())
+    assert pipeline.get_task("s1")["status"] == "done" and pipeline.get_task("s1")["attempts"] == 3
+    assert calls == {"first": 1, "flaky": 3}
+    broken = pipeline.get_task("s2")
+    assert broken["status"] == "failed" and broken["attempts"] == PostCompletionQueue.MAX_ATTEMPTS
+    stats = pipeline.get_stats()
+    assert stats["processed"] == 1 and stats["failed"] == 1 and stats["depth"] == 0
+
+
+def test_without_workers_tasks_run_inline():
+    pipeline = PostCompletionQueue()
+    task = pipeline.submit("s1", "u1", [("only", lambda _: 42)])
+    assert task["status"] == "done" and task["results"] == {"only": 42}
+    assert pipeline.get_stats()["inline"] == 1
+
+
+def test_inline_retries_back_off_without_blocking_the_loop():
+    pipeline = PostCompletionQueue(retry_base_seconds=0.05)
+    calls = {"flaky": 0}
+
+    def flaky(_):
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            raise RuntimeError("store busy")
+        return "ok"
+
+    async def run():
+        started = time.monotonic()
+        task = pipeline.submit("s1", "u1", [("flaky", flaky)])  # no workers: first attempt inline
+        assert time.monotonic() - started < 0.05 and task["status"] == "pending"
+        await asyncio.sleep(0.3)
+        return task
+
+    task = asyncio.run(run())
+    assert task["status"] == "done" and task["attempts"] == 3 and calls["flaky"] == 3
+
+
+def test_pending_claims_count_as_completed_until_credited():
+    minting = MICMintingService()
+    minting.gii_override = "0.96"
+    store, pipeline = LearningStore(), PostCompletionQueue(workers=1)
+    completer = SessionCompleter(store, minting, mic_ledger_store, MintQueue(minting), pipeline)
+
+    def play():
+        session = store.create_session("repeat-user", MODULE_ID)
+        compiled = store.get_session_compiled(session)
+        store.submit_answers(session.id, list(zip(compiled.question_ids, compiled.answer_key)))
+        return session
+
+    async def run():
+        pipeline.start()
+        first = await completer.complete(play().id, "repeat-user")
+        assert completer._claimed_modules[("repeat-user", MODULE_ID)] == 1  # not yet credited
+        second = await completer.complete(play().id, "repeat-user")
+        await pipeline.stop()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.bonuses["first_completion_bonus"] == 20 and second.bonuses["first_completion_bonus"] == 0
+    assert not completer._claims and not completer._claimed_modules
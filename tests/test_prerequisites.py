@@ -0,0 +1,77 @@
+"""Prerequisite DAG — topological order, unlocks and recommended next modules."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.learning_store import LearningStore
+from app.services.prerequisites import PrerequisiteGraph
+
+client = TestClient(app)
+
+
+def _modules(**prereqs):
+    return {mid: {"id": mid, "prerequisites": pre, "order": i} for i, (mid, pre) in enumerate(prereqs.items())}
+
+
+def _bits():
+    bits = {}
+    return lambda mid: bits.setdefault(mid, 1 << len(bits))
+
+
+def test_compile_orders_and_computes_ancestors():
+    graph = PrerequisiteGraph.compile(_modules(c=["b"], a=[], b=["a"], d=[]), _bits())
+    assert graph.order == ("a", "b", "c", "d")  # lowest "order" first once ready
+    assert graph.ancestors["c"] == graph.bits["a"] | graph.bits["b"]
+    assert graph.descendants["a"] == ("b", "c")
+    assert graph.unlocked_mask(0) == graph.bits["a"] | graph.bits["d"]
+
+
+def test_compile_rejects_cycles_and_unknown_prerequisites():
+    with pytest.raises(ValueError, match="cycle"):
+        PrerequisiteGraph.compile(_modules(a=["b"], b=["a"]), _bits())
+    with pytest.raises(ValueError, match="unknown"):
+        PrerequisiteGraph.compile(_modules(a=["missing"]), _bits())
+
+
+def test_next_modules_follow_completions():
+    store = LearningStore()
+    first = [m.id for m in store.get_next_modules("u1")]
+    assert "constitutional-ai-101" in first and "integrity-economics" not in first
+
+    store.record_completion("u1", "constitutional-ai-101", accuracy=1.0, mic_earned=0)
+    after = [m.id for m in store.get_next_modules("u1")]
+    assert "constitutional-ai-101" not in after
+    assert {"integrity-economics", "multi-agent-democracy"} <= set(after)
+    assert "drift-suppression" not in after
+
+    store.record_completion("u1", "integrity-economics", accuracy=1.0, mic_earned=0)
+    assert store.get_unlocked_mask("u1") == store.prerequisite_graph.unlocked_mask(
+        store.get_completion_mask("u1")
+    )
+    assert "drift-suppression" in [m.id for m in store.get_next_modules("u1")]
+
+
+def test_next_endpoint():
+    res = client.get("/api/learning/users/dag-user/next", params={"limit": 3})
+    assert res.status_code == 200
+    assert len(res.json()["modules"]) == 3
+    assert all(not m["prerequisites"] for m in res.json()["modules"])
+
+
+def test_unlocked_cache_lives_only_on_hot_progress(tmp_path):
+    store = LearningStore(progress_hot_users=1, progress_spill_path=str(tmp_path / "spill.sqlite3"))
+    for i in range(20):
+        assert store.get_unlocked_mask(f"crawler-{i}") == store.prerequisite_graph.roots_mask
+    assert store.get_progress_metrics()["hot_users"] == 0
+
+    store.record_session_completion(
+        store.create_session("u1", "constitutional-ai-101").id, "u1", "constitutional-ai-101", 1.0, 10, 50, 5
+    )
+    unlocked = store.get_unlocked_mask("u1")
+    assert unlocked != store.prerequisite_graph.roots_mask
+    assert store.user_progress.peek("u1").unlocked == (store.prerequisite_graph.version, unlocked)
+
+    store.update_user_progress("u2", 0, 0, 0)  # spills u1, and its cache with it
+    assert store.user_progress.peek("u1") is None
+    assert store.get_unlocked_mask("u1") == unlocked
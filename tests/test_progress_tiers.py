@@ -0,0 +1,76 @@
+"""Tiered user progress: shared default for unknown users, hot LRU, disk spill."""
+
+import os
+import pickle
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.learning_store import LearningStore, learning_store
+from app.services.progress_tiers import DEFAULT_PROGRESS, ProgressSpill, UserProgress
+
+MODULE_ID = "constitutional-ai-101"
+
+client = TestClient(app)
+
+
+def test_reads_for_unknown_users_store_nothing():
+    before = learning_store.get_progress_metrics()
+    for i in range(50):
+        assert client.get(f"/api/learning/users/crawler-{i}/progress").json()["level"] == 1
+        params = {"module_id": MODULE_ID, "user_id": f"crawler-{i}"}
+        assert client.get("/api/learning/estimate-reward", params=params).status_code == 200
+
+    after = client.get("/api/learning/metrics/progress").json()
+    assert after["hot_users"] == before["hot_users"]
+    assert after["default_reads"] - before["default_reads"] >= 100
+    assert learning_store.get_user_progress("crawler-0") is DEFAULT_PROGRESS
+    with pytest.raises(TypeError):
+        learning_store.get_user_progress("crawler-0")["total_mic_earned"] = 1
+
+
+def test_cold_users_spill_to_disk_and_promote_on_write(tmp_path):
+    store = LearningStore(progress_hot_users=2, progress_spill_path=str(tmp_path / "spill.sqlite3"))
+    for user_id in ("u1", "u2", "u3"):
+        store.update_user_progress(user_id, 10, 150, 5)
+
+    cold = store.get_user_progress("u1")  # least recently written, spilled
+    assert cold["total_mic_earned"] == 10 and cold["level"] == 2
+    with pytest.raises(TypeError):
+        cold["total_mic_earned"] = 0
+    metrics = store.get_progress_metrics()
+    assert (metrics["hot_users"], metrics["cold_users"], metrics["spilled"]) == (2, 1, 1)
+    assert metrics["cold_hits"] == 1 and metrics["estimated_hot_bytes"] > 0
+
+    assert store.update_user_progress("u1", 5, 0, 0)["total_mic_earned"] == 15
+    metrics = store.get_progress_metrics()
+    assert (metrics["hot_users"], metrics["cold_users"], metrics["promoted"]) == (2, 1, 1)
+    assert store.get_user_progress("u1")["total_mic_earned"] == 15  # hot again
+    assert store.get_user_progress("u2")["total_mic_earned"] == 10  # now the cold one
+    metrics = store.get_progress_metrics()
+    assert (metrics["reads"], metrics["hot_hits"], metrics["cold_hits"]) == (3, 1, 2)
+    assert metrics["hot_hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+
+def test_progress_records_read_like_dicts_and_pickle():
+    progress = UserProgress("u1", total_mic_earned=25)
+    assert progress.get("total_mic_earned") == 25 and progress.get("missing", 0) == 0
+    assert dict(progress) == progress.to_dict() and progress == progress.to_dict()
+    assert not hasattr(progress, "__dict__")
+    assert pickle.loads(pickle.dumps(progress)) == progress
+
+
+def test_each_process_spills_to_its_own_locked_file(tmp_path):
+    base = str(tmp_path / "spill.sqlite3")
+    first, second = ProgressSpill(base), ProgressSpill(base)  # two workers given one path
+    first.put(UserProgress("u1", total_mic_earned=5).to_row())
+    assert first.file_path.startswith(base + ".") and first.file_path.endswith(f".{os.getpid()}")
+
+    second.put(UserProgress("u2").to_row())  # this process's file is held: private file instead
+    assert second.file_path == ""
+    assert first.get("u1") is not None and first.get("u2") is None and len(second) == 1
+
+    first.close()
+    second.close()
+    assert not os.path.exists(first.file_path)
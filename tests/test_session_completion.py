@@ -0,0 +1,226 @@
+"""Session completion unit of work: one mint per session, per-user serialization."""
+
+import asyncio
+
+import pytest
+
+from app.services.learning_store import LearningStore
+from app.services.mic_ledger_store import mic_ledger_store
+from app.services.mic_minting import MICMintingService
+from app.services.mint_queue import MintQueue
+from app.services.post_completion import PostCompletionQueue
+from app.services.session_completion import CompletionError, SessionCompleter
+
+MODULE_ID = "constitutional-ai-101"
+
+
+class _SlowMinting(MICMintingService):
+    """Yields to the event loop mid-mint, as a remote ledger write would"""
+
+    async def mint_reward(self, **kwargs):
+        await asyncio.sleep(0.01)
+        return await super().mint_reward(**kwargs)
+
+
+def _completer() -> SessionCompleter:
+    minting = _SlowMinting()
+    minting.gii_override = "0.96"
+    return SessionCompleter(
+        LearningStore(), minting, mic_ledger_store, MintQueue(minting), PostCompletionQueue()
+    )
+
+
+def _answered_session(store, user_id: str, wrong: int = 0):
+    """A session with every question answered, the first `wrong` of them incorrectly"""
+    session = store.create_session(user_id, MODULE_ID)
+    compiled = store.get_session_compiled(session)
+    store.submit_answers(session.id, [
+        (question_id, compiled.answer_key[idx] + (idx < wrong))
+        for idx, question_id in enumerate(compiled.question_ids)
+    ])
+    return session
+
+
+def test_concurrent_completions_mint_once():
+    completer = _completer()
+    user_id = "completion-race-user"
+    session = _answered_session(completer._store, user_id)
+
+    async def race():
+        return await asyncio.gather(
+            *(completer.complete(session.id, user_id) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(race())
+    completed = [r for r in results if not isinstance(r, Exception)]
+    assert len(completed) == 1
+    assert all(isinstance(r, CompletionError) and r.status_code == 400 for r in results if r not in completed)
+    assert mic_ledger_store.get_total_entries_count(user_id) == 1
+    assert completed[0].new_wallet_balance == completed[0].mic_earned
+    assert completer._store.get_user_progress(user_id)["modules_completed"] == 1
+    assert len(completer.locks) == 0
+
+
+def test_other_users_are_not_blocked():
+    completer = _completer()
+    session = _answered_session(completer._store, "unblocked-user")
+
+    async def complete_while_another_user_is_locked():
+        async with completer.locks.hold("busy-user"):
+            return await asyncio.wait_for(
+                completer.complete(session.id, "unblocked-user"), timeout=1
+            )
+
+    assert asyncio.run(complete_while_another_user_is_locked()).status == "completed"
+
+
+def test_unknown_session_is_404():
+    completer = _completer()
+    with pytest.raises(CompletionError) as e:
+        asyncio.run(completer.complete("session_missing", "u1"))
+    assert e.value.status_code == 404
+
+
+def test_score_comes_from_the_answer_key():
+    completer = _completer()
+    store = completer._store
+    session = _answered_session(store, "scored-user")
+
+    response = asyncio.run(completer.complete(session.id, "scored-user"))
+    compiled = store.get_session_compiled(session)
+    assert response.questions_answered == response.correct_answers == compiled.question_count
+    assert response.earned_points == response.total_points == compiled.total_points
+    assert response.accuracy == 1.0
+    assert response.time_spent_minutes == 0
+
+
+def test_tampered_session_flags_do_not_raise_the_score():
+    completer = _completer()
+    store = completer._store
+    session = _answered_session(store, "tampered-user", wrong=1)
+    session.correct_mask = session.answered_mask  # would read as a perfect score
+
+    compiled = store.get_session_compiled(session)
+    score = store.score_session(session)
+    assert score.correct_answers == compiled.question_count - 1
+    assert score.earned_points == compiled.total_points - compiled.points[0]
+    with pytest.raises(CompletionError) as e:  # 2 of 3 is below the accuracy floor
+        asyncio.run(completer.complete(session.id, "tampered-user"))
+    assert e.value.status_code == 402
+    assert mic_ledger_store.get_total_entries_count("tampered-user") == 0
+
+
+def test_session_without_answers_is_refused():
+    completer = _completer()
+    session = completer._store.create_session("idle-user", MODULE_ID)
+    with pytest.raises(CompletionError) as e:
+        asyncio.run(completer.complete(session.id, "idle-user"))
+    assert e.value.status_code == 400
+    assert completer._store.get_session(session.id).status == "active"
+
+
+def test_workers_sharing_a_store_mint_once():
+    """Separate completers (worker processes) share only the store, whose claim decides"""
+    first = _completer()
+    second = SessionCompleter(
+        first._store, first._minting, mic_ledger_store, MintQueue(first._minting), PostCompletionQueue()
+    )
+    user_id = "shared-store-user"
+    session = _answered_session(first._store, user_id)
+
+    async def race():
+        return await asyncio.gather(
+            first.complete(session.id, user_id), second.complete(session.id, user_id), return_exceptions=True
+        )
+
+    results = asyncio.run(race())
+    assert sum(not isinstance(r, Exception) for r in results) == 1
+    assert mic_ledger_store.get_total_entries_count(user_id) == 1
+    assert first._store.get_user_progress(user_id)["modules_completed"] == 1
+
+
+def test_mint_failing_after_the_claim_is_deferred():
+    completer = _completer()
+    minting = completer._minting
+    session = _answered_session(completer._store, "breaker-user")
+    refuse = minting.mint_reward
+
+    async def breaker_trips_mid_mint(**kwargs):
+        minting.gii_override = "0.5"
+        return await refuse(**kwargs)
+
+    minting.mint_reward = breaker_trips_mid_mint
+    response = asyncio.run(completer.complete(session.id, "breaker-user"))
+    assert response.mint_status == "pending" and response.mic_earned == 0
+    assert response.circuit_breaker_status != "healthy"  # reported as of the failed mint
+    assert completer._store.get_session(session.id).status == "completed"
+    assert completer._mint_queue.get_job(response.mint_id)["session_id"] == session.id
+    assert mic_ledger_store.get_total_entries_count("breaker-user") == 0
+
+
+def test_another_users_session_is_404():
+    completer = _completer()
+    session = _answered_session(completer._store, "owner-user")
+    with pytest.raises(CompletionError) as e:
+        asyncio.run(completer.complete(session.id, "intruder-user"))
+    assert e.value.status_code == 404 and e.value.detail == "Session not found"
+    assert completer._store.get_session(session.id).status == "active"
+    assert mic_ledger_store.get_total_entries_count("intruder-user") == 0
+
+
+def test_reward_comes_from_the_catalog_version_the_session_played(tmp_path):
+    import json
+
+    module = LearningStore().modules[MODULE_ID]
+    catalog = tmp_path / "catalog.json"
+    catalog.write_text(json.dumps({"packs": {"core": [module]}}))
+    clock = [1_000.0]
+    completer = _completer()
+    store = completer._store = LearningStore(catalog_path=str(catalog), clock=lambda: clock[0])
+    session = _answered_session(store, "repriced-user")
+
+    catalog.write_text(json.dumps({"packs": {"core": [dict(module, mic_reward=module["mic_reward"] * 100)]}}))
+    assert store.reload_catalog(force=True)
+    clock[0] += 125  # the store's clock, not the wall clock, times the session
+
+    response = asyncio.run(completer.complete(session.id, "repriced-user"))
+    assert response.bonuses["base_reward"] == module["mic_reward"]
+    assert response.time_spent_minutes == 2
+
+
+def test_blocking_stores_are_called_off_the_event_loop(tmp_path):
+    import threading
+
+    from app.services.sqlite_learning_store import SqliteLearningStore
+
+    threads = set()
+
+    class RecordingStore(SqliteLearningStore):
+        def get_session(self, session_id):
+            threads.add(threading.current_thread())
+            return super().get_session(session_id)
+
+        def credit_session_completion(self, *args, **kwargs):
+            threads.add(threading.current_thread())
+            return super().credit_session_completion(*args, **kwargs)
+
+    store = RecordingStore(str(tmp_path / "state.db"))
+    minting = _SlowMinting()
+    minting.gii_override = "0.96"
+    pipeline = PostCompletionQueue(offload=store.blocking_io)
+    completer = SessionCompleter(store, minting, mic_ledger_store, MintQueue(minting), pipeline)
+    session = _answered_session(store, "sqlite-user")
+
+    async def run():
+        pipeline.start()
+        response = await completer.complete(session.id, "sqlite-user")
+        await pipeline.stop()
+        return response
+
+    try:
+        assert asyncio.run(run()).status == "completed"
+        assert store.get_user_progress("sqlite-user")["modules_completed"] == 1
+        assert threads and threading.main_thread() not in threads
+    finally:
+        store.close()
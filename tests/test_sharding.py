@@ -0,0 +1,132 @@
+"""User-hash sharding: placement, and routing to in-process shard servers."""
+
+import threading
+
+import pytest
+
+from app.models.learning import MICReason
+from app.services.learning_store import LearningStore
+from app.services.mic_ledger_store import MICLedgerStore
+from app.services.sharded_learning_store import ShardedLearningStore
+from app.services.sharded_mic_ledger_store import ShardedMICLedgerStore
+from app.services.sharding import (
+    ShardError,
+    ShardRouter,
+    ShardServer,
+    check_socket_dir,
+    session_id_prefix,
+    session_shard,
+    shard_for,
+    shard_socket,
+)
+
+MODULE_ID = "constitutional-ai-101"
+AUTHKEY = b"test-shards"
+
+
+def test_users_spread_evenly_and_mostly_stay_put_when_shards_grow():
+    users = [f"user-{i}" for i in range(20_000)]
+    placement = [shard_for(u, 4) for u in users]
+    assert placement == [shard_for(u, 4) for u in users]
+    assert all(4_500 < placement.count(k) < 5_500 for k in range(4))
+
+    grown = [shard_for(u, 5) for u in users]
+    moved = [(a, b) for a, b in zip(placement, grown) if a != b]
+    assert 0.15 < len(moved) / len(users) < 0.25
+    assert all(b == 4 for _, b in moved)  # users only move to the new shard
+
+
+def test_session_ids_name_their_shard():
+    assert session_shard(session_id_prefix(3) + "abc123") == 3
+    assert session_shard("session_abc123") is None
+
+
+@pytest.fixture
+def shards(tmp_path):
+    servers = []
+    for index in range(2):
+        learning = LearningStore(session_id_prefix=session_id_prefix(index))
+        server = ShardServer(shard_socket(str(tmp_path), index), AUTHKEY, learning, MICLedgerStore())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    router = ShardRouter(str(tmp_path), 2, AUTHKEY)
+    for _ in range(100):  # wait for both listeners
+        try:
+            router.broadcast("ledger", "get_balance", "probe")
+            break
+        except ShardError:
+            threading.Event().wait(0.01)
+    yield router, servers
+    router.close()
+    for server in servers:
+        server.close()
+
+
+def test_calls_route_to_the_users_shard(shards):
+    router, servers = shards
+    store = ShardedLearningStore(router)
+    users = [u for u in (f"u{i}" for i in range(20)) if router.for_user(u) == 1][:1]
+    users += [u for u in (f"u{i}" for i in range(20)) if router.for_user(u) == 0][:1]
+
+    for user_id in users:
+        session = store.create_session(user_id, MODULE_ID)
+        owner = servers[router.for_user(user_id)].targets["learning"]
+        assert session.id.startswith(session_id_prefix(router.for_user(user_id)))
+        assert owner.get_session(session.id).user_id == user_id
+
+        compiled = store.get_session_compiled(session)
+        result = store.submit_answer(session.id, "q1", compiled.answer_key[0])
+        assert result["correct"]
+        assert store.submit_answer(session.id, "q1", compiled.answer_key[0]) is None
+        assert store.complete_session(session.id).status == "completed"
+
+        store.record_completion(user_id, MODULE_ID, 1.0, 25)
+        assert store.has_completed_module(user_id, MODULE_ID)
+        assert store.get_completion_mask(user_id) == store.module_bit(MODULE_ID)
+
+    assert store.get_session("session_unsharded") is None
+    metrics = store.get_session_metrics()
+    assert metrics["shard_count"] == 2 and metrics["users_with_sessions"] == 2
+
+
+def test_ledger_lives_on_the_users_shard(shards):
+    router, servers = shards
+    ledger = ShardedMICLedgerStore(router)
+    ledger.append_entry("alice", 10.0, MICReason.LEARN, 0.9, transaction_id="tx_1")
+    ledger.append_entry("alice", 2.5, MICReason.BONUS, 0.9)
+
+    assert ledger.get_balance("alice") == 12.5
+    assert servers[router.for_user("alice")].targets["ledger"].get_balance("alice") == 12.5
+    assert servers[1 - router.for_user("alice")].targets["ledger"].get_balance("alice") == 0.0
+    assert ledger.get_recent_entries("alice")[1].transaction_id == "tx_1"
+
+    # store errors come back as themselves
+    with pytest.raises(ValueError):
+        ledger.get_ledger_page("alice", cursor="not-a-cursor")
+
+
+def test_unreachable_shard_raises_shard_error(tmp_path):
+    router = ShardRouter(str(tmp_path), 2, AUTHKEY)
+    with pytest.raises(ShardError):
+        ShardedMICLedgerStore(router).get_balance("alice")
+
+
+def test_shards_need_a_secret_and_a_private_socket_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("STORE_SHARD_AUTHKEY", raising=False)
+    with pytest.raises(RuntimeError):
+        ShardRouter.from_env()
+    monkeypatch.setenv("STORE_SHARD_AUTHKEY", "short")
+    with pytest.raises(RuntimeError):
+        ShardRouter.from_env()
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)  # as if pre-created by another user in /tmp
+    with pytest.raises(PermissionError):
+        check_socket_dir(str(shared))
+    with pytest.raises(ShardError):
+        ShardRouter(str(shared), 1, AUTHKEY).call(0, "ledger", "get_balance", "probe")
+
+    private = tmp_path / "private"
+    check_socket_dir(str(private), create=True)
+    assert private.stat().st_mode & 0o777 == 0o700
@@ -0,0 +1,214 @@
+"""SQLite-backed stores, with two instances on one file standing in for two workers."""
+
+from pydantic import BaseModel
+
+from app.models.learning import MICReason
+from app.services.agent_registry import SqliteAgentRegistry
+from app.services.learning_store import LearningStore
+from app.services.sqlite_learning_store import SqliteLearningStore
+from app.services.sqlite_mic_ledger_store import SqliteMICLedgerStore
+
+MODULE_ID = "constitutional-ai-101"
+
+
+def test_sessions_are_shared_and_answers_score_once(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteLearningStore(path)
+    worker_b = SqliteLearningStore(path)
+    try:
+        session = worker_a.create_session("u1", MODULE_ID)
+        assert worker_b.create_session("u1", MODULE_ID).id == session.id
+
+        compiled = worker_a.get_compiled_module(MODULE_ID)
+        first = worker_b.submit_answer(session.id, "q1", compiled.answer_key[0])
+        assert first["correct"] and first["cumulative_score"] == compiled.points[0]
+        assert worker_a.submit_answer(session.id, "q1", compiled.answer_key[0]) is None
+
+        # a batch touching an answered question is rejected whole
+        assert worker_a.submit_answers(session.id, [("q2", 0), ("q1", 0)]) is None
+        batch = worker_a.submit_answers(session.id, [("q2", 3), ("q3", compiled.answer_key[2])])
+        assert batch["questions_remaining"] == 0
+
+        stored = worker_b.get_session(session.id)
+        assert stored.questions_answered == 3
+        assert stored.selected[:3] == bytearray([compiled.answer_key[0], 3, compiled.answer_key[2]])
+
+        assert worker_b.complete_session(session.id).status == "completed"
+        assert worker_a.get_active_session("u1", MODULE_ID) is None
+        assert worker_a.get_session_metrics()["backend"] == "sqlite"
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_progress_is_written_behind_and_seen_by_other_workers(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteLearningStore(path, flush_seconds=60)
+    worker_b = SqliteLearningStore(path, flush_seconds=60, user_cache_seconds=0)
+    try:
+        worker_a.update_user_progress("u1", 25, 50, 5)
+        worker_a.record_completion("u1", MODULE_ID, 1.0, 25)
+        worker_b.update_user_progress("u1", 10, 20, 2)
+        # a stale reload flushes this worker's writes first; worker_a's are still buffered
+        assert not worker_b.has_completed_module("u1", MODULE_ID)
+        assert worker_b.get_session_metrics()["rows_written"] == 1
+
+        assert worker_a.flush() == 2
+        assert worker_b.has_completed_module("u1", MODULE_ID)
+        assert worker_b.get_user_progress("u1")["total_mic_earned"] == 35
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_idle_sessions_are_swept_unless_pinned(tmp_path):
+    clock = [1_000.0]
+    store = SqliteLearningStore(str(tmp_path / "state.db"), session_ttl_seconds=60, clock=lambda: clock[0])
+    try:
+        idle = store.create_session("u1", MODULE_ID)
+        pinned = store.create_session("u2", MODULE_ID)
+        assert store.pin_session(pinned.id)
+
+        assert store.sweep_expired_sessions(now=1_061.0) == 1
+        assert store.get_session(idle.id).status == "abandoned"
+        assert store.get_session(pinned.id).status == "active"
+    finally:
+        store.close()
+
+
+def test_ledger_balances_and_pages_are_shared(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteMICLedgerStore(path)
+    worker_b = SqliteMICLedgerStore(path)
+    try:
+        for amount in range(1, 6):
+            (worker_a if amount % 2 else worker_b).append_entry(
+                "u1", float(amount), MICReason.LEARN, 0.9, transaction_id=f"tx_{amount}"
+            )
+        worker_b.append_entry("u1", -2.5, MICReason.CORRECTION, 0.9, metadata={"note": "fix"})
+
+        assert worker_a.get_balance("u1") == 12.5
+        assert worker_b.get_total_entries_count("u1") == 6
+        assert worker_a.get_balance_breakdown("u1") == {"LEARN": 15.0, "CORRECTION": -2.5, "total": 12.5}
+
+        amounts, cursor = [], None
+        while True:
+            entries, cursor = worker_b.get_ledger_page("u1", limit=4, cursor=cursor)
+            amounts += [e.amount for e in entries]
+            if cursor is None:
+                break
+        assert amounts == [-2.5, 5.0, 4.0, 3.0, 2.0, 1.0]
+        assert worker_a.get_last_entry("u1").metadata == {"note": "fix"}
+        assert worker_a.get_ledger("u1", limit=2, offset=4)[1][0].transaction_id == "tx_2"
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+class _Spec(BaseModel):
+    name: str
+    roles: list[str] = []
+
+
+def test_agent_registry_is_a_shared_mapping(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteAgentRegistry(path, _Spec)
+    worker_b = SqliteAgentRegistry(path, _Spec)
+
+    worker_a["jade"] = _Spec(name="JADE", roles=["tutor"])
+    assert "jade" in worker_b and "eve" not in worker_b
+    assert worker_b["jade"].roles == ["tutor"]
+    assert len(worker_b) == 1 and list(worker_b) == ["jade"]
+
+    del worker_b["jade"]
+    assert "jade" not in worker_a
+    worker_a.close()
+    worker_b.close()
+
+
+def test_sessions_score_only_against_the_content_they_started_on(tmp_path):
+    import json
+
+    module = LearningStore().modules[MODULE_ID]
+    catalog_a, catalog_b = tmp_path / "a.json", tmp_path / "b.json"
+    catalog_a.write_text(json.dumps({"packs": {"core": [module]}}))
+    reordered = dict(module, questions=module["questions"][::-1])  # positions now mean other questions
+    catalog_b.write_text(json.dumps({"packs": {"core": [reordered]}}))
+
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteLearningStore(path, catalog_path=str(catalog_a))
+    worker_b = SqliteLearningStore(path, catalog_path=str(catalog_b))
+    try:
+        session = worker_a.create_session("u1", MODULE_ID)
+        assert worker_a.submit_answer(session.id, "q1", 0) is not None
+        assert worker_b.submit_answer(session.id, "q2", 0) is None
+        assert worker_b.score_session(worker_b.get_session(session.id)) is None
+        assert worker_a.score_session(worker_a.get_session(session.id)).questions_answered == 1
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_sessions_record_the_full_content_hash_and_older_databases_gain_the_column(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "state.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE learning_sessions (id TEXT PRIMARY KEY, user_id TEXT NOT NULL, "
+        "module_id TEXT NOT NULL, catalog_version INTEGER NOT NULL, status TEXT NOT NULL, "
+        "started_at REAL NOT NULL, completed_at REAL, last_activity_at REAL NOT NULL, "
+        "answered_mask INTEGER NOT NULL DEFAULT 0, correct_mask INTEGER NOT NULL DEFAULT 0, "
+        "current_score INTEGER NOT NULL DEFAULT 0, selected TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO learning_sessions (id, user_id, module_id, catalog_version, status, "
+        "started_at, last_activity_at, selected) VALUES ('session_old', 'u0', ?, 12345, 'active', 0, 0, '000000')",
+        (MODULE_ID,),
+    )
+    conn.commit()
+    conn.close()
+
+    store = SqliteLearningStore(path)
+    try:
+        compiled = store.get_compiled_module(MODULE_ID)
+        session = store.create_session("u1", MODULE_ID)
+        stored = store.get_session(session.id)
+        assert (stored.catalog_version, stored.content_hash) == (store.catalog.version, compiled.content_hash)
+        assert store.submit_answer(session.id, "q1", 0) is not None
+
+        # a row from before the column has no hash to match, so it is refused rather than guessed at
+        assert store.get_session("session_old").content_hash is None
+        assert store.submit_answer("session_old", "q1", 0) is None
+    finally:
+        store.close()
+
+
+def test_buffered_writes_flush_on_a_timer(tmp_path):
+    import time
+
+    path = str(tmp_path / "state.db")
+    writer = SqliteLearningStore(path, flush_seconds=0.05)
+    reader = SqliteLearningStore(path, user_cache_seconds=0)
+    try:
+        writer.update_user_progress("u1", 25, 50, 5)  # no further write, sweep or close follows
+        assert reader.get_user_progress("u1")["total_mic_earned"] == 0
+        deadline = time.monotonic() + 2
+        while reader.get_user_progress("u1")["total_mic_earned"] != 25 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert reader.get_user_progress("u1")["total_mic_earned"] == 25
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_sql_backends_must_implement_the_hooks():
+    import pytest
+
+    from app.services.sql_learning_store import SqlLearningStore
+
+    class Incomplete(SqlLearningStore):
+        pass
+
+    with pytest.raises(TypeError, match="_transaction"):
+        Incomplete()